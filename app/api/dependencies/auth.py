@@ -8,6 +8,7 @@ from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User, UserStatus
 from app.schemas.user import TokenPayload
+from app.services.user_cache import load_detached_user, user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
@@ -18,6 +19,8 @@ def get_current_user(
 ):
     """
     Get current authenticated user from JWT token
+
+    Handlers that modify the user must load it with db.get(User, u_id).
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,8 +40,9 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    # Query user from database
-    user = db.query(User).filter(User.u_id == token_data.sub).first()
+    # Cached for USER_CACHE_TTL_SECONDS; the instance is detached and read-only
+    u_id = int(token_data.sub)
+    user = user_cache.get(u_id, lambda: load_detached_user(db, u_id))
 
     if user is None:
         raise credentials_exception
@@ -58,3 +62,18 @@ def get_current_active_user(
             detail="User account is not activated"
         )
     return current_user
+
+
+def get_current_admin_user(
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get current active user with access to administrative endpoints (ADMIN_EMAILS)
+    """
+    admin_emails = [email.lower() for email in settings.ADMIN_EMAILS]
+    if current_user.u_correo.lower() not in admin_emails:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return current_user
@@ -0,0 +1,70 @@
+from typing import Callable
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from app.core.config import settings
+from app.core.rate_limit import RateLimitResult, rate_limit_backend
+from app.api.dependencies.auth import get_current_active_user
+from app.models.user import User
+
+
+def client_ip(request: Request) -> str:
+    """
+    Client address; behind our proxies, the X-Forwarded-For entry appended by
+    the outermost one (RATE_LIMIT_TRUSTED_HOPS from the right)
+
+    Entries further left are set by the client and cannot be trusted.
+    """
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = [ip.strip() for ip in request.headers.get("x-forwarded-for", "").split(",") if ip.strip()]
+        hops = max(1, settings.RATE_LIMIT_TRUSTED_HOPS)
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+def _apply(name: str, key: str, capacity: int, period_seconds: int, response: Response) -> None:
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    result: RateLimitResult = rate_limit_backend.consume(
+        f"{name}:{key}", capacity, capacity / period_seconds
+    )
+    headers = {
+        "RateLimit-Limit": str(result.limit),
+        "RateLimit-Remaining": str(result.remaining),
+        "RateLimit-Reset": str(result.reset_seconds),
+    }
+
+    if not result.allowed:
+        headers["Retry-After"] = str(result.retry_after)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please retry later",
+            headers=headers
+        )
+
+    response.headers.update(headers)
+
+
+def rate_limit_by_ip(name: str, capacity: int, period_seconds: int) -> Callable:
+    """
+    Dependency: token bucket of capacity requests per period_seconds per client IP
+    """
+    def dependency(request: Request, response: Response) -> None:
+        _apply(name, client_ip(request), capacity, period_seconds, response)
+
+    return dependency
+
+
+def rate_limit_by_user(name: str, capacity: int, period_seconds: int) -> Callable:
+    """
+    Dependency: token bucket of capacity requests per period_seconds per user
+    """
+    def dependency(
+        response: Response,
+        current_user: User = Depends(get_current_active_user)
+    ) -> None:
+        _apply(name, str(current_user.u_id), capacity, period_seconds, response)
+
+    return dependency
@@ -0,0 +1,28 @@
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.api.dependencies.auth import get_current_active_user
+from app.models.user import User
+from app.services.student_access import StudentAccess
+
+
+def get_student_access(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> StudentAccess:
+    """
+    Get ownership checker for the students of the current user
+    """
+    return StudentAccess(db, current_user.u_id, current_user.u_correo)
+
+
+def require_student_access(access: StudentAccess, al_id: int) -> None:
+    """
+    Raise 403 if the student is not registered as child of the current user
+    """
+    if not access.can_access(al_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes acceso a este estudiante"
+        )
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.endpoints import auth, users, students, grades, certificates, reports, scholarships, usebeq_external
+from app.api.endpoints import auth, users, students, grades, certificates, reports, scholarships, usebeq_external, dashboard
 
 api_router = APIRouter()
 
@@ -11,3 +11,4 @@ api_router.include_router(certificates.router, prefix="/certificates", tags=["ce
 api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
 api_router.include_router(scholarships.router, prefix="/scholarships", tags=["scholarships"])
 api_router.include_router(usebeq_external.router, prefix="/usebeq", tags=["usebeq-external"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
@@ -1,40 +1,113 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.api.dependencies.rate_limit import rate_limit_by_ip
+from app.core.process_pool import PoolSaturatedError
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    verify_and_update_password_async
+)
 from app.models.user import User, UserStatus
-from app.schemas.user import Token, UserCreate, User as UserSchema
+from app.schemas.user import RefreshTokenRequest, Token, UserCreate, User as UserSchema
+from app.services.email_outbox import email_outbox_worker, enqueue_activation_email
+from app.services.refresh_tokens import InvalidRefreshToken, refresh_token_store
+from app.services.user_cache import load_detached_user, user_cache
 import secrets
 
 router = APIRouter()
 
 
+def password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts in progress, please retry shortly",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)}
+    )
+
+
+def _get_user_by_email(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.u_correo == email).first()
+
+
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def _save_user_with_activation_email(db: Session, user: User) -> User:
+    # The e-mail is queued in the same transaction; the outbox worker sends it
+    db.add(user)
+    enqueue_activation_email(db, user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def _update_password_hash(db: Session, user: User, new_hash: str) -> None:
+    user.u_pass = new_hash
+    db.commit()
+    user_cache.invalidate(user.u_id)
+
+
+def _bearer_token(u_id: int) -> dict:
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        subject=u_id, expires_delta=access_token_expires
+    )
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+    }
+
+
+def _issue_session_tokens(db: Session, u_id: int) -> dict:
+    """
+    Access token plus a refresh token starting a new family
+    """
+    tokens = _bearer_token(u_id)
+    tokens["refresh_token"] = refresh_token_store.issue(db, u_id)
+    db.commit()
+    return tokens
+
+
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
 ) -> Any:
     """
     Register new user account
+
+    The password is hashed in the password process pool; DB work runs in the threadpool.
     """
     # Check if user already exists
-    user = db.query(User).filter(User.u_correo == user_in.u_correo).first()
+    user = await run_in_threadpool(_get_user_by_email, db, user_in.u_correo)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
+    try:
+        hashed_password = await get_password_hash_async(user_in.u_pass)
+    except PoolSaturatedError:
+        raise password_pool_busy()
+
     # Create new user
     user = User(
         u_correo=user_in.u_correo,
-        u_pass=get_password_hash(user_in.u_pass),
+        u_pass=hashed_password,
         u_nombre=user_in.u_nombre,
         u_appat=user_in.u_appat,
         u_apmat=user_in.u_apmat,
@@ -45,59 +118,66 @@ def register(
         token_activacion=secrets.token_urlsafe(32)
     )
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    # TODO: Send activation email here
-    # send_activation_email(user.u_correo, user.token_activacion)
+    user = await run_in_threadpool(_save_user_with_activation_email, db, user)
+    email_outbox_worker.wake()
 
     return user
 
 
-@router.post("/login", response_model=Token)
-def login(
+@router.post(
+    "/login",
+    response_model=Token,
+    dependencies=[Depends(rate_limit_by_ip(
+        "login", settings.RATE_LIMIT_LOGIN_CAPACITY, settings.RATE_LIMIT_LOGIN_PERIOD_SECONDS
+    ))]
+)
+async def login(
     db: Session = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
+
+    bcrypt runs in the password process pool (429 with Retry-After when its
+    queue is full). Hashes made with a different BCRYPT_ROUNDS are replaced
+    on successful login.
     """
     # Special case: USEBEQ API credentials
     # This user is used by the system to authenticate with the external USEBEQ API
     if form_data.username == settings.USEBEQ_API_EMAIL and form_data.password == settings.USEBEQ_API_PASSWORD:
         # Check if system user exists in database, create if not
-        system_user = db.query(User).filter(User.u_correo == settings.USEBEQ_API_EMAIL).first()
+        system_user = await run_in_threadpool(_get_user_by_email, db, settings.USEBEQ_API_EMAIL)
 
         if not system_user:
+            try:
+                hashed_password = await get_password_hash_async(settings.USEBEQ_API_PASSWORD)
+            except PoolSaturatedError:
+                raise password_pool_busy()
+
             # Create system user
             system_user = User(
                 u_correo=settings.USEBEQ_API_EMAIL,
-                u_pass=get_password_hash(settings.USEBEQ_API_PASSWORD),
+                u_pass=hashed_password,
                 u_nombre="Sistema",
                 u_appat="USEBEQ",
                 u_apmat="API",
                 estatus=UserStatus.VALIDADO
             )
-            db.add(system_user)
-            db.commit()
-            db.refresh(system_user)
-
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            subject=system_user.u_id,
-            expires_delta=access_token_expires
-        )
+            system_user = await run_in_threadpool(_save_user, db, system_user)
 
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-        }
+        return _bearer_token(system_user.u_id)
 
     # Normal user authentication
-    user = db.query(User).filter(User.u_correo == form_data.username).first()
+    user = await run_in_threadpool(_get_user_by_email, db, form_data.username)
+
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_and_update_password_async(form_data.password, user.u_pass)
+        except PoolSaturatedError:
+            raise password_pool_busy()
 
-    if not user or not verify_password(form_data.password, user.u_pass):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -109,15 +189,58 @@ def login(
             detail="Account not activated. Please check your email."
         )
 
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        subject=user.u_id, expires_delta=access_token_expires
-    )
+    if new_hash:
+        await run_in_threadpool(_update_password_hash, db, user, new_hash)
 
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-    }
+    return await run_in_threadpool(_issue_session_tokens, db, user.u_id)
+
+
+@router.post("/refresh", response_model=Token)
+def refresh_access_token(
+    *,
+    db: Session = Depends(get_db),
+    token_in: RefreshTokenRequest
+) -> Any:
+    """
+    Exchange a refresh token for a new access token and refresh token
+
+    Does not touch the password. A refresh token can be used only once;
+    reusing one revokes every token issued from the same login.
+    """
+    try:
+        u_id, new_refresh_token = refresh_token_store.rotate(db, token_in.refresh_token)
+    except InvalidRefreshToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    user = user_cache.get(u_id, lambda: load_detached_user(db, u_id))
+    if user is None or user.estatus != UserStatus.VALIDADO:
+        refresh_token_store.revoke(db, new_refresh_token)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    tokens = _bearer_token(u_id)
+    tokens["refresh_token"] = new_refresh_token
+    return tokens
+
+
+@router.post("/logout")
+def logout(
+    *,
+    db: Session = Depends(get_db),
+    token_in: RefreshTokenRequest
+) -> Any:
+    """
+    Revoke a refresh token and every token rotated from the same login
+    """
+    refresh_token_store.revoke(db, token_in.refresh_token)
+    return {"message": "Session closed"}
 
 
 @router.post("/activate/{token}")
@@ -149,5 +272,6 @@ def activate_account(
     user.fecha_validacion = datetime.utcnow()
 
     db.commit()
+    user_cache.invalidate(user.u_id)
 
     return {"message": "Account activated successfully"}
@@ -1,12 +1,35 @@
-from typing import Any
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from collections import defaultdict
 from datetime import datetime, date, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import base64
+import csv
+import hmac
+import io
+import json
+import tempfile
+import time
+from enum import Enum
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, text
+from starlette.background import BackgroundTask
+from sqlalchemy import and_, case, column, desc, func, insert, or_, select, table, tuple_
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.etag import etag_matches, etag_response, make_etag, not_modified
+from app.core.responses import fast_json
+from app.api.dependencies.auth import get_current_admin_user
+from app.models.user import User
 from app.models.certificate import (
     CertificateRequest,
+    CertificateRequestArchive,
+    CertificateRequestColumns,
+    CertificateStats,
     TipoTramite,
     TramiteStatus,
     TramiteEntregado
@@ -15,97 +38,233 @@ from app.schemas.certificate import (
     CertificateRequestCreate,
     CertificateRequestResponse,
     CertificateStatusResponse,
-    CertificateListResponse
+    CertificateListResponse,
+    CertificateVerifyResponse,
+    CertificateStatsResponse
 )
+from app.services.folio_allocator import folio_allocator
+from app.services.duplicate_filter import duplicate_filter, normalize_duplicate_key
+from app.services.idempotency import idempotency_store
+from app.core.process_pool import PoolSaturatedError
+from app.services.acuse_pdf import acuse_cache, acuse_pool, render_acuse_pdf
+from app.services.certificate_stats import record_created
+from app.services.tramites_archive import archive_cutoff_datetime, find_by_folio
+from app.services.status_watcher import SubscriberLimitReached, status_watcher
+from app.services.status_token import InvalidStatusToken, create_status_token, curp_hash, verify_status_token
 
 router = APIRouter()
 
 
-def generate_folio(db: Session, region: str) -> str:
+# CCT level codes (positions 2-4) accepted for each tipo_tramite
+NIVEL_MAP = {
+    TipoTramite.CERTIFICADO_PREESCOLAR: ['DJN', 'PJN', 'DCC', 'DML', 'EJN'],
+    TipoTramite.CERTIFICADO_PRIMARIA: ['DPR', 'PPR', 'DPB', 'DML', 'EPR', 'ADG', 'NBA'],
+    TipoTramite.CERTIFICADO_SECUNDARIA: ['DST', 'DES', 'DTV', 'EST', 'ETV']
+}
+
+# Payment system URL (REGER)
+PAYMENT_URL = "https://reger.usebeq.edu.mx/PortalServicios/externalGuest.jsp"
+
+
+def validate_cct_level(cct: str, tipo_tramite: TipoTramite) -> None:
+    """
+    Validate CCT belongs to Queretaro and its level matches tipo_tramite
+    """
+    # Validate CCT belongs to Queretaro (state code 22)
+    if not cct.startswith('22'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="La clave de la escuela no corresponde a Queretaro"
+        )
+
+    # Get CCT level code (position 2-4)
+    nivel_cct = cct[2:5]
+
+    # Validate nivel matches tipo_tramite
+    if nivel_cct not in NIVEL_MAP.get(tipo_tramite, []):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"La clave de la escuela no corresponde al nivel solicitado"
+        )
+
+
+def certificate_request_values(
+    certificate_data: CertificateRequestCreate,
+    folio: str,
+    region: str,
+    is_duplicate: bool
+) -> dict:
+    """
+    Column values of a new tramites1 row
+    """
+    return {
+        "folio": folio,
+        "nombre_alumno": certificate_data.nombre_alumno.upper(),
+        "a_paterno": certificate_data.a_paterno.upper(),
+        "a_materno": certificate_data.a_materno.upper() if certificate_data.a_materno else None,
+        "telefono": certificate_data.telefono,
+        "email": certificate_data.email.lower(),
+        "curp": certificate_data.curp.strip().upper(),
+        "cct": certificate_data.cct.strip().upper(),
+        "nombre_esc": certificate_data.nombre_esc.upper(),
+        "dom_esc": certificate_data.dom_esc.upper() if certificate_data.dom_esc else None,
+        "turno": certificate_data.turno.upper(),
+        "ciclo_terminacion": certificate_data.ciclo_terminacion,
+        "tipo_tramite": certificate_data.tipo_tramite,
+        "usuario": 'SISCER',
+        "foto": '',
+        "zona": '',
+        "sector": '',
+        "fecha": datetime.now().strftime("%d-%m-%Y"),
+        "fecha_elaborado": date.today() if is_duplicate else None,
+        "status": TramiteStatus.REIMPRESION if is_duplicate else TramiteStatus.SOLICITADO,
+        "entregado": TramiteEntregado.PENDIENTE,
+        "region": region,
+        "correccion": certificate_data.correccion,
+        "core": certificate_data.core
+    }
+
+
+def in_process_message(folio: str) -> str:
+    return (f"Ya existe un tramite en proceso con folio: {folio}. "
+            f"Consulta el estatus en la opcion 'Estatus del Tramite'.")
+
+
+def request_created_message(requires_payment: bool) -> str:
+    if requires_payment:
+        return "La solicitud ya ha sido generada, favor de proceder con el pago del tramite."
+    return "La solicitud esta en proceso de validacion y elaboracion. Consulta el estatus con tu folio."
+
+
+def generate_folio(region: str) -> str:
     """
     Generate new folio for certificate request based on region
     Format: YEAR-REGION-00001
     """
-    year = datetime.now().year
+    return folio_allocator.next_folio(region)
 
-    # Map region number to roman numerals
-    region_map = {
-        "1": "I",
-        "2": "II",
-        "3": "III",
-        "4": "IV"
-    }
 
-    region_roman = region_map.get(region, "IV")
+SIGNED_STATUSES = [TramiteStatus.FIRMADO, TramiteStatus.REIMPRESION]
 
-    # Get last folio for this region
-    last_request = db.query(CertificateRequest).filter(
-        CertificateRequest.region == region
-    ).order_by(desc(CertificateRequest.folio)).first()
 
-    if not last_request or not last_request.folio:
-        return f"{year}-{region_roman}-00001"
+EMPTY_SUMMARY = {"total": 0, "signed_total": 0, "latest_folio": None, "latest_signed": None}
 
-    # Check if folio is from current year
-    folio_year = int(last_request.folio.split('-')[0])
 
-    if folio_year != year:
-        return f"{year}-{region_roman}-00001"
+def _load_table_summaries(db: Session, model, keys: List[Tuple[str, TipoTramite]]) -> Dict[Tuple[str, TipoTramite], dict]:
+    """
+    Load everything the free/paid decision needs for many (curp, tipo_tramite) in one query
 
-    # Increment folio
-    folio_parts = last_request.folio.split('-')
-    folio_num = int(folio_parts[2]) + 1
+    Window functions partitioned by (curp, tipo_tramite) return at most two
+    rows per key: the latest by folio and the latest signed (firmado/REIMPRESION)
+    by fecha_elaborado, each carrying the total and signed counts.
+    Served by the (curp, tipo_tramite, status, fecha_elaborado) index.
+    Keys without requests are absent from the result.
+    """
+    if not keys:
+        return {}
 
-    return f"{year}-{region_roman}-{folio_num:05d}"
+    is_signed = case((model.status.in_(SIGNED_STATUSES), 1), else_=0)
+    partition = [model.curp, model.tipo_tramite]
 
+    ranked = select(
+        model.curp,
+        model.tipo_tramite,
+        model.folio,
+        model.entregado,
+        model.fecha_elaborado,
+        is_signed.label("is_signed"),
+        func.count().over(partition_by=partition).label("total"),
+        func.sum(is_signed).over(partition_by=partition).label("signed_total"),
+        func.row_number().over(
+            partition_by=partition,
+            order_by=desc(model.folio)
+        ).label("rn_folio"),
+        func.row_number().over(
+            partition_by=partition + [is_signed],
+            order_by=desc(model.fecha_elaborado)
+        ).label("rn_signed"),
+    ).where(
+        tuple_(model.curp, model.tipo_tramite).in_(list(set(keys)))
+    ).subquery()
 
-def check_existing_request(db: Session, curp: str, tipo_tramite: TipoTramite) -> dict:
+    rows = db.execute(
+        select(ranked).where(or_(
+            ranked.c.rn_folio == 1,
+            and_(ranked.c.is_signed == 1, ranked.c.rn_signed == 1)
+        ))
+    ).all()
+
+    summaries = {}
+
+    for row in rows:
+        summary = summaries.setdefault((row.curp, row.tipo_tramite), dict(EMPTY_SUMMARY))
+        summary["total"] = row.total
+        summary["signed_total"] = int(row.signed_total or 0)
+        if row.rn_folio == 1:
+            summary["latest_folio"] = row.folio
+        if row.is_signed == 1 and row.rn_signed == 1:
+            summary["latest_signed"] = {
+                "folio": row.folio,
+                "entregado": row.entregado,
+                "fecha_elaborado": row.fecha_elaborado
+            }
+
+    return summaries
+
+
+def load_request_summaries(db: Session, keys: List[Tuple[str, TipoTramite]]) -> Dict[Tuple[str, TipoTramite], dict]:
     """
-    Check if there's an existing certificate request
-    Returns dict with status and message
+    Request summaries from tramites1, completed from tramites1_archivo when needed
+
+    The archive only holds requests signed more than a year ago, so it can
+    change the decision only for keys whose tramites1 requests are all unsigned.
     """
-    # Check for existing requests
-    existing_count = db.query(CertificateRequest).filter(
-        CertificateRequest.curp == curp,
-        CertificateRequest.tipo_tramite == tipo_tramite
-    ).count()
+    summaries = _load_table_summaries(db, CertificateRequest, keys)
 
-    if existing_count == 0:
-        return {"status": "NEW", "requires_payment": False}
+    unsigned = [key for key, summary in summaries.items() if summary["signed_total"] == 0]
+    for key, archived in _load_table_summaries(db, CertificateRequestArchive, unsigned).items():
+        summary = summaries[key]
+        summary["total"] += archived["total"]
+        summary["signed_total"] = archived["signed_total"]
+        summary["latest_signed"] = archived["latest_signed"]
 
-    # Check for firmado or REIMPRESION status
-    firmado_count = db.query(CertificateRequest).filter(
-        CertificateRequest.curp == curp,
-        CertificateRequest.tipo_tramite == tipo_tramite,
-        CertificateRequest.status.in_([TramiteStatus.FIRMADO, TramiteStatus.REIMPRESION])
-    ).count()
+    return summaries
 
-    if firmado_count == 0:
-        # There's a request in process
-        latest = db.query(CertificateRequest).filter(
-            CertificateRequest.curp == curp,
-            CertificateRequest.tipo_tramite == tipo_tramite
-        ).order_by(desc(CertificateRequest.folio)).first()
 
+def load_request_summary(db: Session, curp: str, tipo_tramite: TipoTramite) -> dict:
+    """
+    Load everything the free/paid decision needs for one CURP in a single query
+    """
+    key = (curp, tipo_tramite)
+    return load_request_summaries(db, [key]).get(key, dict(EMPTY_SUMMARY))
+
+
+def evaluate_existing_request(summary: dict, today: date) -> dict:
+    """
+    Decide whether a new request is free, in process or requires payment
+
+    Pure function over the output of load_request_summary.
+    Returns dict with status and message
+    """
+    if summary["total"] == 0:
+        return {"status": "NEW", "requires_payment": False}
+
+    if summary["signed_total"] == 0:
+        # There's a request in process
         return {
             "status": "IN_PROCESS",
-            "folio": latest.folio,
+            "folio": summary["latest_folio"],
             "requires_payment": False
         }
 
-    # Get latest firmado/REIMPRESION request
-    latest = db.query(CertificateRequest).filter(
-        CertificateRequest.curp == curp,
-        CertificateRequest.tipo_tramite == tipo_tramite,
-        CertificateRequest.status.in_([TramiteStatus.FIRMADO, TramiteStatus.REIMPRESION])
-    ).order_by(desc(CertificateRequest.fecha_elaborado)).first()
+    # Latest firmado/REIMPRESION request
+    latest = summary["latest_signed"]
 
     # Calculate days difference
-    today = date.today()
-    days_diff = (today - latest.fecha_elaborado).days if latest.fecha_elaborado else 0
+    days_diff = (today - latest["fecha_elaborado"]).days if latest["fecha_elaborado"] else 0
 
     # Check if payment/delivery status allows free reprint
-    if latest.entregado in [TramiteEntregado.PAGADO, TramiteEntregado.ENTREGADO] and days_diff >= 30:
+    if latest["entregado"] in [TramiteEntregado.PAGADO, TramiteEntregado.ENTREGADO] and days_diff >= 30:
         return {"status": "NEW", "requires_payment": False}
 
     # Check if more than 1 year passed
@@ -115,36 +274,147 @@ def check_existing_request(db: Session, curp: str, tipo_tramite: TipoTramite) ->
     # Requires payment
     return {
         "status": "IN_PROCESS",
-        "folio": latest.folio,
+        "folio": latest["folio"],
         "requires_payment": True
     }
 
 
+def check_existing_request(db: Session, curp: str, tipo_tramite: TipoTramite) -> dict:
+    """
+    Check if there's an existing certificate request
+    Returns dict with status and message
+    """
+    return evaluate_existing_request(
+        load_request_summary(db, curp, tipo_tramite),
+        date.today()
+    )
+
+
+SCE039_DUPLI = table(
+    "SCE039_DUPLI",
+    column("id"),
+    column("ce_inicic"),
+    column("clavecct"),
+    column("al_curp"),
+)
+
+
+def check_duplicates_in_system(db: Session, keys: List[Tuple[str, str, str]]) -> Set[Tuple[str, str, str]]:
+    """
+    Check many (year_ini, cct, curp) against SCE039_DUPLI in one query
+    Returns the keys whose certificate was already issued
+    """
+    if not keys:
+        return set()
+
+    # Most requests are not duplicates: a Bloom filter miss skips the query,
+    # or, if the filter is stale, only checks rows newer than it (a PK range)
+    candidates = {}
+    recent = []
+    after_id = None
+    # Compared like the stored values (case-insensitive, trailing spaces ignored)
+    normalized = {key: normalize_duplicate_key(*key) for key in set(keys)}
+    for key in set(normalized.values()):
+        maybe_duplicate, loaded_through = duplicate_filter.might_contain(*key)
+        if maybe_duplicate is False:
+            if loaded_through is not None:
+                recent.append(key)
+                after_id = loaded_through if after_id is None else min(after_id, loaded_through)
+        else:
+            candidates[key] = maybe_duplicate
+
+    if not candidates and not recent:
+        return set()
+
+    key_columns = tuple_(SCE039_DUPLI.c.ce_inicic, SCE039_DUPLI.c.clavecct, SCE039_DUPLI.c.al_curp)
+    conditions = []
+    if candidates:
+        conditions.append(key_columns.in_(list(candidates)))
+    if recent:
+        conditions.append(and_(SCE039_DUPLI.c.id > after_id, key_columns.in_(recent)))
+
+    query = select(
+        SCE039_DUPLI.c.ce_inicic,
+        SCE039_DUPLI.c.clavecct,
+        SCE039_DUPLI.c.al_curp
+    ).where(or_(*conditions)).distinct()
+
+    found = {normalize_duplicate_key(*row) for row in db.execute(query).fetchall()}
+
+    for key, maybe_duplicate in candidates.items():
+        if maybe_duplicate:
+            duplicate_filter.record_confirmation(key in found)
+
+    return {key for key, normalized_key in normalized.items() if normalized_key in found}
+
+
 def check_duplicate_in_system(db: Session, curp: str, cct: str, ciclo_terminacion: str) -> bool:
     """
     Check if certificate was already issued in SCE039_DUPLI table
     """
-    year_ini = ciclo_terminacion.split('-')[0]
+    key = (ciclo_terminacion.split('-')[0], cct, curp)
+    return key in check_duplicates_in_system(db, [key])
+
+
+@router.get("/duplicate-filter/stats")
+def get_duplicate_filter_stats(
+    current_user: User = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Get SCE039_DUPLI Bloom filter metrics (DB queries avoided, false positives)
+    """
+    return duplicate_filter.stats()
+
+
+def _stored_enum_value(enum_cls, name: str) -> str:
+    # The summary keeps enum member names, as stored in tramites1
+    return enum_cls[name].value if name in enum_cls.__members__ else name
+
+
+@router.get("/stats", response_model=CertificateStatsResponse)
+def get_certificate_stats(
+    *,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+    region: Optional[str] = Query(None, max_length=10),
+    fecha_desde: Optional[date] = Query(None),
+    fecha_hasta: Optional[date] = Query(None)
+) -> Any:
+    """
+    Daily request counts by region, tipo_tramite, status and entregado
 
-    # Query SCE039_DUPLI table
-    query = text("""
-        SELECT COUNT(*) as count
-        FROM SCE039_DUPLI
-        WHERE ce_inicic = :year_ini
-        AND clavecct = :cct
-        AND al_curp = :curp
-    """)
+    Reads only the pp_tramites_resumen summary, never tramites1.
+    """
+    query = db.query(CertificateStats)
+    if region:
+        query = query.filter(CertificateStats.region == region)
+    if fecha_desde:
+        query = query.filter(CertificateStats.dia >= fecha_desde)
+    if fecha_hasta:
+        query = query.filter(CertificateStats.dia <= fecha_hasta)
 
-    result = db.execute(query, {"year_ini": year_ini, "cct": cct, "curp": curp}).fetchone()
+    rows = []
+    total = 0
+    for row in query.filter(CertificateStats.total > 0).order_by(CertificateStats.dia, CertificateStats.region):
+        rows.append({
+            "dia": row.dia,
+            "region": row.region,
+            "tipo_tramite": _stored_enum_value(TipoTramite, row.tipo_tramite),
+            "status": _stored_enum_value(TramiteStatus, row.status),
+            "entregado": _stored_enum_value(TramiteEntregado, row.entregado),
+            "total": row.total
+        })
+        total += row.total
 
-    return result[0] > 0 if result else False
+    return CertificateStatsResponse(rows=rows, total=total)
 
 
 @router.post("/request", response_model=CertificateRequestResponse)
 def request_certificate(
     *,
     db: Session = Depends(get_db),
-    certificate_data: CertificateRequestCreate
+    certificate_data: CertificateRequestCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ) -> Any:
     """
     Request a new certificate
@@ -154,33 +424,27 @@ def request_certificate(
     - Reprint after 30 days if paid/delivered: FREE
     - Reprint after 1 year: FREE
     - Otherwise: REQUIRES PAYMENT
+
+    Send an Idempotency-Key header to make retries safe: a repeated key
+    returns the first response instead of creating another request.
+    """
+    return idempotency_store.run(
+        "certificates.request",
+        idempotency_key,
+        certificate_data,
+        lambda: create_certificate_request(db, certificate_data)
+    )
+
+
+def create_certificate_request(db: Session, certificate_data: CertificateRequestCreate) -> CertificateRequestResponse:
+    """
+    Validate and store a certificate request (tramites1)
     """
     # Normalize data
     curp = certificate_data.curp.strip().upper()
     cct = certificate_data.cct.strip().upper()
 
-    # Validate CCT belongs to Queretaro (state code 22)
-    if not cct.startswith('22'):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="La clave de la escuela no corresponde a Queretaro"
-        )
-
-    # Get CCT level code (position 2-4)
-    nivel_cct = cct[2:5]
-
-    # Validate nivel matches tipo_tramite
-    nivel_map = {
-        TipoTramite.CERTIFICADO_PREESCOLAR: ['DJN', 'PJN', 'DCC', 'DML', 'EJN'],
-        TipoTramite.CERTIFICADO_PRIMARIA: ['DPR', 'PPR', 'DPB', 'DML', 'EPR', 'ADG', 'NBA'],
-        TipoTramite.CERTIFICADO_SECUNDARIA: ['DST', 'DES', 'DTV', 'EST', 'ETV']
-    }
-
-    if nivel_cct not in nivel_map.get(certificate_data.tipo_tramite, []):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"La clave de la escuela no corresponde al nivel solicitado"
-        )
+    validate_cct_level(cct, certificate_data.tipo_tramite)
 
     # Check for existing requests
     existing_check = check_existing_request(db, curp, certificate_data.tipo_tramite)
@@ -188,8 +452,7 @@ def request_certificate(
     if existing_check["status"] == "IN_PROCESS" and not existing_check.get("requires_payment", False):
         return CertificateRequestResponse(
             success=False,
-            message=f"Ya existe un tramite en proceso con folio: {existing_check['folio']}. "
-                    f"Consulta el estatus en la opcion 'Estatus del Tramite'.",
+            message=in_process_message(existing_check["folio"]),
             folio=existing_check["folio"],
             requires_payment=False
         )
@@ -204,55 +467,25 @@ def request_certificate(
 
     requires_payment = existing_check.get("requires_payment", False) or is_duplicate
 
-    # Determine region (default to 4 if not found)
-    region = "4"
+    # Determine region (configured default if not provided)
+    region = certificate_data.region or settings.CERTIFICATE_DEFAULT_REGION
 
     # Generate folio
-    folio = generate_folio(db, region)
+    folio = generate_folio(region)
 
     # Create request
-    fecha_str = datetime.now().strftime("%d-%m-%Y")
-    fecha_elaborado = date.today()
-
-    new_request = CertificateRequest(
-        folio=folio,
-        nombre_alumno=certificate_data.nombre_alumno.upper(),
-        a_paterno=certificate_data.a_paterno.upper(),
-        a_materno=certificate_data.a_materno.upper() if certificate_data.a_materno else None,
-        telefono=certificate_data.telefono,
-        email=certificate_data.email.lower(),
-        curp=curp,
-        cct=cct,
-        nombre_esc=certificate_data.nombre_esc.upper(),
-        dom_esc=certificate_data.dom_esc.upper() if certificate_data.dom_esc else None,
-        turno=certificate_data.turno.upper(),
-        ciclo_terminacion=certificate_data.ciclo_terminacion,
-        tipo_tramite=certificate_data.tipo_tramite,
-        usuario='SISCER',
-        foto='',
-        zona='',
-        sector='',
-        fecha=fecha_str,
-        fecha_elaborado=fecha_elaborado if is_duplicate else None,
-        status=TramiteStatus.REIMPRESION if is_duplicate else TramiteStatus.SOLICITADO,
-        entregado=TramiteEntregado.PENDIENTE,
-        region=region,
-        correccion=certificate_data.correccion,
-        core=certificate_data.core
-    )
+    values = certificate_request_values(certificate_data, folio, region, is_duplicate)
+    new_request = CertificateRequest(**values)
 
     db.add(new_request)
+    record_created(db, [values])
     db.commit()
     db.refresh(new_request)
 
     # Generate payment URL if required
-    payment_url = None
-    if requires_payment:
-        # Payment system URL (REGER)
-        payment_url = "https://reger.usebeq.edu.mx/PortalServicios/externalGuest.jsp"
+    payment_url = PAYMENT_URL if requires_payment else None
 
-    message = "La solicitud ya ha sido generada, favor de proceder con el pago del tramite." if requires_payment else \
-              "La solicitud esta en proceso de validacion y elaboracion. Consulta el estatus con tu folio."
+    message = request_created_message(requires_payment)
 
     return CertificateRequestResponse(
         success=True,
@@ -268,25 +501,177 @@ def request_certificate(
     )
 
 
-@router.get("/status/{folio}", response_model=CertificateStatusResponse)
-def get_certificate_status(
+def _iter_import_rows(upload: UploadFile, file_format: str) -> Iterator[Tuple[int, Optional[dict]]]:
+    """
+    Yield (line, row) from a CSV or NDJSON upload, one row at a time
+    Rows that cannot be parsed are yielded as None
+    """
+    stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    try:
+        if file_format == "csv":
+            reader = csv.DictReader(stream)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(stream, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                yield line_number, row if isinstance(row, dict) else None
+    finally:
+        stream.detach()
+
+
+def _process_import_chunk(db: Session, chunk: List[Tuple[int, Optional[dict]]]) -> List[dict]:
+    """
+    Validate and store one chunk of imported certificate requests
+
+    Runs the same rules as /request, but with one eligibility query, one
+    duplicate query and one folio reservation per region for the whole chunk,
+    and a single bulk INSERT. Repeated CURPs in later chunks are caught by the
+    eligibility query, since each chunk is committed before the next one.
+    """
+    results = {}
+    valid = []
+
+    for line, raw in chunk:
+        result = {"line": line, "curp": (raw or {}).get("curp"), "success": False}
+        results[line] = result
+
+        if raw is None:
+            result["message"] = "Linea invalida"
+            continue
+
+        try:
+            data = CertificateRequestCreate(**{
+                k: v for k, v in raw.items() if isinstance(k, str) and v not in (None, "")
+            })
+            validate_cct_level(data.cct, data.tipo_tramite)
+        except ValidationError as e:
+            result["message"] = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            continue
+        except HTTPException as e:
+            result["message"] = e.detail
+            continue
+
+        result["curp"] = data.curp
+        valid.append((line, data))
+
+    # Set-based eligibility check
+    summaries = load_request_summaries(db, [(data.curp, data.tipo_tramite) for _, data in valid])
+    today = date.today()
+    seen = {}
+    accepted = []
+
+    for line, data in valid:
+        key = (data.curp, data.tipo_tramite)
+        if key in seen:
+            results[line]["message"] = f"Solicitud repetida en el archivo (linea {seen[key]})"
+            continue
+        seen[key] = line
+
+        existing_check = evaluate_existing_request(summaries.get(key, EMPTY_SUMMARY), today)
+        if existing_check["status"] == "IN_PROCESS" and not existing_check.get("requires_payment", False):
+            results[line].update(folio=existing_check["folio"], message=in_process_message(existing_check["folio"]))
+            continue
+
+        accepted.append((line, data, existing_check))
+
+    # Set-based duplicate check
+    duplicates = check_duplicates_in_system(db, [
+        (data.ciclo_terminacion.split('-')[0], data.cct, data.curp) for _, data, _ in accepted
+    ])
+
+    # One folio reservation per region
+    by_region = defaultdict(list)
+    for item in accepted:
+        by_region[item[1].region or settings.CERTIFICATE_DEFAULT_REGION].append(item)
+
+    rows = []
+    row_lines = []
+    for region, items in by_region.items():
+        folios = folio_allocator.next_folios(region, len(items))
+        for (line, data, existing_check), folio in zip(items, folios):
+            is_duplicate = (data.ciclo_terminacion.split('-')[0], data.cct, data.curp) in duplicates
+            requires_payment = existing_check.get("requires_payment", False) or is_duplicate
+            values = certificate_request_values(data, folio, region, is_duplicate)
+            rows.append(values)
+            row_lines.append(line)
+            results[line].update(
+                success=True,
+                folio=folio,
+                status=values["status"].value,
+                requires_payment=requires_payment,
+                message=request_created_message(requires_payment)
+            )
+
+    if rows:
+        try:
+            db.execute(insert(CertificateRequest), rows)
+            record_created(db, rows)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            for line in row_lines:
+                results[line].update(success=False, folio=None, status=None, message=f"Error al guardar: {str(e)}")
+
+    return [results[line] for line, _ in chunk]
+
+
+@router.post("/import")
+def import_certificate_requests(
     *,
     db: Session = Depends(get_db),
-    folio: str
+    current_user: User = Depends(get_current_admin_user),
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$")
 ) -> Any:
     """
-    Get certificate request status by folio
+    Bulk import certificate requests from a CSV or NDJSON file (school offices)
+
+    Each row has the fields of /request (CSV with a header row). The file is
+    read and processed in chunks of CERTIFICATE_IMPORT_CHUNK_SIZE rows, each
+    committed on its own. Returns an NDJSON report with one line per row
+    (in file order) followed by a summary line.
     """
-    request = db.query(CertificateRequest).filter(
-        CertificateRequest.folio == folio.upper()
-    ).first()
+    if file_format is None:
+        filename = (file.filename or "").lower()
+        file_format = "csv" if filename.endswith(".csv") or file.content_type == "text/csv" else "ndjson"
 
-    if not request:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No se encontro solicitud con este folio"
-        )
+    report = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    totals = {"rows": 0, "created": 0, "rejected": 0}
 
+    def write_results(results: List[dict]) -> None:
+        for result in results:
+            totals["rows"] += 1
+            totals["created" if result["success"] else "rejected"] += 1
+            report.write(json.dumps(result, default=str).encode("utf-8") + b"\n")
+
+    chunk = []
+    for line, row in _iter_import_rows(file, file_format):
+        chunk.append((line, row))
+        if len(chunk) >= settings.CERTIFICATE_IMPORT_CHUNK_SIZE:
+            write_results(_process_import_chunk(db, chunk))
+            chunk = []
+
+    if chunk:
+        write_results(_process_import_chunk(db, chunk))
+
+    report.write(json.dumps({"summary": totals}).encode("utf-8") + b"\n")
+    report.seek(0)
+
+    return StreamingResponse(
+        report,
+        media_type="application/x-ndjson",
+        background=BackgroundTask(report.close)
+    )
+
+
+def certificate_status_response(request: CertificateRequestColumns) -> CertificateStatusResponse:
     requires_payment = request.status == TramiteStatus.REIMPRESION and request.entregado == TramiteEntregado.PENDIENTE
 
     return CertificateStatusResponse(
@@ -305,43 +690,446 @@ def get_certificate_status(
     )
 
 
+@router.get("/status/{folio}", response_model=CertificateStatusResponse)
+def get_certificate_status(
+    *,
+    request: Request,
+    db: Session = Depends(get_db),
+    folio: str
+) -> Any:
+    """
+    Get certificate request status by folio
+
+    The ETag comes from updated_at plus status and entregado (in case an
+    external update leaves updated_at as it was). Only those columns are
+    read first; the full row is loaded and serialized only when the ETag
+    does not match.
+    """
+    folio = folio.upper()
+    version = find_by_folio(db, folio, "folio", "updated_at", "status", "entregado")
+
+    if version:
+        etag = make_etag(version.folio, version.updated_at, version.status, version.entregado)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        certificate = find_by_folio(db, folio)
+    else:
+        certificate = None
+
+    if not certificate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No se encontro solicitud con este folio"
+        )
+
+    return etag_response(certificate_status_response(certificate), etag)
+
+
+# Statuses after which the request no longer changes on its own
+FINAL_STATUSES = {TramiteStatus.FIRMADO.value, TramiteStatus.RECHAZADO.value}
+
+
+def _load_status_event(db: Session, folio: str) -> Optional[dict]:
+    row = find_by_folio(db, folio, "folio", "status", "entregado", "updated_at")
+
+    if not row:
+        return None
+
+    return {
+        "folio": row.folio,
+        "status": row.status.value if row.status else None,
+        "entregado": row.entregado.value if row.entregado else None,
+        "updated_at": row.updated_at.isoformat() if row.updated_at else None
+    }
+
+
+def _sse_event(data: dict) -> str:
+    return f"event: status\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/status/{folio}/stream")
+async def stream_certificate_status(
+    *,
+    request: Request,
+    db: Session = Depends(get_db),
+    folio: str
+) -> Any:
+    """
+    Server-Sent Events stream of the status of a certificate request
+
+    Sends the current status right away and then every change picked up by
+    the shared status watcher. The stream ends once the request is firmado
+    or rechazado, or after STATUS_STREAM_MAX_SECONDS.
+    """
+    folio = folio.upper()
+
+    try:
+        queue = status_watcher.subscribe(folio)
+    except SubscriberLimitReached:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Demasiadas conexiones en espera, consulta el estatus mas tarde",
+            headers={"Retry-After": "30"}
+        )
+
+    try:
+        current = await run_in_threadpool(_load_status_event, db, folio)
+    except Exception:
+        status_watcher.unsubscribe(folio, queue)
+        raise
+    finally:
+        db.close()
+
+    if not current:
+        status_watcher.unsubscribe(folio, queue)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No se encontro solicitud con este folio"
+        )
+
+    async def events():
+        last_state = (current["status"], current["entregado"])
+        deadline = time.monotonic() + settings.STATUS_STREAM_MAX_SECONDS
+        try:
+            yield f"retry: {int(settings.STATUS_STREAM_POLL_SECONDS * 1000)}\n"
+            yield _sse_event(current)
+            if current["status"] in FINAL_STATUSES:
+                return
+
+            while time.monotonic() < deadline:
+                try:
+                    change = await asyncio.wait_for(
+                        queue.get(), timeout=settings.STATUS_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": ping\n\n"
+                    continue
+
+                state = (change["status"], change["entregado"])
+                if state == last_state:
+                    continue
+                last_state = state
+                yield _sse_event(change)
+
+                if change["status"] in FINAL_STATUSES:
+                    return
+        finally:
+            status_watcher.unsubscribe(folio, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def acuse_data(request: CertificateRequestColumns) -> dict:
+    """
+    Plain dict with everything the receipt shows (must be picklable for the pool)
+    """
+    nombre = " ".join(
+        part for part in (request.nombre_alumno, request.a_paterno, request.a_materno) if part
+    )
+    return {
+        "folio": request.folio,
+        "nombre_completo": nombre,
+        "curp": request.curp,
+        "tipo_tramite": request.tipo_tramite.value,
+        "cct": request.cct,
+        "nombre_esc": request.nombre_esc,
+        "ciclo_terminacion": request.ciclo_terminacion,
+        "fecha": request.fecha,
+        "status": request.status.value if request.status else "",
+        "entregado": request.entregado.value if request.entregado else "",
+        "requires_payment": request.status == TramiteStatus.REIMPRESION and request.entregado == TramiteEntregado.PENDIENTE,
+        "qr_data": "{}{}/certificates/verify/{}".format(
+            settings.PUBLIC_API_URL,
+            settings.API_V1_STR,
+            create_status_token(request.folio, request.curp, request.status or TramiteStatus.SOLICITADO)
+        )
+    }
+
+
+def _load_acuse_data(db: Session, folio: str) -> Optional[dict]:
+    request = find_by_folio(db, folio.upper())
+    return acuse_data(request) if request else None
+
+
+@router.get("/acuse/{folio}")
+async def get_certificate_acuse(
+    *,
+    db: Session = Depends(get_db),
+    folio: str
+) -> Any:
+    """
+    Download the receipt (acuse) PDF of a certificate request
+
+    The PDF is rendered in the process pool and cached by folio and status,
+    so it is only redrawn when the request changes status.
+    """
+    data = await run_in_threadpool(_load_acuse_data, db, folio)
+
+    if not data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No se encontro solicitud con este folio"
+        )
+
+    cache_key = (data["folio"], data["status"], data["entregado"])
+    pdf = acuse_cache.get(cache_key)
+
+    if pdf is None:
+        try:
+            pdf = await acuse_pool.submit(render_acuse_pdf, data)
+        except PoolSaturatedError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="El servicio de acuses esta ocupado, intenta de nuevo en unos segundos",
+                headers={"Retry-After": "5"}
+            )
+        acuse_cache.set(cache_key, pdf)
+
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"inline; filename=acuse_{data['folio']}.pdf"
+        }
+    )
+
+
+@router.get("/verify/{token}", response_model=CertificateVerifyResponse)
+def verify_certificate_token(
+    *,
+    db: Session = Depends(get_db),
+    token: str,
+    curp: Optional[str] = Query(None, description="CURP a comparar con la del acuse"),
+    live: bool = Query(False, description="Consultar ademas el estatus actual")
+) -> Any:
+    """
+    Verify the signed QR printed on a receipt
+
+    The signature is checked without touching the database; tramites1 is only
+    queried when live=true.
+    """
+    try:
+        claims = verify_status_token(token)
+    except InvalidStatusToken:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Codigo QR invalido o alterado"
+        )
+
+    response = CertificateVerifyResponse(
+        valid=True,
+        folio=claims["folio"],
+        status=claims["status"],
+        issued=claims["issued"]
+    )
+
+    if curp:
+        response.curp_match = hmac.compare_digest(curp_hash(curp), claims["curp_hash"])
+
+    if live:
+        current = find_by_folio(db, claims["folio"], "status", "entregado")
+
+        if not current:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No se encontro solicitud con este folio"
+            )
+
+        response.current_status = current.status
+        response.current_entregado = current.entregado
+
+    return response
+
+
+# Legacy rows have created_at NULL: the list treats them as created on this
+# date, so they come last (newest first) and still page by id
+NULL_CREATED_AT = datetime(1970, 1, 1)
+
+
+def list_sort_key(request: CertificateRequestColumns) -> Tuple[datetime, int]:
+    return request.created_at or NULL_CREATED_AT, request.id
+
+
+def encode_list_cursor(created_at: datetime, request_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{request_id}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_list_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, request_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(request_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginacion invalido"
+        )
+
+
 @router.get("/list/{curp}", response_model=CertificateListResponse)
 def list_certificates_by_curp(
     *,
     db: Session = Depends(get_db),
-    curp: str
+    curp: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor de la pagina anterior")
 ) -> Any:
     """
-    List all certificate requests for a given CURP
+    List certificate requests for a given CURP, newest first (see certificate_list)
+    """
+    return fast_json(certificate_list(db, curp, limit, cursor))
+
+
+def certificate_list(db: Session, curp: str, limit: int, cursor: Optional[str]) -> CertificateListResponse:
+    """
+    List certificate requests for a given CURP, newest first
+
+    Keyset pagination on (created_at, id), with a NULL created_at taken as
+    NULL_CREATED_AT: pass next_cursor from the previous page to get the next one. total is the number of items in this page.
+    tramites1 is read first; tramites1_archivo only when the page reaches
+    requests created before the archive cutoff.
     """
     curp_upper = curp.strip().upper()
+    position = decode_list_cursor(cursor) if cursor else None
 
-    requests = db.query(CertificateRequest).filter(
-        CertificateRequest.curp == curp_upper
-    ).order_by(desc(CertificateRequest.created_at)).all()
-
-    certificates = []
-    for req in requests:
-        requires_payment = req.status == TramiteStatus.REIMPRESION and req.entregado == TramiteEntregado.PENDIENTE
-        certificates.append(
-            CertificateStatusResponse(
-                folio=req.folio,
-                nombre_alumno=req.nombre_alumno,
-                a_paterno=req.a_paterno,
-                a_materno=req.a_materno,
-                curp=req.curp,
-                tipo_tramite=req.tipo_tramite,
-                status=req.status,
-                entregado=req.entregado,
-                fecha=req.fecha,
-                fecha_elaborado=req.fecha_elaborado,
-                region=req.region,
-                requires_payment=requires_payment
-            )
-        )
+    def page(model) -> list:
+        created = func.coalesce(model.created_at, NULL_CREATED_AT)
+        query = db.query(model).filter(model.curp == curp_upper)
+        if position:
+            created_at, request_id = position
+            query = query.filter(or_(
+                created < created_at,
+                and_(created == created_at, model.id < request_id)
+            ))
+        return query.order_by(desc(created), desc(model.id)).limit(limit + 1).all()
+
+    requests = page(CertificateRequest)
+
+    if len(requests) <= limit or list_sort_key(requests[-1])[0] < archive_cutoff_datetime():
+        requests = sorted(
+            requests + page(CertificateRequestArchive),
+            key=list_sort_key,
+            reverse=True
+        )[:limit + 1]
+
+    next_cursor = None
+    if len(requests) > limit:
+        requests = requests[:limit]
+        next_cursor = encode_list_cursor(*list_sort_key(requests[-1]))
+
+    certificates = [certificate_status_response(req) for req in requests]
 
     return CertificateListResponse(
         curp=curp_upper,
         certificates=certificates,
-        total=len(certificates)
+        total=len(certificates),
+        next_cursor=next_cursor
+    )
+
+
+EXPORT_COLUMNS = [
+    "folio", "curp", "nombre_alumno", "a_paterno", "a_materno", "cct", "nombre_esc",
+    "tipo_tramite", "ciclo_terminacion", "region", "status", "entregado",
+    "fecha", "fecha_elaborado", "created_at", "updated_at"
+]
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _iter_export_rows(filters: Callable[[Any], list], include_archive: bool) -> Iterator[dict]:
+    """
+    Stream tramites1 (and optionally tramites1_archivo) rows from a server-side cursor
+
+    Uses its own session: the request session is closed before a streamed
+    response body is sent.
+    """
+    models = [CertificateRequest, CertificateRequestArchive] if include_archive else [CertificateRequest]
+    db = SessionLocal()
+    try:
+        for model in models:
+            columns = [getattr(model, name) for name in EXPORT_COLUMNS]
+            result = db.execute(
+                select(*columns).where(*filters(model)).order_by(model.id).execution_options(
+                    yield_per=settings.CERTIFICATE_EXPORT_BATCH_SIZE
+                )
+            )
+            for row in result:
+                yield {name: _export_value(value) for name, value in zip(EXPORT_COLUMNS, row)}
+    finally:
+        db.close()
+
+
+def _export_ndjson(rows: Iterator[dict]) -> Iterator[bytes]:
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def _export_csv(rows: Iterator[dict]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+@router.get("/export")
+def export_certificate_requests(
+    *,
+    current_user: User = Depends(get_current_admin_user),
+    region: Optional[str] = Query(None, max_length=10),
+    request_status: Optional[TramiteStatus] = Query(None, alias="status"),
+    fecha_desde: Optional[date] = Query(None, description="created_at desde (inclusive)"),
+    fecha_hasta: Optional[date] = Query(None, description="created_at hasta (inclusive)"),
+    file_format: str = Query("ndjson", alias="format", pattern="^(csv|ndjson)$")
+) -> Any:
+    """
+    Export certificate requests as NDJSON or CSV (regional offices)
+
+    Rows are streamed from a server-side cursor in batches of
+    CERTIFICATE_EXPORT_BATCH_SIZE, so memory stays constant for any range.
+    Archived requests (tramites1_archivo) follow the tramites1 rows.
+    """
+    def filters(model) -> list:
+        conditions = []
+        if region:
+            conditions.append(model.region == region)
+        if request_status:
+            conditions.append(model.status == request_status)
+        if fecha_desde:
+            conditions.append(model.created_at >= datetime.combine(fecha_desde, datetime.min.time()))
+        if fecha_hasta:
+            conditions.append(model.created_at < datetime.combine(fecha_hasta + timedelta(days=1), datetime.min.time()))
+        return conditions
+
+    # Archived requests were all created before the cutoff
+    include_archive = fecha_desde is None or datetime.combine(fecha_desde, datetime.min.time()) < archive_cutoff_datetime()
+    rows = _iter_export_rows(filters, include_archive)
+
+    if file_format == "csv":
+        body, media_type = _export_csv(rows), "text/csv; charset=utf-8"
+    else:
+        body, media_type = _export_ndjson(rows), "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=tramites1.{file_format}"}
     )
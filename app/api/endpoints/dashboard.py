@@ -0,0 +1,119 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.responses import to_jsonable
+from app.api.dependencies.auth import get_current_active_user
+from app.api.endpoints.certificates import certificate_list
+from app.api.endpoints.grades import student_grades
+from app.api.endpoints.students import my_students, student_teachers
+from app.models.user import User
+from app.schemas.dashboard import DashboardResponse, DashboardStudent
+from app.schemas.student import StudentWithEnrollment
+from app.schemas.user import User as UserSchema
+from app.services.student_access import StudentAccess
+
+router = APIRouter()
+
+
+def _run_with_session(func: Callable, current_user: User, **kwargs) -> Any:
+    """
+    Run an endpoint function in its own DB session and return JSON-ready data
+
+    Sections run concurrently in worker threads, so each one needs its own
+    session; results are encoded before the session closes, the same way
+    the endpoints serialize them.
+    """
+    db = SessionLocal()
+    try:
+        access = StudentAccess(db, current_user.u_id, current_user.u_correo)
+        return to_jsonable(func(db=db, current_user=current_user, access=access, **kwargs))
+    finally:
+        db.close()
+
+
+def _my_students(db, current_user, access):
+    return [StudentWithEnrollment.model_validate(s) for s in my_students(db, current_user.u_id)]
+
+
+def _grades(db, current_user, access, student_id):
+    return student_grades(db, access, student_id)
+
+
+def _teachers(db, current_user, access, student_id):
+    return student_teachers(db, access, student_id)
+
+
+def _certificates(db, current_user, access, curp):
+    return certificate_list(db, curp, settings.DASHBOARD_CERTIFICATES_LIMIT, None)
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get everything the parent home screen needs in one call
+
+    Gathers the profile, linked students and, for each student, grades,
+    teachers and certificate requests concurrently (at most
+    DASHBOARD_MAX_CONCURRENCY sections at a time). A failing section does
+    not fail the request: it is reported in errors and the rest is returned.
+    """
+    semaphore = asyncio.Semaphore(settings.DASHBOARD_MAX_CONCURRENCY)
+    errors: Dict[str, str] = {}
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    async def section(name: str, func: Callable, **kwargs) -> Any:
+        async with semaphore:
+            section_start = time.perf_counter()
+            try:
+                return await asyncio.wait_for(
+                    run_in_threadpool(_run_with_session, func, current_user, **kwargs),
+                    timeout=settings.DASHBOARD_SECTION_TIMEOUT_SECONDS
+                )
+            except HTTPException as e:
+                errors[name] = str(e.detail)
+            except asyncio.TimeoutError:
+                errors[name] = "Tiempo de espera agotado"
+            except Exception as e:
+                errors[name] = f"Error: {str(e)}"
+            finally:
+                timings[name] = round((time.perf_counter() - section_start) * 1000, 2)
+            return None
+
+    students = await section("students", _my_students) or []
+
+    tasks = []
+    for student in students:
+        al_id = student["al_id"]
+        tasks.append(asyncio.gather(
+            section(f"grades:{al_id}", _grades, student_id=al_id),
+            section(f"teachers:{al_id}", _teachers, student_id=al_id),
+            section(f"certificates:{al_id}", _certificates, curp=student["al_curp"]),
+        ))
+
+    per_student = await asyncio.gather(*tasks)
+
+    timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+
+    return DashboardResponse(
+        user=UserSchema.model_validate(current_user),
+        students=[
+            DashboardStudent(
+                student=student,
+                grades=grades,
+                teachers=teachers,
+                certificates=certificates
+            )
+            for student, (grades, teachers, certificates) in zip(students, per_student)
+        ],
+        errors=errors,
+        timings_ms=timings
+    )
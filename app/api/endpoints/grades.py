@@ -1,14 +1,17 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from collections import defaultdict
 
 from app.core.database import get_db
+from app.core.etag import etag_matches, etag_response, make_etag, not_modified
 from app.api.dependencies.auth import get_current_active_user
+from app.api.dependencies.student_access import get_student_access
 from app.models.user import User
-from app.models.student import StudentParent
 from app.models.grade import Grade
 from app.schemas.grade import Grade as GradeSchema, GradesByPeriod
+from app.services.student_access import StudentAccess
 
 router = APIRouter()
 
@@ -16,24 +19,63 @@ router = APIRouter()
 @router.get("/student/{student_id}", response_model=List[GradesByPeriod])
 def get_student_grades(
     student_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    access: StudentAccess = Depends(get_student_access),
 ) -> Any:
     """
     Get all grades for a specific student
+
+    The result is built to match GradesByPeriod, so it is returned without
+    re-validating it against the response_model. The ETag comes from
+    grades_version, so a 304 does not load or serialize the grades.
     """
-    # Verify that the student is linked to the current user
-    student_parent = db.query(StudentParent).filter(
-        StudentParent.al_id == student_id,
-        StudentParent.u_id == current_user.u_id
-    ).first()
+    require_grades_access(access, student_id)
+
+    etag = make_etag(student_id, *grades_version(db, student_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return etag_response(grades_by_period(db, student_id), etag)
 
-    if not student_parent:
+
+def require_grades_access(access: StudentAccess, student_id: int) -> None:
+    # Verify that the student is linked to the current user
+    if not access.is_linked(student_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this student's grades"
         )
 
+
+def grades_version(db: Session, student_id: int) -> tuple:
+    """
+    Count and checksum of a student's grades (SCE006 has no updated_at)
+
+    One aggregate row computed by MySQL instead of every grade.
+    """
+    row_checksum = func.crc32(func.concat_ws(
+        "|", Grade.id, Grade.matricula_id, Grade.materia, Grade.periodo,
+        Grade.calificacion, Grade.observaciones
+    ))
+    count, checksum = db.query(
+        func.count(Grade.id), func.coalesce(func.sum(row_checksum), 0)
+    ).filter(Grade.al_id == student_id).one()
+    return count, int(checksum)
+
+
+def student_grades(db: Session, access: StudentAccess, student_id: int) -> List[dict]:
+    """
+    Grades of a linked student grouped by period (used by the dashboard)
+    """
+    require_grades_access(access, student_id)
+    return grades_by_period(db, student_id)
+
+
+def grades_by_period(db: Session, student_id: int) -> List[dict]:
+    """
+    Grades grouped by period, without the access check (callers do it once)
+    """
     # Get all grades for the student
     grades = db.query(Grade).filter(Grade.al_id == student_id).all()
 
@@ -49,7 +91,7 @@ def get_student_grades(
             "matricula_id": grade.matricula_id,
             "materia": grade.materia,
             "periodo": grade.periodo,
-            "calificacion": float(grade.calificacion),
+            "calificacion": float(grade.calificacion) if grade.calificacion is not None else None,
             "observaciones": grade.observaciones
         }
         grades_by_period[grade.periodo].append(grade_dict)
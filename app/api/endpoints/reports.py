@@ -3,10 +3,14 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 import requests
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.query_cache import query_cache
 from app.api.dependencies.auth import get_current_active_user
+from app.api.dependencies.student_access import get_student_access, require_student_access
 from app.models.user import User
 from app.schemas.report import BoletaResponse
+from app.services.student_access import StudentAccess
 
 router = APIRouter()
 
@@ -20,6 +24,7 @@ async def get_boleta_pdf(
     *,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    access: StudentAccess = Depends(get_student_access),
     al_id: int
 ) -> Any:
     """
@@ -27,25 +32,8 @@ async def get_boleta_pdf(
 
     Returns PDF directly or error message
     """
-    from sqlalchemy import text
-
     # Verify student belongs to current user
-    verify_query = text("""
-        SELECT al_id FROM pp_alumnos
-        WHERE al_id = :al_id
-        AND (padre = :correo OR madre = :correo OR tutor = :correo)
-    """)
-
-    result = db.execute(verify_query, {
-        "al_id": al_id,
-        "correo": current_user.u_correo
-    }).fetchone()
-
-    if not result:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes acceso a este estudiante"
-        )
+    require_student_access(access, al_id)
 
     # Call Azure API
     api_url = f"{SCE_API_BASE_URL}/boletas/{al_id}"
@@ -98,6 +86,7 @@ async def get_certificado_electronico(
     *,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    access: StudentAccess = Depends(get_student_access),
     al_id: int,
     ciclo: str = "2425"  # Default to current cycle
 ) -> Any:
@@ -106,25 +95,10 @@ async def get_certificado_electronico(
 
     Returns redirect to certificate URL or error if not available
     """
-    from sqlalchemy import text
-
     # Verify student belongs to current user
-    verify_query = text("""
-        SELECT al_id FROM pp_alumnos
-        WHERE al_id = :al_id
-        AND (padre = :correo OR madre = :correo OR tutor = :correo)
-    """)
+    require_student_access(access, al_id)
 
-    result = db.execute(verify_query, {
-        "al_id": al_id,
-        "correo": current_user.u_correo
-    }).fetchone()
-
-    if not result:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes acceso a este estudiante"
-        )
+    from sqlalchemy import text
 
     # Check if certificate exists (IdEstatus = 4 means signed/ready)
     cert_query = text("""
@@ -133,7 +107,11 @@ async def get_certificado_electronico(
         WHERE al_id = :al_id
     """)
 
-    cert_result = db.execute(cert_query, {"al_id": al_id}).fetchone()
+    # SCE039 is written by the certificate system, so only the short TTL applies
+    cert_result = query_cache.fetch_one(
+        db, cert_query, {"al_id": al_id}, tables=("SCE039",),
+        ttl=settings.QUERY_CACHE_SCE039_TTL_SECONDS
+    )
 
     if not cert_result or cert_result[0] != 4:
         raise HTTPException(
@@ -156,6 +134,7 @@ async def get_reporte_componentes(
     *,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    access: StudentAccess = Depends(get_student_access),
     al_id: int,
     ciclo: str = "2223"  # Default to 2022-2023
 ) -> Any:
@@ -164,25 +143,8 @@ async def get_reporte_componentes(
 
     Returns redirect to report URL
     """
-    from sqlalchemy import text
-
     # Verify student belongs to current user
-    verify_query = text("""
-        SELECT al_id FROM pp_alumnos
-        WHERE al_id = :al_id
-        AND (padre = :correo OR madre = :correo OR tutor = :correo)
-    """)
-
-    result = db.execute(verify_query, {
-        "al_id": al_id,
-        "correo": current_user.u_correo
-    }).fetchone()
-
-    if not result:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes acceso a este estudiante"
-        )
+    require_student_access(access, al_id)
 
     # Generate report URL
     import base64
@@ -1,10 +1,17 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Union
+from datetime import datetime
+import unicodedata
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.database import get_db
+from app.core.etag import body_etag_response
+from app.core.query_cache import query_cache
+from app.core.responses import fast_json
 from app.api.dependencies.auth import get_current_active_user
+from app.api.dependencies.student_access import get_student_access, require_student_access
 from app.models.user import User
 from app.models.student import Student, StudentParent, Enrollment
 from app.schemas.student import (
@@ -12,23 +19,39 @@ from app.schemas.student import (
     StudentParentCreate,
     AddStudentRequest,
     AddStudentResponse,
+    AddStudentsBatchRequest,
+    AddStudentBatchResult,
+    AddStudentsBatchResponse,
 )
 from app.services.usebeq_api_service import USEBEQAPIService
+from app.services.student_access import StudentAccess, student_access_cache
+from app.services.parent_links import PARENTESCOS, sync_parent_link
 
 router = APIRouter()
 
 
 @router.get("/my-students", response_model=List[StudentWithEnrollment])
 def get_my_students(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Get all students linked to current user
+
+    SCE004/SCE005 have no version column, so the ETag is a hash of the body.
+    """
+    students = [StudentWithEnrollment.model_validate(s) for s in my_students(db, current_user.u_id)]
+    return body_etag_response(request, students)
+
+
+def my_students(db: Session, user_id: int) -> List[dict]:
+    """
+    Students linked to a user, each with their latest enrollment
     """
     # Get student-parent relationships
     student_parents = db.query(StudentParent).filter(
-        StudentParent.u_id == current_user.u_id
+        StudentParent.u_id == user_id
     ).all()
 
     students_data = []
@@ -97,6 +120,7 @@ async def link_student(
         )
         db.add(student_parent)
         db.commit()
+        student_access_cache.invalidate(current_user.u_id)
 
         return {
             "message": "Student linked successfully",
@@ -233,6 +257,7 @@ async def link_student_with_cct(
         )
         db.add(student_parent)
         db.commit()
+        student_access_cache.invalidate(current_user.u_id)
 
         return {
             "success": True,
@@ -282,307 +307,444 @@ def unlink_student(
 
     db.delete(student_parent)
     db.commit()
+    student_access_cache.invalidate(current_user.u_id)
 
     return {"message": "Student unlinked successfully"}
 
 
-@router.post("/add-student", response_model=AddStudentResponse)
-def add_student_to_account(
-    *,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-    student_data: AddStudentRequest
-) -> Any:
+# Students matching CURP in SCE004 with their group in SCE002
+ENROLLED_STUDENTS_QUERY = text("""
+    SELECT dbo.SCE004.al_curp, dbo.SCE004.al_appat, dbo.SCE004.al_apmat,
+           dbo.SCE004.al_nombre, dbo.SCE004.al_id, dbo.SCE002.eg_grado,
+           dbo.SCE002.clavecct, dbo.SCE002.eg_grupo
+    FROM dbo.SCE002
+    INNER JOIN dbo.SCE006 ON dbo.SCE002.eg_id = dbo.SCE006.eg_id
+    INNER JOIN dbo.SCE004 ON dbo.SCE006.al_id = dbo.SCE004.al_id
+    WHERE dbo.SCE004.al_curp IN :curps
+    AND dbo.SCE004.al_estatus IN ('I', 'A', 'E', 'B')
+    GROUP BY dbo.SCE004.al_curp, dbo.SCE004.al_appat, dbo.SCE004.al_apmat,
+             dbo.SCE004.al_nombre, dbo.SCE004.al_id, dbo.SCE002.eg_grado,
+             dbo.SCE002.clavecct, dbo.SCE002.eg_grupo
+""").bindparams(bindparam("curps", expanding=True))
+
+# Current cycle group of already linked students
+CURRENT_GROUPS_QUERY = text("""
+    SELECT dbo.SCE004.al_id, dbo.SCE002.eg_grado, dbo.SCE002.eg_grupo,
+           dbo.SCE002.clavecct
+    FROM dbo.SCE002
+    INNER JOIN dbo.SCE006 ON dbo.SCE002.eg_id = dbo.SCE006.eg_id
+    INNER JOIN dbo.SCE004 ON dbo.SCE006.al_id = dbo.SCE004.al_id
+    WHERE dbo.SCE004.al_id IN :al_ids
+    AND dbo.SCE002.ce_inicic = :year
+""").bindparams(bindparam("al_ids", expanding=True))
+
+INSERT_SIBLING = text("""
+    INSERT INTO pp_hermanos (
+        al_id, al_curp, al_nombre, al_appat, al_apmat,
+        al_cct, al_grado, al_grupo,
+        her_id, her_curp, her_nombre, her_appat, her_apmat,
+        her_cct, her_grado, her_grupo
+    ) VALUES (
+        :al_id, :al_curp, :al_nombre, :al_appat, :al_apmat,
+        :al_cct, :al_grado, :al_grupo,
+        :her_id, :her_curp, :her_nombre, :her_appat, :her_apmat,
+        :her_cct, :her_grado, :her_grupo
+    )
+""")
+
+
+def remove_accents(value: str) -> str:
     """
-    Add student to parent account with full validation
+    Remove accents (combining marks) from a string
+    """
+    return ''.join(c for c in unicodedata.normalize('NFD', value)
+                   if unicodedata.category(c) != 'Mn')
 
-    This endpoint:
-    - Validates student exists in SCE004
-    - Validates apellido, CCT, and grupo match
-    - Checks if student already linked to account
-    - Automatically detects siblings
-    - Links student to parent account
+
+def _same_text(db_value: Any, value: str) -> bool:
+    """
+    Compare a DB value the way the case/accent-insensitive collation does
     """
-    from sqlalchemy import text
-    from datetime import datetime
-    import unicodedata
+    if db_value is None:
+        return False
+    return remove_accents(str(db_value).strip().upper()) == value
 
-    # Normalize input data
-    curp = student_data.curp.strip().upper()
-    apellido = student_data.apellido.strip().upper()
-    cct = student_data.cct.strip().upper()
-    grupo = student_data.grupo.strip().upper()
-    parentesco = student_data.parentesco.upper()
+
+def _sibling_row(older: dict, younger: dict) -> dict:
+    """
+    Build pp_hermanos parameters; the older student goes in the al_* columns
+    """
+    row = {}
+    for prefix, student in (("al", older), ("her", younger)):
+        row.update({
+            f"{prefix}_id": student["al_id"],
+            f"{prefix}_curp": student["al_curp"],
+            f"{prefix}_nombre": student["al_nombre"],
+            f"{prefix}_appat": student["al_appat"],
+            f"{prefix}_apmat": student["al_apmat"],
+            f"{prefix}_cct": student["cct"],
+            f"{prefix}_grado": student["grado"],
+            f"{prefix}_grupo": student["grupo"],
+        })
+    return row
+
+
+def add_students_to_account(
+    db: Session,
+    current_user: User,
+    students_data: List[AddStudentRequest]
+) -> List[Union[AddStudentResponse, HTTPException]]:
+    """
+    Link one or more students to the parent account
+
+    Validation, the pp_alumnos lookup and the sibling scan run as a handful of
+    set-based queries for all items; each item is then written inside its own
+    savepoint so a failing item does not undo the others. Everything is
+    committed in a single transaction. Returns, per item, either the response
+    or the HTTPException describing why it was rejected.
+    """
     correo = current_user.u_correo
 
-    # Remove accents from apellido
-    def remove_accents(text):
-        return ''.join(c for c in unicodedata.normalize('NFD', text)
-                      if unicodedata.category(c) != 'Mn')
+    # Normalize input data
+    items = [
+        {
+            "curp": s.curp.strip().upper(),
+            "apellido": remove_accents(s.apellido.strip().upper()),
+            "cct": s.cct.strip().upper(),
+            "grupo": s.grupo.strip().upper(),
+            "parentesco": s.parentesco.upper(),
+        }
+        for s in students_data
+    ]
+    curps = sorted({item["curp"] for item in items})
+
+    # Students already registered in pp_alumnos, by CURP
+    pp_query = text("""
+        SELECT al_id, al_curp, al_appat, al_apmat, al_nombre, padre, madre, tutor
+        FROM pp_alumnos
+        WHERE al_curp IN :curps
+    """).bindparams(bindparam("curps", expanding=True))
+
+    pp_rows = {
+        row[1]: {
+            "al_id": row[0], "al_curp": row[1], "al_appat": row[2],
+            "al_apmat": row[3], "al_nombre": row[4],
+            "padre": row[5], "madre": row[6], "tutor": row[7]
+        }
+        for row in db.execute(pp_query, {"curps": curps}).fetchall()
+    }
 
-    apellido = remove_accents(apellido)
+    # SCE004/SCE002 candidates for the rest, validated in memory per item
+    candidates = {}
+    new_curps = [curp for curp in curps if curp not in pp_rows]
+    if new_curps:
+        for row in db.execute(ENROLLED_STUDENTS_QUERY, {"curps": new_curps}).fetchall():
+            candidates.setdefault(row[0], []).append(row)
 
-    # Validate parentesco
-    if parentesco not in ['PADRE', 'MADRE', 'TUTOR']:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Parentesco debe ser PADRE, MADRE o TUTOR"
-        )
+    # Students already linked to this parent (sibling candidates)
+    linked_students_query = text("""
+        SELECT DISTINCT a.al_id, a.al_appat, a.al_apmat, a.al_nombre, a.al_curp
+        FROM pp_alumnos_padres v
+        INNER JOIN pp_alumnos a ON a.al_id = v.al_id
+        WHERE v.correo = :correo
+    """)
 
-    # Check if student already exists in pp_alumnos by CURP
-    existing_query = text("SELECT al_id, padre, madre, tutor FROM pp_alumnos WHERE al_curp = :curp")
-    existing_result = db.execute(existing_query, {"curp": curp}).fetchone()
+    linked = {
+        row[0]: {
+            "al_id": row[0], "al_appat": row[1], "al_apmat": row[2],
+            "al_nombre": row[3], "al_curp": row[4]
+        }
+        for row in db.execute(linked_students_query, {"correo": correo}).fetchall()
+    }
 
-    if existing_result:
-        # Student already exists, update parentesco
-        al_id = existing_result[0]
-        padre = existing_result[1]
-        madre = existing_result[2]
-        tutor = existing_result[3]
+    # School cycle starts in August: adjust year if in first half of year
+    now = datetime.now()
+    current_year = now.year - 1 if now.month <= 7 else now.year
+
+    known_ids = set(linked) | {row["al_id"] for row in pp_rows.values()}
+    current_groups = {}
+    if known_ids:
+        groups_result = query_cache.fetch_all(db, CURRENT_GROUPS_QUERY, {
+            "al_ids": sorted(known_ids),
+            "year": str(current_year)
+        }, tables=("SCE002", "SCE006"))
+        for row in groups_result:
+            current_groups.setdefault(row[0], {"grado": row[1], "grupo": row[2], "cct": row[3]})
+
+    # Existing sibling pairs among every student involved
+    pair_ids = known_ids | {row[4] for rows in candidates.values() for row in rows}
+    sibling_pairs = set()
+    if pair_ids:
+        pairs_query = text("""
+            SELECT al_id, her_id FROM pp_hermanos
+            WHERE al_id IN :ids OR her_id IN :ids
+        """).bindparams(bindparam("ids", expanding=True))
+        sibling_pairs = {
+            (row[0], row[1])
+            for row in db.execute(pairs_query, {"ids": sorted(pair_ids)}).fetchall()
+        }
 
-        # Check if current user already linked
-        if parentesco == 'PADRE' and padre == correo:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Este estudiante ya está vinculado a tu cuenta como PADRE"
-            )
-        if parentesco == 'MADRE' and madre == correo:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Este estudiante ya está vinculado a tu cuenta como MADRE"
-            )
-        if parentesco == 'TUTOR' and tutor == correo:
-            raise HTTPException(
+    students_by_id = {
+        student.al_id: student
+        for student in db.query(Student).filter(
+            Student.al_id.in_([row["al_id"] for row in pp_rows.values()])
+        ).all()
+    } if pp_rows else {}
+
+    fecha = now.strftime("%d-%m-%Y")
+    replaced_correos = set()
+    results = []
+
+    for item in items:
+        curp = item["curp"]
+        apellido = item["apellido"]
+        parentesco = item["parentesco"]
+
+        # Validate parentesco
+        if parentesco not in PARENTESCOS:
+            results.append(HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Este estudiante ya está vinculado a tu cuenta como TUTOR"
-            )
+                detail="Parentesco debe ser PADRE, MADRE o TUTOR"
+            ))
+            continue
 
-        # Update parentesco
-        update_field = parentesco.lower()
-        update_query = text(f"UPDATE pp_alumnos SET {update_field} = :correo WHERE al_id = :al_id")
-        db.execute(update_query, {"correo": correo, "al_id": al_id})
-        db.commit()
+        existing = pp_rows.get(curp)
+
+        if existing:
+            # Student already exists, update parentesco
+            al_id = existing["al_id"]
+            update_field = parentesco.lower()
+
+            # Check if current user already linked
+            if existing[update_field] == correo:
+                results.append(HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Este estudiante ya está vinculado a tu cuenta como {parentesco}"
+                ))
+                continue
+
+            try:
+                with db.begin_nested():
+                    update_query = text(f"UPDATE pp_alumnos SET {update_field} = :correo WHERE al_id = :al_id")
+                    db.execute(update_query, {"correo": correo, "al_id": al_id})
+                    previous_correo = sync_parent_link(db, al_id, parentesco, correo)
+            except SQLAlchemyError as e:
+                results.append(HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Error al agregar estudiante: {str(e)}"
+                ))
+                continue
+
+            existing[update_field] = correo
+            linked.setdefault(al_id, existing)
+            if previous_correo:
+                replaced_correos.add(previous_correo)
+
+            student = students_by_id.get(al_id)
+            results.append(AddStudentResponse(
+                success=True,
+                message="Estudiante agregado correctamente.",
+                student={
+                    "al_id": al_id,
+                    "al_curp": student.al_curp if student else existing["al_curp"],
+                    "al_nombre": student.al_nombre if student else existing["al_nombre"],
+                    "al_appat": student.al_appat if student else existing["al_appat"],
+                    "al_apmat": student.al_apmat if student else existing["al_apmat"]
+                }
+            ))
+            continue
+
+        # Student doesn't exist in pp_alumnos, match against SCE004/SCE002
+        result = next((
+            row for row in candidates.get(curp, [])
+            if _same_text(row[1], apellido)
+            and _same_text(row[6], item["cct"])
+            and _same_text(row[7], item["grupo"])
+        ), None)
+
+        if not result:
+            results.append(HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No se encuentra al estudiante. Intente nuevamente."
+            ))
+            continue
+
+        new_student = {
+            "al_id": result[4],
+            "al_curp": curp,
+            "al_nombre": result[3],
+            "al_appat": apellido,
+            "al_apmat": result[2],
+            "grado": result[5],
+            "cct": result[6],
+            "grupo": result[7],
+        }
+        al_id = new_student["al_id"]
 
-        # Get student info
-        student = db.query(Student).filter(Student.al_id == al_id).first()
+        # Detect siblings: same apellidos among students already linked
+        new_siblings = []
+        siblings_detected = []
+        for linked_student in linked.values():
+            if apellido != linked_student["al_appat"] or new_student["al_apmat"] != linked_student["al_apmat"]:
+                continue
 
-        return AddStudentResponse(
+            group = current_groups.get(linked_student["al_id"])
+            if not group:
+                continue
+
+            sibling = dict(linked_student, **group)
+
+            # Determine order by birth year in CURP (positions 4-5)
+            if curp[4:6] < sibling["al_curp"][4:6]:
+                older, younger = new_student, sibling
+            else:
+                older, younger = sibling, new_student
+
+            if (older["al_id"], younger["al_id"]) not in sibling_pairs:
+                new_siblings.append((older, younger))
+                siblings_detected.append(sibling["al_nombre"] + " " + sibling["al_appat"])
+
+        try:
+            with db.begin_nested():
+                for older, younger in new_siblings:
+                    db.execute(INSERT_SIBLING, _sibling_row(older, younger))
+
+                # Insert student into pp_alumnos
+                insert_query = text(f"""
+                    INSERT INTO pp_alumnos (
+                        al_curp, al_appat, al_apmat, al_nombre, al_id,
+                        fecha_alta, estatus, {parentesco.lower()}
+                    ) VALUES (
+                        :al_curp, :al_appat, :al_apmat, :al_nombre, :al_id,
+                        :fecha_alta, :estatus, :correo
+                    )
+                """)
+                db.execute(insert_query, {
+                    "al_curp": curp,
+                    "al_appat": apellido,
+                    "al_apmat": new_student["al_apmat"],
+                    "al_nombre": new_student["al_nombre"],
+                    "al_id": al_id,
+                    "fecha_alta": fecha,
+                    "estatus": 'A',
+                    "correo": correo
+                })
+                sync_parent_link(db, al_id, parentesco, correo)
+        except SQLAlchemyError as e:
+            results.append(HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al agregar estudiante: {str(e)}"
+            ))
+            continue
+
+        # Later items in the same batch see this student as linked
+        sibling_pairs.update((older["al_id"], younger["al_id"]) for older, younger in new_siblings)
+        pp_rows[curp] = {
+            "al_id": al_id, "al_curp": curp, "al_appat": apellido,
+            "al_apmat": new_student["al_apmat"], "al_nombre": new_student["al_nombre"],
+            "padre": None, "madre": None, "tutor": None,
+            parentesco.lower(): correo
+        }
+        linked[al_id] = pp_rows[curp]
+        current_groups[al_id] = {
+            "grado": new_student["grado"],
+            "grupo": new_student["grupo"],
+            "cct": new_student["cct"]
+        }
+
+        results.append(AddStudentResponse(
             success=True,
             message="Estudiante agregado correctamente.",
             student={
-                "al_id": student.al_id,
-                "al_curp": student.al_curp,
-                "al_nombre": student.al_nombre,
-                "al_appat": student.al_appat,
-                "al_apmat": student.al_apmat
-            }
-        )
-
-    # Student doesn't exist in pp_alumnos, search in SCE004
-    search_query = text("""
-        SELECT dbo.SCE004.al_curp, dbo.SCE004.al_appat, dbo.SCE004.al_apmat,
-               dbo.SCE004.al_nombre, dbo.SCE004.al_id, dbo.SCE002.eg_grado,
-               dbo.SCE002.clavecct, dbo.SCE002.eg_grupo
-        FROM dbo.SCE002
-        INNER JOIN dbo.SCE006 ON dbo.SCE002.eg_id = dbo.SCE006.eg_id
-        INNER JOIN dbo.SCE004 ON dbo.SCE006.al_id = dbo.SCE004.al_id
-        WHERE dbo.SCE004.al_curp = :curp
-        AND dbo.SCE004.al_appat = :apellido
-        AND dbo.SCE002.clavecct = :cct
-        AND dbo.SCE002.eg_grupo = :grupo
-        AND dbo.SCE004.al_estatus IN ('I', 'A', 'E', 'B')
-        GROUP BY dbo.SCE004.al_curp, dbo.SCE004.al_appat, dbo.SCE004.al_apmat,
-                 dbo.SCE004.al_nombre, dbo.SCE004.al_id, dbo.SCE002.eg_grado,
-                 dbo.SCE002.clavecct, dbo.SCE002.eg_grupo
-    """)
+                "al_id": al_id,
+                "al_curp": curp,
+                "al_nombre": new_student["al_nombre"],
+                "al_appat": apellido,
+                "al_apmat": new_student["al_apmat"],
+                "grado": new_student["grado"],
+                "grupo": new_student["grupo"],
+                "cct": new_student["cct"]
+            },
+            siblings=siblings_detected if siblings_detected else None
+        ))
 
-    result = db.execute(search_query, {
-        "curp": curp,
-        "apellido": apellido,
-        "cct": cct,
-        "grupo": grupo
-    }).fetchone()
+    db.commit()
 
-    if not result:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No se encuentra al estudiante. Intente nuevamente."
-        )
+    # Invalidate cached access of this user and of any parent replaced
+    student_access_cache.invalidate(current_user.u_id)
+    if replaced_correos:
+        for previous_user in db.query(User.u_id).filter(User.u_correo.in_(replaced_correos)).all():
+            student_access_cache.invalidate(previous_user[0])
 
-    # Extract student info
-    al_apmat = result[2]
-    al_nombre = result[3]
-    al_id = result[4]
-    al_grado = result[5]
-    al_cct = result[6]
-    al_grupo = result[7]
+    return results
 
-    # Detect siblings automatically
-    siblings_detected = []
-    current_year = datetime.now().year
-    month = datetime.now().month
 
-    # Adjust year if in first half of year
-    if month <= 7:
-        current_year -= 1
+@router.post("/add-student", response_model=AddStudentResponse)
+def add_student_to_account(
+    *,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    student_data: AddStudentRequest
+) -> Any:
+    """
+    Add student to parent account with full validation
 
-    # Get all students already linked to this parent
-    linked_students_query = text("""
-        SELECT al_id, al_appat, al_apmat, al_nombre, al_curp
-        FROM pp_alumnos
-        WHERE padre = :correo OR madre = :correo OR tutor = :correo
-    """)
+    This endpoint:
+    - Validates student exists in SCE004
+    - Validates apellido, CCT, and grupo match
+    - Checks if student already linked to account
+    - Automatically detects siblings
+    - Links student to parent account
+    """
+    result = add_students_to_account(db, current_user, [student_data])[0]
 
-    linked_students = db.execute(linked_students_query, {"correo": correo}).fetchall()
-
-    for linked in linked_students:
-        linked_al_id = linked[0]
-        linked_appat = linked[1]
-        linked_apmat = linked[2]
-        linked_nombre = linked[3]
-        linked_curp = linked[4]
-
-        # Check if same apellidos (siblings)
-        if apellido == linked_appat and al_apmat == linked_apmat:
-            # Get linked student current info
-            linked_info_query = text("""
-                SELECT dbo.SCE004.al_curp, dbo.SCE002.eg_grado, dbo.SCE002.eg_grupo,
-                       dbo.SCE002.clavecct
-                FROM dbo.SCE002
-                INNER JOIN dbo.SCE006 ON dbo.SCE002.eg_id = dbo.SCE006.eg_id
-                INNER JOIN dbo.SCE004 ON dbo.SCE006.al_id = dbo.SCE004.al_id
-                WHERE dbo.SCE004.al_id = :al_id
-                AND dbo.SCE002.ce_inicic = :year
-            """)
+    if isinstance(result, HTTPException):
+        raise result
 
-            linked_info = db.execute(linked_info_query, {
-                "al_id": linked_al_id,
-                "year": str(current_year)
-            }).fetchone()
-
-            if linked_info:
-                linked_al_cct = linked_info[3]
-                linked_al_grado = linked_info[1]
-                linked_al_grupo = linked_info[2]
-
-                # Determine order by birth year in CURP (positions 4-5)
-                year_new = curp[4:6]
-                year_linked = linked_curp[4:6]
-
-                # Insert sibling relationship in correct order
-                if year_new < year_linked:
-                    # New student is older
-                    check_sibling = text("""
-                        SELECT h_id FROM pp_hermanos
-                        WHERE al_id = :al_id AND her_id = :her_id
-                    """)
-                    exists = db.execute(check_sibling, {
-                        "al_id": al_id,
-                        "her_id": linked_al_id
-                    }).fetchone()
-
-                    if not exists:
-                        insert_sibling = text("""
-                            INSERT INTO pp_hermanos (
-                                al_id, al_curp, al_nombre, al_appat, al_apmat,
-                                al_cct, al_grado, al_grupo,
-                                her_id, her_curp, her_nombre, her_appat, her_apmat,
-                                her_cct, her_grado, her_grupo
-                            ) VALUES (
-                                :al_id, :al_curp, :al_nombre, :al_appat, :al_apmat,
-                                :al_cct, :al_grado, :al_grupo,
-                                :her_id, :her_curp, :her_nombre, :her_appat, :her_apmat,
-                                :her_cct, :her_grado, :her_grupo
-                            )
-                        """)
-                        db.execute(insert_sibling, {
-                            "al_id": al_id, "al_curp": curp, "al_nombre": al_nombre,
-                            "al_appat": apellido, "al_apmat": al_apmat,
-                            "al_cct": al_cct, "al_grado": al_grado, "al_grupo": al_grupo,
-                            "her_id": linked_al_id, "her_curp": linked_curp,
-                            "her_nombre": linked_nombre, "her_appat": linked_appat,
-                            "her_apmat": linked_apmat, "her_cct": linked_al_cct,
-                            "her_grado": linked_al_grado, "her_grupo": linked_al_grupo
-                        })
-                        siblings_detected.append(linked_nombre + " " + linked_appat)
-
-                else:
-                    # Linked student is older
-                    check_sibling = text("""
-                        SELECT h_id FROM pp_hermanos
-                        WHERE al_id = :al_id AND her_id = :her_id
-                    """)
-                    exists = db.execute(check_sibling, {
-                        "al_id": linked_al_id,
-                        "her_id": al_id
-                    }).fetchone()
-
-                    if not exists:
-                        insert_sibling = text("""
-                            INSERT INTO pp_hermanos (
-                                al_id, al_curp, al_nombre, al_appat, al_apmat,
-                                al_cct, al_grado, al_grupo,
-                                her_id, her_curp, her_nombre, her_appat, her_apmat,
-                                her_cct, her_grado, her_grupo
-                            ) VALUES (
-                                :al_id, :al_curp, :al_nombre, :al_appat, :al_apmat,
-                                :al_cct, :al_grado, :al_grupo,
-                                :her_id, :her_curp, :her_nombre, :her_appat, :her_apmat,
-                                :her_cct, :her_grado, :her_grupo
-                            )
-                        """)
-                        db.execute(insert_sibling, {
-                            "al_id": linked_al_id, "al_curp": linked_curp,
-                            "al_nombre": linked_nombre, "al_appat": linked_appat,
-                            "al_apmat": linked_apmat, "al_cct": linked_al_cct,
-                            "al_grado": linked_al_grado, "al_grupo": linked_al_grupo,
-                            "her_id": al_id, "her_curp": curp,
-                            "her_nombre": al_nombre, "her_appat": apellido,
-                            "her_apmat": al_apmat, "her_cct": al_cct,
-                            "her_grado": al_grado, "her_grupo": al_grupo
-                        })
-                        siblings_detected.append(linked_nombre + " " + linked_appat)
-
-    # Insert student into pp_alumnos
-    fecha = datetime.now().strftime("%d-%m-%Y")
-
-    insert_query = text(f"""
-        INSERT INTO pp_alumnos (
-            al_curp, al_appat, al_apmat, al_nombre, al_id,
-            fecha_alta, estatus, {parentesco.lower()}
-        ) VALUES (
-            :al_curp, :al_appat, :al_apmat, :al_nombre, :al_id,
-            :fecha_alta, :estatus, :correo
-        )
-    """)
+    return result
 
-    db.execute(insert_query, {
-        "al_curp": curp,
-        "al_appat": apellido,
-        "al_apmat": al_apmat,
-        "al_nombre": al_nombre,
-        "al_id": al_id,
-        "fecha_alta": fecha,
-        "estatus": 'A',
-        "correo": correo
-    })
 
-    db.commit()
+@router.post("/add-students", response_model=AddStudentsBatchResponse)
+def add_students_to_account_batch(
+    *,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    batch: AddStudentsBatchRequest
+) -> Any:
+    """
+    Add several students to parent account in one call
 
-    return AddStudentResponse(
-        success=True,
-        message="Estudiante agregado correctamente.",
-        student={
-            "al_id": al_id,
-            "al_curp": curp,
-            "al_nombre": al_nombre,
-            "al_appat": apellido,
-            "al_apmat": al_apmat,
-            "grado": al_grado,
-            "grupo": al_grupo,
-            "cct": al_cct
-        },
-        siblings=siblings_detected if siblings_detected else None
+    Runs the same validation as /add-student for every item, detects siblings
+    among the new students and the ones already linked, and writes everything
+    in one transaction. Returns one result per item, in request order; an item
+    that fails does not prevent the others from being linked.
+    """
+    results = add_students_to_account(db, current_user, batch.students)
+
+    items = []
+    for index, (student_data, result) in enumerate(zip(batch.students, results)):
+        if isinstance(result, HTTPException):
+            items.append(AddStudentBatchResult(
+                index=index,
+                curp=student_data.curp.strip().upper(),
+                status_code=result.status_code,
+                success=False,
+                message=result.detail
+            ))
+        else:
+            items.append(AddStudentBatchResult(
+                index=index,
+                curp=student_data.curp.strip().upper(),
+                **result.model_dump()
+            ))
+
+    added = sum(1 for item in items if item.success)
+
+    return AddStudentsBatchResponse(
+        success=added == len(items),
+        added=added,
+        total=len(items),
+        results=items
     )
 
 
@@ -591,6 +753,7 @@ def get_student_teachers(
     *,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    access: StudentAccess = Depends(get_student_access),
     student_id: int
 ) -> Any:
     """
@@ -598,25 +761,15 @@ def get_student_teachers(
 
     Returns all teachers teaching the student's group
     """
-    from sqlalchemy import text
-
-    # Verify student belongs to current user
-    verify_query = text("""
-        SELECT al_id FROM pp_alumnos
-        WHERE al_id = :student_id
-        AND (padre = :correo OR madre = :correo OR tutor = :correo)
-    """)
+    return fast_json(student_teachers(db, access, student_id))
 
-    result = db.execute(verify_query, {
-        "student_id": student_id,
-        "correo": current_user.u_correo
-    }).fetchone()
 
-    if not result:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No tienes acceso a este estudiante"
-        )
+def student_teachers(db: Session, access: StudentAccess, student_id: int) -> dict:
+    """
+    Teachers of the student's current group, checked against the user's access
+    """
+    # Verify student belongs to current user
+    require_student_access(access, student_id)
 
     # Get student's current group
     group_query = text("""
@@ -627,7 +780,7 @@ def get_student_teachers(
         WHERE dbo.SCE006.al_id = :student_id
     """)
 
-    group_info = db.execute(group_query, {"student_id": student_id}).fetchone()
+    group_info = query_cache.fetch_one(db, group_query, {"student_id": student_id}, tables=("SCE002", "SCE006"))
 
     if not group_info:
         return {
@@ -653,7 +806,7 @@ def get_student_teachers(
         ORDER BY dbo.SCE035.as_nombre
     """)
 
-    teachers_result = db.execute(teachers_query, {"eg_id": eg_id}).fetchall()
+    teachers_result = query_cache.fetch_all(db, teachers_query, {"eg_id": eg_id}, tables=("SCE023", "SCE034", "SCE035"))
 
     teachers = []
     for teacher in teachers_result:
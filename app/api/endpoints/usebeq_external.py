@@ -1,13 +1,16 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 import io
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.api.dependencies.auth import get_current_active_user
+from app.api.dependencies.rate_limit import rate_limit_by_user
 from app.models.user import User
 from app.services.usebeq_api_service import USEBEQAPIService
+from app.services.idempotency import idempotency_store
 from app.schemas.usebeq_api import (
     EstudianteUSEBEQ,
     SolicitudBajaRequest,
@@ -20,6 +23,11 @@ from app.schemas.usebeq_api import (
 
 router = APIRouter()
 
+# Student lookups spend the upstream USEBEQ quota
+estudiante_rate_limit = rate_limit_by_user(
+    "usebeq-estudiante", settings.RATE_LIMIT_USEBEQ_CAPACITY, settings.RATE_LIMIT_USEBEQ_PERIOD_SECONDS
+)
+
 
 def get_api_service(db: Session = Depends(get_db)) -> USEBEQAPIService:
     """
@@ -28,7 +36,11 @@ def get_api_service(db: Session = Depends(get_db)) -> USEBEQAPIService:
     return USEBEQAPIService(db)
 
 
-@router.get("/estudiante/{curp}/{cct}", response_model=EstudianteUSEBEQ)
+@router.get(
+    "/estudiante/{curp}/{cct}",
+    response_model=EstudianteUSEBEQ,
+    dependencies=[Depends(estudiante_rate_limit)]
+)
 async def get_estudiante_by_curp_cct(
     curp: str,
     cct: str,
@@ -52,7 +64,11 @@ async def get_estudiante_by_curp_cct(
         )
 
 
-@router.get("/estudiante/{id_alumno}", response_model=EstudianteUSEBEQ)
+@router.get(
+    "/estudiante/{id_alumno}",
+    response_model=EstudianteUSEBEQ,
+    dependencies=[Depends(estudiante_rate_limit)]
+)
 async def get_estudiante_by_id(
     id_alumno: int,
     current_user: User = Depends(get_current_active_user),
@@ -142,7 +158,8 @@ async def get_boleta_historica(
 async def solicitar_baja(
     solicitud: SolicitudBajaRequest,
     current_user: User = Depends(get_current_active_user),
-    api_service: USEBEQAPIService = Depends(get_api_service)
+    api_service: USEBEQAPIService = Depends(get_api_service),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
     """
     Request student withdrawal (baja)
@@ -163,13 +180,22 @@ async def solicitar_baja(
         "mensaje": "La solicitud de baja de 863309 se ha procesado correctamente"
     }
     ```
+
+    Send an Idempotency-Key header to make retries safe: a repeated key
+    returns the first response without calling the USEBEQ API again.
     """
     try:
-        response = await api_service.solicitar_baja(
-            solicitud.idAlumno,
-            solicitud.idMotivoBaja
+        return await idempotency_store.run_async(
+            f"usebeq.baja:{current_user.u_id}",
+            idempotency_key,
+            solicitud,
+            lambda: api_service.solicitar_baja(
+                solicitud.idAlumno,
+                solicitud.idMotivoBaja
+            )
         )
-        return response
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,23 +1,32 @@
 from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.etag import etag_matches, etag_response, make_etag, not_modified
 from app.api.dependencies.auth import get_current_active_user
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserUpdate
+from app.services.user_cache import user_cache
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserSchema)
 def get_current_user_profile(
+    request: Request,
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Get current user profile
+
+    current_user comes from the user cache, so the ETag is computed from its
+    fields and a 304 needs neither a query nor serialization.
     """
-    return current_user
+    etag = make_etag(*(getattr(current_user, field) for field in UserSchema.model_fields))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return etag_response(UserSchema.model_validate(current_user), etag)
 
 
 @router.put("/me", response_model=UserSchema)
@@ -30,15 +39,18 @@ def update_current_user_profile(
     """
     Update current user profile
     """
+    # current_user is a cached read-only instance; modify a fresh one
+    user = db.get(User, current_user.u_id)
     update_data = user_in.model_dump(exclude_unset=True)
 
     for field, value in update_data.items():
-        setattr(current_user, field, value)
+        setattr(user, field, value)
 
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
+    user_cache.invalidate(user.u_id)
 
-    return current_user
+    return user
 
 
 @router.put("/update-address")
@@ -51,13 +63,16 @@ def update_user_address(
     """
     Update current user address
     """
-    current_user.domicilio = domicilio.upper()
+    # current_user is a cached read-only instance; modify a fresh one
+    user = db.get(User, current_user.u_id)
+    user.domicilio = domicilio.upper()
 
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
+    user_cache.invalidate(user.u_id)
 
     return {
         "success": True,
         "message": "Domicilio actualizado correctamente",
-        "domicilio": current_user.domicilio
+        "domicilio": user.domicilio
     }
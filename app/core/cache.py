@@ -0,0 +1,273 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import orjson
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MISS = object()
+
+ERROR_LOG_SECONDS = 30.0
+SUBSCRIBE_RETRY_SECONDS = 5.0
+
+
+class LocalCacheBackend:
+    """
+    In-process LRU with per-entry TTL (one gunicorn worker)
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheBackend:
+    """
+    Cache shared by every worker on a Redis-protocol server (pip install redis)
+
+    Accepts an existing client, e.g. fakeredis.FakeRedis() in tests. Redis
+    errors are logged and treated as a miss (get) or ignored (set, delete),
+    so an outage falls back to the database instead of failing requests;
+    entries a failed delete left behind expire by TTL.
+    """
+
+    def __init__(self, url: str = "", client: Any = None):
+        try:
+            import redis
+            self.errors: Tuple[type, ...] = (redis.RedisError, OSError)
+        except ImportError:
+            if client is None:
+                raise RuntimeError("CACHE_BACKEND=redis requires the redis package")
+            self.errors = (OSError,)
+        self.client = client if client is not None else redis.Redis.from_url(url)
+        self._error_logged_at = 0.0
+
+    def log_error(self, operation: str, error: Exception) -> None:
+        # At most once per ERROR_LOG_SECONDS during an outage
+        now = time.monotonic()
+        if now - self._error_logged_at >= ERROR_LOG_SECONDS:
+            self._error_logged_at = now
+            logger.warning("Cache Redis no disponible (%s): %s", operation, error)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(key)
+        except self.errors as e:
+            self.log_error("get", e)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            self.client.set(key, value, px=max(1, int(ttl * 1000)))
+        except self.errors as e:
+            self.log_error("set", e)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if keys:
+            try:
+                self.client.delete(*keys)
+            except self.errors as e:
+                self.log_error("delete", e)
+
+    def publish(self, channel: str, message: str) -> None:
+        try:
+            self.client.publish(channel, message)
+        except self.errors as e:
+            self.log_error("publish", e)
+
+
+class TwoLevelCacheBackend:
+    """
+    Local L1 with a short TTL in front of a shared Redis L2
+
+    Writes and deletes go to L2 and are published on a pub/sub channel so the
+    other workers drop the key from their L1; l1_ttl bounds staleness if a
+    message is lost. The subscription is made by a listener thread that
+    retries while Redis is down (the app starts without it) and clears L1
+    after each reconnect, since invalidations may have been missed.
+    """
+
+    def __init__(self, l1: LocalCacheBackend, l2: RedisCacheBackend, l1_ttl: float, channel: str):
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self.metrics = {"l1_hits": 0, "l2_hits": 0, "invalidations_received": 0}
+
+        self._stopped = threading.Event()
+        self._listener = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+        self._listener.start()
+
+    def _listen(self) -> None:
+        while not self._stopped.is_set():
+            pubsub = None
+            try:
+                pubsub = self.l2.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self._on_invalidation})
+                self.l1.clear()
+                while not self._stopped.is_set():
+                    # Calls _on_invalidation for each message
+                    pubsub.get_message(timeout=0.5)
+            except self.l2.errors as e:
+                self.l2.log_error("subscribe", e)
+                self._stopped.wait(SUBSCRIBE_RETRY_SECONDS)
+            finally:
+                if pubsub is not None:
+                    pubsub.close()
+
+    def _on_invalidation(self, message: dict) -> None:
+        origin, _, keys = message["data"].decode().partition("|")
+        if origin != self.origin:
+            self.metrics["invalidations_received"] += 1
+            self.l1.delete(keys.split("\n"))
+
+    def _publish(self, keys: list) -> None:
+        self.l2.publish(self.channel, f"{self.origin}|" + "\n".join(keys))
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.l1.get(key)
+        if value is not None:
+            self.metrics["l1_hits"] += 1
+            return value
+        value = self.l2.get(key)
+        if value is not None:
+            self.metrics["l2_hits"] += 1
+            self.l1.set(key, value, self.l1_ttl)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.l2.set(key, value, ttl)
+        self.l1.set(key, value, min(ttl, self.l1_ttl))
+        self._publish([key])
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if keys:
+            self.l2.delete(keys)
+            self.l1.delete(keys)
+            self._publish(keys)
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._listener.join(timeout=2)
+
+
+class Cache:
+    """
+    Namespaced view of the cache backend with orjson serialization and hit metrics
+
+    Values must be orjson-serializable (dict, list, str, numbers, date...);
+    they come back as their JSON types.
+    """
+
+    def __init__(self, namespace: str, ttl: float, backend: Any):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: Any) -> str:
+        return f"{settings.CACHE_KEY_PREFIX}:{self.namespace}:{key}"
+
+    def get(self, key: Any) -> Any:
+        raw = self.backend.get(self._key(key))
+        if raw is None:
+            self.misses += 1
+            return MISS
+        self.hits += 1
+        return orjson.loads(raw)
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        self.backend.set(self._key(key), orjson.dumps(value), ttl or self.ttl)
+
+    def get_or_set(self, key: Any, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        value = self.get(key)
+        if value is MISS:
+            value = loader()
+            if value is not None:
+                self.set(key, value, ttl)
+        return value
+
+    def delete(self, *keys: Any) -> None:
+        self.backend.delete(self._key(key) for key in keys)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None
+        }
+
+
+def create_cache_backend():
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_REDIS_URL)
+    if settings.CACHE_BACKEND == "two-level":
+        return TwoLevelCacheBackend(
+            LocalCacheBackend(settings.CACHE_LOCAL_MAX_ENTRIES),
+            RedisCacheBackend(settings.CACHE_REDIS_URL),
+            settings.CACHE_L1_TTL_SECONDS,
+            f"{settings.CACHE_KEY_PREFIX}:invalidate"
+        )
+    return LocalCacheBackend(settings.CACHE_LOCAL_MAX_ENTRIES)
+
+
+cache_backend = create_cache_backend()
+_caches: Dict[str, Cache] = {}
+
+
+def get_cache(namespace: str, ttl: float) -> Cache:
+    """
+    Cache for a namespace on the configured backend (one instance per namespace)
+    """
+    if namespace not in _caches:
+        _caches[namespace] = Cache(namespace, ttl, cache_backend)
+    return _caches[namespace]
+
+
+def cache_stats() -> dict:
+    stats = {
+        "backend": settings.CACHE_BACKEND,
+        "namespaces": {name: cache.stats() for name, cache in _caches.items()}
+    }
+    if isinstance(cache_backend, TwoLevelCacheBackend):
+        stats["levels"] = dict(cache_backend.metrics)
+    return stats
@@ -0,0 +1,202 @@
+import os
+import time
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional (pip install brotli); gzip is always available
+    brotli = None
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Content types that are already compressed or must reach the client unmodified
+SKIP_CONTENT_TYPES = (
+    "application/pdf", "application/zip", "application/gzip", "application/octet-stream",
+    "image/", "audio/", "video/", "text/event-stream",
+)
+
+# Levels for low / medium / high CPU load
+GZIP_LEVELS = (6, 4, 1)
+BROTLI_LEVELS = (5, 3, 1)
+
+LOAD_CHECK_SECONDS = 1.0
+
+
+class LoadMonitor:
+    """
+    1-minute load average per CPU, re-read at most once per LOAD_CHECK_SECONDS
+    """
+
+    def __init__(self, low: float, high: float):
+        self.low = low
+        self.high = high
+        self.cpus = os.cpu_count() or 1
+        self._band = 0
+        self._checked_at = 0.0
+
+    def band(self) -> int:
+        """
+        0 (low), 1 (medium) or 2 (high load)
+        """
+        now = time.monotonic()
+        if now - self._checked_at >= LOAD_CHECK_SECONDS:
+            self._checked_at = now
+            try:
+                load = os.getloadavg()[0] / self.cpus
+            except OSError:  # Not available on this platform
+                load = 0.0
+            self._band = 0 if load < self.low else 1 if load < self.high else 2
+        return self._band
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        """
+        Compress and flush, so the client gets every streamed chunk right away
+        """
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    br if the client accepts it and brotli is installed, else gzip, else None
+    """
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """
+    gzip / brotli response compression
+
+    Bodies sent in one message are compressed only above minimum_size.
+    Streaming bodies (exports) are compressed chunk by chunk and flushed
+    after each one, never buffered. PDFs, SSE and other already compressed
+    types pass through. The level drops as the load average rises.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, monitor: Optional[LoadMonitor] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.monitor = monitor or LoadMonitor(settings.COMPRESSION_LOAD_LOW, settings.COMPRESSION_LOAD_HIGH)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await CompressionResponder(self, encoding, send).run(scope, receive)
+
+    def encoder(self, encoding: str):
+        band = self.monitor.band()
+        if encoding == "br":
+            return BrotliEncoder(BROTLI_LEVELS[band])
+        return GzipEncoder(GZIP_LEVELS[band])
+
+
+class CompressionResponder:
+    """
+    Per-request state: holds http.response.start until the first body chunk
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if "content-encoding" in headers or content_type.startswith(SKIP_CONTENT_TYPES):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.encoder = self.middleware.encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoder.name
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.encoder.finish(body)
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(self.start)
+
+        if more_body:
+            data = self.encoder.chunk(body) if body else b""
+            if data:
+                await self.send({"type": "http.response.body", "body": data, "more_body": True})
+        else:
+            await self.send({"type": "http.response.body", "body": self.encoder.finish(body)})
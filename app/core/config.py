@@ -12,10 +12,112 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    REFRESH_TOKEN_PRUNE_SECONDS: int = 3600
+    REFRESH_TOKEN_PRUNE_BATCH_SIZE: int = 1000
 
     # Database
     DATABASE_URL: str
 
+    # Accounts allowed to use administrative endpoints (school/regional offices)
+    ADMIN_EMAILS: List[str] = []
+
+    @validator("ADMIN_EMAILS", pre=True)
+    def assemble_admin_emails(cls, v: str | List[str]) -> List[str] | str:
+        if isinstance(v, str) and not v.startswith("["):
+            return [i.strip().lower() for i in v.split(",") if i.strip()]
+        elif isinstance(v, (list, str)):
+            return v
+        raise ValueError(v)
+
+    # Cache tier: local (per worker) | redis | two-level (local L1 + redis L2)
+    CACHE_BACKEND: str = "local"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/1"
+    CACHE_KEY_PREFIX: str = "portal"
+    CACHE_LOCAL_MAX_ENTRIES: int = 50000
+    CACHE_L1_TTL_SECONDS: float = 5.0
+
+    # Tagged cache of raw text() query results (opt-in per query)
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_TTL_SECONDS: int = 900
+    QUERY_CACHE_MAX_ROWS: int = 500
+    QUERY_CACHE_SCE039_TTL_SECONDS: int = 300
+
+    # Cache of parent -> student authorization sets
+    STUDENT_ACCESS_CACHE_TTL_SECONDS: int = 300
+    USER_CACHE_TTL_SECONDS: int = 60
+
+    # Parent dashboard aggregation
+    DASHBOARD_MAX_CONCURRENCY: int = 4
+    DASHBOARD_SECTION_TIMEOUT_SECONDS: float = 10.0
+    DASHBOARD_CERTIFICATES_LIMIT: int = 20
+
+    # Certificate requests
+    CERTIFICATE_DEFAULT_REGION: str = "4"
+    FOLIO_BLOCK_SIZE: int = 1  # Folios reserved per worker at a time; 1 keeps them sequential
+    CERTIFICATE_IMPORT_CHUNK_SIZE: int = 500
+    CERTIFICATE_EXPORT_BATCH_SIZE: int = 1000
+
+    # tramites1 archive (tramites1_archivo): folio years kept in the hot table
+    TRAMITES_HOT_YEARS: int = 2
+    TRAMITES_ARCHIVE_BATCH_SIZE: int = 1000
+
+    # Certificate statistics summary (pp_tramites_resumen)
+    STATS_RECONCILE_SECONDS: int = 300
+    STATS_RECONCILE_LOOKBACK_HOURS: int = 24
+
+    # Bloom filter over SCE039_DUPLI for duplicate certificate checks
+    DUPLI_BLOOM_ENABLED: bool = True
+    DUPLI_BLOOM_CAPACITY: int = 1_000_000
+    DUPLI_BLOOM_ERROR_RATE: float = 0.01
+    DUPLI_BLOOM_MAX_MEMORY_MB: int = 32
+    DUPLI_BLOOM_REFRESH_SECONDS: int = 60
+    DUPLI_BLOOM_MAX_STALENESS_SECONDS: int = 120  # Negatives skip the DB while the last refresh is this recent
+    DUPLI_BLOOM_SNAPSHOT_PATH: str = ""
+
+    # Idempotency-Key support (certificate requests, bajas)
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    IDEMPOTENCY_WAIT_SECONDS: float = 15.0
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS: int = 120
+
+    # Certificate receipt (acuse) PDFs
+    PUBLIC_API_URL: str = "http://localhost:8000"
+    ACUSE_PDF_WORKERS: int = 2
+    ACUSE_PDF_MAX_PENDING: int = 16
+    ACUSE_PDF_CACHE_SIZE: int = 500
+    ACUSE_FONT_PATH: str = ""
+    ACUSE_FONT_BOLD_PATH: str = ""
+
+    # Certificate status stream (SSE)
+    STATUS_STREAM_POLL_SECONDS: float = 5.0
+    STATUS_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    STATUS_STREAM_MAX_SECONDS: int = 900
+    STATUS_STREAM_MAX_SUBSCRIBERS: int = 2000
+
+    # Password hashing (bcrypt in a dedicated process pool)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 2
+
+    # Rate limiting (token buckets per IP / per user)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # memory | redis
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    RATE_LIMIT_TRUSTED_HOPS: int = 1  # Proxies of ours that append to X-Forwarded-For
+    RATE_LIMIT_LOGIN_CAPACITY: int = 10
+    RATE_LIMIT_LOGIN_PERIOD_SECONDS: int = 60
+    RATE_LIMIT_USEBEQ_CAPACITY: int = 30
+    RATE_LIMIT_USEBEQ_PERIOD_SECONDS: int = 60
+
+    # Response compression (gzip, brotli if installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LOAD_LOW: float = 0.5  # 1-minute load average per CPU
+    COMPRESSION_LOAD_HIGH: float = 1.0
+
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000"]
 
@@ -34,6 +136,21 @@ class Settings(BaseSettings):
     MAIL_PORT: int = 587
     MAIL_SERVER: str
     MAIL_FROM_NAME: str = "Portal USEBEQ"
+    MAIL_STARTTLS: bool = True
+    MAIL_SSL_TLS: bool = False
+    MAIL_TIMEOUT_SECONDS: float = 30.0
+
+    # Email outbox worker (pp_correo_salida)
+    MAIL_OUTBOX_ENABLED: bool = True
+    MAIL_BATCH_SIZE: int = 50
+    MAIL_POLL_SECONDS: float = 10.0
+    MAIL_RATE_PER_MINUTE: int = 60
+    MAIL_MAX_ATTEMPTS: int = 6
+    MAIL_RETRY_BASE_SECONDS: int = 30
+    MAIL_RETRY_MAX_SECONDS: int = 3600
+    MAIL_LEASE_SECONDS: int = 300
+    MAIL_SMTP_IDLE_SECONDS: float = 60.0
+    ACTIVATION_URL_TEMPLATE: str = "http://localhost:3000/activar/{token}"
 
     # External USEBEQ API
     USEBEQ_API_BASE_URL: str = "https://sce-usebeq-api-test-v2.azurewebsites.net/api/portal-padres"
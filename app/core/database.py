@@ -1,4 +1,7 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -27,3 +30,19 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def advisory_lock(name: str, timeout: int = 0) -> Iterator[bool]:
+    """
+    Hold a MySQL GET_LOCK on a dedicated connection (a session may switch
+    connections at each commit); yields False if another process has it
+    after timeout seconds
+    """
+    with engine.connect() as conn:
+        acquired = conn.execute(text("SELECT GET_LOCK(:name, :timeout)"), {"name": name, "timeout": timeout}).scalar()
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
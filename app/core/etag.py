@@ -0,0 +1,60 @@
+import hashlib
+from typing import Any
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.core.responses import ORJSONResponse, orjson_default
+
+# Per-user data: browsers may keep it but must revalidate every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Weak ETag from version values (ids, updated_at, counters...)
+    """
+    data = orjson.dumps(parts, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+    return f'W/"{hashlib.blake2b(data, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Weak comparison against If-None-Match (RFC 9110 13.1.2)
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def etag_response(content: Any, etag: str) -> ORJSONResponse:
+    """
+    Like fast_json, with the ETag already computed from a version source
+    """
+    return ORJSONResponse(content, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def body_etag_response(request: Request, content: Any) -> Response:
+    """
+    ETag from a hash of the serialized body, for data with no version column
+
+    The body is still built and serialized, but a match sends only the 304.
+    """
+    body = orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(
+        body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+
+class PoolSaturatedError(Exception):
+    """
+    Raised when a bounded process pool already has max_pending jobs
+    """
+
+
+class BoundedProcessPool:
+    """
+    ProcessPoolExecutor with a cap on queued + running jobs, for CPU-heavy work
+
+    Jobs are awaited from the event loop without blocking it. When max_pending
+    jobs are already in flight, submit raises PoolSaturatedError right away
+    instead of queueing without limit. The executor is created on first use.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int,
+                 initializer: Optional[Callable] = None, initargs: Tuple = ()):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=self.initializer,
+                initargs=self.initargs
+            )
+        return self._executor
+
+    async def submit(self, fn: Callable, *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PoolSaturatedError()
+            self._pending += 1
+            executor = self._get_executor()
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
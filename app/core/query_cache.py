@@ -0,0 +1,117 @@
+import hashlib
+import logging
+import re
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional, Tuple
+
+import orjson
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from app.core.cache import MISS, get_cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Column types stored as {"$t": type, "v": text} so a hit returns the same
+# Python types as the driver; other non-JSON types are not cached
+_TAGGED_TYPES = {
+    "datetime": (datetime, datetime.isoformat, datetime.fromisoformat),
+    "date": (date, date.isoformat, date.fromisoformat),
+    "decimal": (Decimal, str, Decimal),
+}
+_JSON_TYPES = (str, int, float, bool, type(None))
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, _JSON_TYPES):
+        return value
+    # datetime before date: it is a subclass
+    for name, (cls, encode, _) in _TAGGED_TYPES.items():
+        if isinstance(value, cls):
+            return {"$t": name, "v": encode(value)}
+    raise TypeError(f"Tipo de columna no soportado por la cache: {type(value).__name__}")
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _TAGGED_TYPES[value["$t"]][2](value["v"])
+    return value
+
+
+class QueryCache:
+    """
+    Result cache for raw text() queries, tagged by the tables they read
+
+    Only queries run through fetch_all/fetch_one are cached (opt-in). The key
+    is the normalized SQL, the parameters and the current version of each
+    tagged table; invalidate_tables() gives a table a new version, so every
+    entry that read it is skipped from then on (and expires by TTL). Tables
+    written by other systems rely on the TTL alone; that is the case for
+    every table cached today (SCE002, SCE006, SCE023, SCE034, SCE035, SCE039),
+    so call invalidate_tables() only if this API starts writing one of them. Hits return the same
+    types as the driver (str, numbers, None, date, datetime, Decimal);
+    results with more than max_rows rows or other column types are not
+    cached.
+    """
+
+    def __init__(self, ttl_seconds: float, max_rows: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self.results = get_cache("query", ttl_seconds)
+        self.versions = get_cache("query-tags", 7 * 24 * 3600)
+
+    def _version(self, table: str) -> str:
+        version = self.versions.get(table)
+        if version is MISS:
+            version = uuid.uuid4().hex
+            self.versions.set(table, version)
+        return version
+
+    def _key(self, statement: TextClause, params: dict, tables: Iterable[str]) -> str:
+        sql = _WHITESPACE.sub(" ", str(statement)).strip()
+        tags = ",".join(f"{table}@{self._version(table)}" for table in sorted(tables))
+        raw = orjson.dumps([sql, params, tags], option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.sha256(raw).hexdigest()
+
+    def fetch_all(self, db: Session, statement: TextClause, params: dict, tables: Iterable[str],
+                  ttl: Optional[float] = None) -> List[Tuple]:
+        """
+        Rows of a text() query as tuples, from cache when possible
+        """
+        if not settings.QUERY_CACHE_ENABLED:
+            return [tuple(row) for row in db.execute(statement, params).fetchall()]
+
+        key = self._key(statement, params, tables)
+        rows = self.results.get(key)
+        if rows is not MISS:
+            return [tuple(_decode_value(value) for value in row) for row in rows]
+
+        rows = [tuple(row) for row in db.execute(statement, params).fetchall()]
+        if len(rows) <= self.max_rows:
+            try:
+                encoded = [[_encode_value(value) for value in row] for row in rows]
+            except TypeError as exc:
+                logger.debug("Resultado no cacheado: %s", exc)
+            else:
+                self.results.set(key, encoded, ttl)
+        return rows
+
+    def fetch_one(self, db: Session, statement: TextClause, params: dict, tables: Iterable[str],
+                  ttl: Optional[float] = None) -> Optional[Tuple]:
+        rows = self.fetch_all(db, statement, params, tables, ttl)
+        return rows[0] if rows else None
+
+    def invalidate_tables(self, *tables: str) -> None:
+        """
+        Call after committing writes to these tables
+        """
+        for table in tables:
+            self.versions.set(table, uuid.uuid4().hex)
+
+
+query_cache = QueryCache(settings.QUERY_CACHE_TTL_SECONDS, settings.QUERY_CACHE_MAX_ROWS)
@@ -0,0 +1,122 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Tuple
+
+from app.core.config import settings
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int  # Until the bucket is full again
+    retry_after: int  # Until the next request is allowed (0 if allowed)
+
+
+def _result(allowed: bool, tokens: float, capacity: int, refill_per_second: float, cost: int) -> RateLimitResult:
+    return RateLimitResult(
+        allowed=allowed,
+        limit=capacity,
+        remaining=max(0, int(tokens)),
+        reset_seconds=math.ceil((capacity - tokens) / refill_per_second),
+        retry_after=0 if allowed else math.ceil((cost - tokens) / refill_per_second)
+    )
+
+
+class MemoryRateLimitBackend:
+    """
+    Token buckets kept in process memory (one gunicorn worker)
+
+    Each active key holds three floats. Keys are kept in LRU order: a bucket
+    that is full again is the same as no bucket, so such keys are dropped
+    from the old end, and RATE_LIMIT_MAX_KEYS caps the total.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> (tokens, updated_at, full_at)
+        self._buckets: "OrderedDict[str, Tuple[float, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: int, refill_per_second: float, cost: int = 1) -> RateLimitResult:
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated_at, _ = self._buckets.pop(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / refill_per_second)
+            self._evict(now)
+
+        return _result(allowed, tokens, capacity, refill_per_second, cost)
+
+    def _evict(self, now: float) -> None:
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        while self._buckets:
+            oldest_key = next(iter(self._buckets))
+            if self._buckets[oldest_key][2] > now:
+                break
+            del self._buckets[oldest_key]
+
+
+# KEYS[1] bucket; ARGV capacity, refill per second, now (s), cost
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Token buckets shared by every worker through Redis (pip install redis)
+
+    The refill and consume run atomically in a Lua script; keys expire once
+    their bucket would be full again.
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the redis package")
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def consume(self, key: str, capacity: int, refill_per_second: float, cost: int = 1) -> RateLimitResult:
+        allowed, tokens = self._script(
+            keys=[f"ratelimit:{key}"],
+            args=[capacity, refill_per_second, time.time(), cost]
+        )
+        return _result(bool(allowed), float(tokens), capacity, refill_per_second, cost)
+
+
+def create_rate_limit_backend():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+    return MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limit_backend = create_rate_limit_backend()
@@ -0,0 +1,46 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def orjson_default(obj: Any) -> Any:
+    """
+    Types orjson does not serialize natively (enums, date and datetime it does)
+    """
+    if isinstance(obj, Decimal):
+        # As a string, like pydantic's JSON output for Decimal fields
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def to_jsonable(content: Any) -> Any:
+    """
+    JSON-ready copy of content, serialized exactly as ORJSONResponse would
+    """
+    return orjson.loads(orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS))
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    Default response class: orjson instead of json.dumps
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def fast_json(content: Any, status_code: int = 200) -> ORJSONResponse:
+    """
+    Return output the handler built itself, skipping response_model re-validation
+
+    Only for content that already matches the declared response_model; the
+    model is still used for the OpenAPI schema.
+    """
+    return ORJSONResponse(content, status_code=status_code)
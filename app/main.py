@@ -1,15 +1,26 @@
+import asyncio
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.cache import cache_stats
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.responses import ORJSONResponse
 from app.api.endpoints import api_router
+from app.core.security import password_pool
+from app.services.duplicate_filter import duplicate_filter
+from app.services.acuse_pdf import acuse_pool
+from app.services.status_watcher import status_watcher
+from app.services.certificate_stats import stats_reconciler
+from app.services.email_outbox import email_outbox_worker
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # Set up CORS
@@ -21,9 +32,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+background_tasks = []
+
+
+@app.on_event("startup")
+async def start_background_tasks():
+    """
+    Start background workers
+    """
+    if settings.DUPLI_BLOOM_ENABLED:
+        background_tasks.append(asyncio.create_task(duplicate_filter.run()))
+    background_tasks.append(asyncio.create_task(status_watcher.run()))
+    background_tasks.append(asyncio.create_task(stats_reconciler.run()))
+    if settings.MAIL_OUTBOX_ENABLED:
+        email_outbox_worker.check_settings()
+        background_tasks.append(asyncio.create_task(email_outbox_worker.run()))
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    """
+    Stop background workers
+    """
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    acuse_pool.shutdown()
+    password_pool.shutdown()
+
 
 @app.get("/")
 def root():
@@ -43,3 +86,11 @@ def health_check():
     Health check endpoint
     """
     return {"status": "healthy"}
+
+
+@app.get("/health/cache")
+def cache_health():
+    """
+    Cache tier hit ratios per namespace
+    """
+    return cache_stats()
@@ -1,7 +1,10 @@
 from app.models.user import User, UserStatus
-from app.models.student import Student, Enrollment, StudentParent, StudentStatus
-from app.models.certificate import Certificate, CertificateDuplicate, Tramite
+from app.models.student import Student, Enrollment, StudentParent, StudentStatus, ParentLink
+from app.models.certificate import Certificate, CertificateDuplicate, CertificateRequest, CertificateRequestArchive, CertificateStats, FolioCounter, Tramite
 from app.models.grade import Grade
+from app.models.idempotency import IdempotencyKey
+from app.models.email_outbox import EmailOutbox
+from app.models.refresh_token import RefreshToken
 
 __all__ = [
     "User",
@@ -10,8 +13,16 @@ __all__ = [
     "StudentStatus",
     "Enrollment",
     "StudentParent",
+    "ParentLink",
     "Certificate",
     "CertificateDuplicate",
+    "CertificateRequest",
+    "CertificateRequestArchive",
+    "CertificateStats",
+    "FolioCounter",
     "Tramite",
     "Grade",
+    "IdempotencyKey",
+    "EmailOutbox",
+    "RefreshToken",
 ]
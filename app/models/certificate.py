@@ -1,10 +1,19 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index, Text, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
 import enum
 
 
+# Map region number to roman numerals (used in folios)
+REGION_ROMAN = {
+    "1": "I",
+    "2": "II",
+    "3": "III",
+    "4": "IV"
+}
+
+
 class TramiteStatus(str, enum.Enum):
     SOLICITADO = "SOLICITADO"
     SOLICITADO_SIN_RESPONSABLE = "SOLICITADO SIN RESPONSABLE"
@@ -69,12 +78,10 @@ class CertificateDuplicate(Base):
     user = relationship("User", foreign_keys=[u_id])
 
 
-class CertificateRequest(Base):
+class CertificateRequestColumns:
     """
-    Model representing tramites1 table - Certificate requests
+    Columns shared by tramites1 and its archive table tramites1_archivo
     """
-    __tablename__ = "tramites1"
-
     id = Column(Integer, primary_key=True, index=True)
     folio = Column(String(50), unique=True, index=True, nullable=False)
     nombre_alumno = Column(String(100), nullable=False)
@@ -104,6 +111,61 @@ class CertificateRequest(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class CertificateRequest(CertificateRequestColumns, Base):
+    """
+    Model representing tramites1 table - Certificate requests (current cycles)
+    """
+    __tablename__ = "tramites1"
+    __table_args__ = (
+        # Eligibility check: requests of a CURP by tipo_tramite, status and date
+        Index("ix_tramites1_curp_tipo_status_fecha", "curp", "tipo_tramite", "status", "fecha_elaborado"),
+        # Keyset pagination of /list/{curp}: newest first by (created_at, id)
+        Index("ix_tramites1_curp_created_id", "curp", "created_at", "id"),
+        # Statistics reconcile: rows changed since the last run, and per-day regrouping
+        Index("ix_tramites1_updated_at", "updated_at"),
+        Index("ix_tramites1_created_at", "created_at"),
+    )
+
+
+class CertificateRequestArchive(CertificateRequestColumns, Base):
+    """
+    Signed requests of past years moved out of tramites1 (tramites1_archivo)
+    """
+    __tablename__ = "tramites1_archivo"
+    __table_args__ = (
+        Index("ix_tramites1_archivo_curp_tipo_status_fecha", "curp", "tipo_tramite", "status", "fecha_elaborado"),
+        Index("ix_tramites1_archivo_curp_created_id", "curp", "created_at", "id"),
+        Index("ix_tramites1_archivo_created_at", "created_at"),
+    )
+
+
+class FolioCounter(Base):
+    """
+    Last folio number handed out per year and region (pp_folio_contador)
+    """
+    __tablename__ = "pp_folio_contador"
+
+    anio = Column(Integer, primary_key=True)
+    region = Column(String(10), primary_key=True)
+    ultimo = Column(Integer, nullable=False, default=0)
+
+
+class CertificateStats(Base):
+    """
+    Daily counts of tramites1 by region, tipo_tramite, status and entregado
+
+    tipo_tramite, status and entregado hold the stored enum names, as in tramites1.
+    """
+    __tablename__ = "pp_tramites_resumen"
+
+    dia = Column(Date, primary_key=True)  # DATE(tramites1.created_at)
+    region = Column(String(10), primary_key=True)
+    tipo_tramite = Column(String(40), primary_key=True)
+    status = Column(String(40), primary_key=True)
+    entregado = Column(String(20), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+
+
 class Tramite(Base):
     """
     Administrative procedures model (bajas, revocaciones, etc.)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index, Text
+from datetime import datetime
+from app.core.database import Base
+
+
+class EmailOutbox(Base):
+    """
+    Outgoing e-mails waiting to be sent by the outbox worker (pp_correo_salida)
+    """
+    __tablename__ = "pp_correo_salida"
+    __table_args__ = (
+        # Worker claim: due messages by state
+        Index("ix_pp_correo_salida_estado_siguiente", "estado", "siguiente_intento"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    destinatario = Column(String(255), nullable=False)
+    asunto = Column(String(255), nullable=False)
+    cuerpo_texto = Column(Text, nullable=False)
+    cuerpo_html = Column(Text)
+    estado = Column(String(20), nullable=False, default="PENDIENTE")  # PENDIENTE, ENVIANDO, ENVIADO, FALLIDO
+    intentos = Column(Integer, nullable=False, default=0)
+    siguiente_intento = Column(DateTime, nullable=False, default=datetime.utcnow)
+    ultimo_error = Column(String(1000))
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, UniqueConstraint
+from datetime import datetime
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Stored responses for requests sent with an Idempotency-Key header
+    """
+    __tablename__ = "pp_idempotencia"
+    __table_args__ = (
+        UniqueConstraint("scope", "clave", name="uq_pp_idempotencia_scope_clave"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String(100), nullable=False)  # Endpoint (and user) the key belongs to
+    clave = Column(String(255), nullable=False)
+    fingerprint = Column(String(64), nullable=False)  # SHA-256 of the request payload
+    estado = Column(String(20), nullable=False)  # EN_PROCESO, COMPLETADO
+    status_code = Column(Integer)
+    response_body = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from app.core.database import Base
+
+
+class RefreshToken(Base):
+    """
+    Rotating refresh tokens (only the SHA-256 of each token is stored)
+    """
+    __tablename__ = "pp_refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    u_id = Column(Integer, ForeignKey("PP_usuarios.u_id"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    familia = Column(String(32), nullable=False, index=True)  # All tokens rotated from one login
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    used_at = Column(DateTime, nullable=True)  # Set when rotated; reuse revokes the family
+    revoked_at = Column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum
@@ -64,3 +64,21 @@ class StudentParent(Base):
     # Relationships
     student = relationship("Student", back_populates="parents")
     user = relationship("User", back_populates="students")
+
+
+class ParentLink(Base):
+    """
+    Normalized parent-student link index (pp_alumnos_padres)
+
+    One row per parent e-mail, student and parentesco, mirroring the
+    padre/madre/tutor columns of pp_alumnos so lookups by e-mail can use an index
+    """
+    __tablename__ = "pp_alumnos_padres"
+    __table_args__ = (
+        Index("ix_pp_alumnos_padres_correo_al_id", "correo", "al_id", "parentesco", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    correo = Column(String(255), nullable=False)  # Parent e-mail (PP_usuarios.u_correo)
+    al_id = Column(Integer, nullable=False, index=True)
+    parentesco = Column(String(10), nullable=False)  # PADRE, MADRE, TUTOR
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field, validator
 from typing import Optional
 from datetime import date, datetime
-from app.models.certificate import TipoTramite, TramiteStatus, TramiteEntregado
+from app.models.certificate import REGION_ROMAN, TipoTramite, TramiteStatus, TramiteEntregado
 
 
 # Request schemas
@@ -23,6 +23,7 @@ class CertificateRequestCreate(BaseModel):
     tipo_tramite: TipoTramite
     core: Optional[str] = Field(None, max_length=255)
     correccion: Optional[str] = Field("NO", max_length=5)  # SI/NO
+    region: Optional[str] = Field(None, max_length=10)  # 1-4, defaults to CERTIFICATE_DEFAULT_REGION
 
     @validator('curp')
     def curp_must_be_valid(cls, v):
@@ -38,6 +39,12 @@ class CertificateRequestCreate(BaseModel):
             raise ValueError('La CCT debe comenzar con 22 (Queretaro)')
         return v
 
+    @validator('region')
+    def region_must_be_valid(cls, v):
+        if v is not None and v not in REGION_ROMAN:
+            raise ValueError('Region debe ser 1, 2, 3 o 4')
+        return v
+
     @validator('correccion')
     def correccion_must_be_valid(cls, v):
         if v not in ['SI', 'NO']:
@@ -90,6 +97,40 @@ class CertificateListResponse(BaseModel):
     curp: str
     certificates: list[CertificateStatusResponse]
     total: int
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
+
+
+class CertificateVerifyResponse(BaseModel):
+    """
+    Response schema for verifying the signed QR of a receipt
+    """
+    valid: bool
+    folio: str
+    status: TramiteStatus
+    issued: date
+    curp_match: Optional[bool] = None
+    current_status: Optional[TramiteStatus] = None
+    current_entregado: Optional[TramiteEntregado] = None
+
+
+class CertificateStatsRow(BaseModel):
+    """
+    Requests of one day for a region, tipo_tramite, status and entregado
+    """
+    dia: date
+    region: str
+    tipo_tramite: str
+    status: str
+    entregado: str
+    total: int
+
+
+class CertificateStatsResponse(BaseModel):
+    """
+    Response schema for certificate request statistics
+    """
+    rows: list[CertificateStatsRow]
+    total: int
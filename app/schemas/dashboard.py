@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from app.schemas.user import User
+
+
+class DashboardStudent(BaseModel):
+    """
+    One linked student with the data of every per-student section
+    """
+    student: Dict[str, Any]
+    grades: Optional[List[Dict[str, Any]]] = None
+    teachers: Optional[Dict[str, Any]] = None
+    certificates: Optional[Dict[str, Any]] = None
+
+
+class DashboardResponse(BaseModel):
+    """
+    Response schema for the parent dashboard
+
+    Sections that failed are missing (None) and listed in errors;
+    timings_ms has the duration of each section plus the total.
+    """
+    user: Optional[User] = None
+    students: List[DashboardStudent] = []
+    errors: Dict[str, str] = {}
+    timings_ms: Dict[str, float] = {}
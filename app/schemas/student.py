@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 from app.models.student import StudentStatus
 
@@ -84,3 +84,29 @@ class AddStudentResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class AddStudentsBatchRequest(BaseModel):
+    """
+    Schema for adding several students to parent account in one call
+    """
+    students: List[AddStudentRequest] = Field(..., min_length=1, max_length=10)
+
+
+class AddStudentBatchResult(AddStudentResponse):
+    """
+    Result of one item of a batch add-student request
+    """
+    index: int
+    curp: str
+    status_code: int = 200
+
+
+class AddStudentsBatchResponse(BaseModel):
+    """
+    Response schema for batch add-student, one result per item
+    """
+    success: bool
+    added: int
+    total: int
+    results: List[AddStudentBatchResult]
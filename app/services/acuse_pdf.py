@@ -0,0 +1,162 @@
+import io
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import qrcode
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from app.core.config import settings
+from app.core.process_pool import BoundedProcessPool
+
+FONT = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+
+
+def init_worker(font_path: str = "", bold_font_path: str = "") -> None:
+    """
+    Process pool initializer: register custom fonts once per worker process
+    """
+    global FONT, FONT_BOLD
+    if font_path:
+        pdfmetrics.registerFont(TTFont("AcuseFont", font_path))
+        FONT = "AcuseFont"
+    if bold_font_path:
+        pdfmetrics.registerFont(TTFont("AcuseFont-Bold", bold_font_path))
+        FONT_BOLD = "AcuseFont-Bold"
+
+
+@lru_cache(maxsize=1)
+def _template() -> dict:
+    """
+    Static layout of the receipt, computed once per worker process
+    """
+    width, height = letter
+    margin = 20 * mm
+    return {
+        "page_size": letter,
+        "width": width,
+        "height": height,
+        "margin": margin,
+        "title": "UNIDAD DE SERVICIOS PARA LA EDUCACION BASICA EN EL ESTADO DE QUERETARO",
+        "subtitle": "ACUSE DE SOLICITUD DE CERTIFICADO",
+        "labels": [
+            ("folio", "Folio"),
+            ("nombre_completo", "Alumno"),
+            ("curp", "CURP"),
+            ("tipo_tramite", "Tramite"),
+            ("cct", "CCT"),
+            ("nombre_esc", "Escuela"),
+            ("ciclo_terminacion", "Ciclo de terminacion"),
+            ("fecha", "Fecha de solicitud"),
+            ("status", "Estatus"),
+            ("entregado", "Entrega"),
+        ],
+        "footer": [
+            "Conserve este acuse. Escanee el codigo QR para consultar el estatus de su tramite.",
+            "Este documento no es un certificado de estudios.",
+        ],
+        "qr_size": 45 * mm,
+    }
+
+
+def _draw_qr(pdf: canvas.Canvas, data: str, x: float, y: float, size: float) -> None:
+    """
+    Draw a QR code as vector squares (no raster image needed)
+    """
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=2)
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+
+    cell = size / len(matrix)
+    pdf.setFillColorRGB(0, 0, 0)
+    for row_index, row in enumerate(matrix):
+        for col_index, filled in enumerate(row):
+            if filled:
+                pdf.rect(x + col_index * cell, y + size - (row_index + 1) * cell, cell, cell, stroke=0, fill=1)
+
+
+def render_acuse_pdf(data: dict) -> bytes:
+    """
+    Render the receipt PDF for a certificate request (runs in a worker process)
+    """
+    template = _template()
+    width, height, margin = template["width"], template["height"], template["margin"]
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=template["page_size"], pageCompression=1)
+    pdf.setTitle(f"Acuse {data['folio']}")
+
+    y = height - margin
+    pdf.setFont(FONT_BOLD, 10)
+    pdf.drawCentredString(width / 2, y, template["title"])
+    y -= 8 * mm
+    pdf.setFont(FONT_BOLD, 14)
+    pdf.drawCentredString(width / 2, y, template["subtitle"])
+    y -= 15 * mm
+
+    qr_size = template["qr_size"]
+    _draw_qr(pdf, data["qr_data"], width - margin - qr_size, y - qr_size + 5 * mm, qr_size)
+
+    for key, label in template["labels"]:
+        pdf.setFont(FONT_BOLD, 10)
+        pdf.drawString(margin, y, f"{label}:")
+        pdf.setFont(FONT, 10)
+        pdf.drawString(margin + 42 * mm, y, str(data.get(key) or ""))
+        y -= 7 * mm
+
+    if data.get("requires_payment"):
+        y -= 5 * mm
+        pdf.setFont(FONT_BOLD, 10)
+        pdf.drawString(margin, y, "Tramite sujeto a pago. Realice su pago en el portal de servicios REGER.")
+
+    pdf.setFont(FONT, 8)
+    footer_y = margin
+    for line in reversed(template["footer"]):
+        pdf.drawCentredString(width / 2, footer_y, line)
+        footer_y += 5 * mm
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+class AcuseCache:
+    """
+    LRU cache of rendered receipts keyed by folio and status
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        with self._lock:
+            pdf = self._entries.get(key)
+            if pdf is not None:
+                self._entries.move_to_end(key)
+            return pdf
+
+    def set(self, key: Tuple, pdf: bytes) -> None:
+        with self._lock:
+            self._entries[key] = pdf
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+acuse_pool = BoundedProcessPool(
+    max_workers=settings.ACUSE_PDF_WORKERS,
+    max_pending=settings.ACUSE_PDF_MAX_PENDING,
+    initializer=init_worker,
+    initargs=(settings.ACUSE_FONT_PATH, settings.ACUSE_FONT_BOLD_PATH)
+)
+
+acuse_cache = AcuseCache(settings.ACUSE_PDF_CACHE_SIZE)
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, advisory_lock
+
+logger = logging.getLogger(__name__)
+
+UPSERT_STATS = text("""
+    INSERT INTO pp_tramites_resumen (dia, region, tipo_tramite, status, entregado, total)
+    VALUES (:dia, :region, :tipo_tramite, :status, :entregado, :total)
+    ON DUPLICATE KEY UPDATE total = total + VALUES(total)
+""")
+
+CHANGED_DAYS = text("""
+    SELECT DISTINCT DATE(created_at) AS dia
+    FROM tramites1
+    WHERE updated_at >= :since
+""")
+
+DELETE_DAYS = text("""
+    DELETE FROM pp_tramites_resumen WHERE dia IN :dias
+""").bindparams(bindparam("dias", expanding=True))
+
+REBUILD_DAY = text("""
+    INSERT INTO pp_tramites_resumen (dia, region, tipo_tramite, status, entregado, total)
+    SELECT DATE(created_at), COALESCE(region, ''), tipo_tramite,
+           COALESCE(status, ''), COALESCE(entregado, ''), COUNT(*)
+    FROM (
+        SELECT created_at, region, tipo_tramite, status, entregado
+        FROM tramites1
+        WHERE created_at >= :desde AND created_at < :hasta
+        UNION ALL
+        SELECT created_at, region, tipo_tramite, status, entregado
+        FROM tramites1_archivo
+        WHERE created_at >= :desde AND created_at < :hasta
+    ) AS t
+    GROUP BY DATE(created_at), COALESCE(region, ''), tipo_tramite,
+             COALESCE(status, ''), COALESCE(entregado, '')
+""")
+
+
+def _name(value) -> str:
+    # Enum columns are stored by member name
+    return value.name if value is not None else ""
+
+
+def record_created(db: Session, rows: Iterable[dict], day: Optional[date] = None) -> None:
+    """
+    Add new tramites1 rows to the summary, in the caller's transaction
+    """
+    day = day or datetime.utcnow().date()
+    counts = Counter(
+        (row.get("region") or "", _name(row["tipo_tramite"]), _name(row.get("status")), _name(row.get("entregado")))
+        for row in rows
+    )
+    if not counts:
+        return
+
+    db.execute(UPSERT_STATS, [
+        {
+            "dia": day,
+            "region": region,
+            "tipo_tramite": tipo_tramite,
+            "status": status,
+            "entregado": entregado,
+            "total": total
+        }
+        for (region, tipo_tramite, status, entregado), total in counts.items()
+    ])
+
+
+def rebuild_days(db: Session, days: List[date]) -> None:
+    """
+    Recompute the summary of the given days from tramites1 and its archive, one transaction per day
+    """
+    for day in sorted(days):
+        db.execute(DELETE_DAYS, {"dias": [day]})
+        db.execute(REBUILD_DAY, {
+            "desde": datetime.combine(day, datetime.min.time()),
+            "hasta": datetime.combine(day + timedelta(days=1), datetime.min.time())
+        })
+        db.commit()
+
+
+# MySQL advisory lock held while days are regrouped, so only one process
+# (API worker or rebuild script) rewrites the summary at a time
+REBUILD_LOCK = "pp_tramites_resumen"
+
+
+def rebuild_lock(timeout: int = 0):
+    return advisory_lock(REBUILD_LOCK, timeout)
+
+
+class CertificateStatsReconciler:
+    """
+    Periodically fixes the summary for days whose tramites1 rows changed
+
+    Status transitions are made outside this API (back office), so they are
+    only visible through tramites1.updated_at: every STATS_RECONCILE_SECONDS
+    the days with rows updated since the last run are regrouped from scratch.
+    Every API worker runs it, but only the one holding REBUILD_LOCK does the
+    work; the others keep their window and try again next time.
+    """
+
+    def __init__(self):
+        self.since = datetime.utcnow() - timedelta(hours=settings.STATS_RECONCILE_LOOKBACK_HOURS)
+
+    def reconcile(self, db: Session) -> int:
+        started = datetime.utcnow()
+        # Overlap with the previous run to catch rows committed late
+        since = self.since - timedelta(seconds=settings.STATS_RECONCILE_SECONDS)
+        days = [row.dia for row in db.execute(CHANGED_DAYS, {"since": since}) if row.dia]
+        db.rollback()
+
+        rebuild_days(db, days)
+        self.since = started
+        return len(days)
+
+    def _reconcile_once(self) -> int:
+        with rebuild_lock() as acquired:
+            if not acquired:
+                return 0
+            db = SessionLocal()
+            try:
+                return self.reconcile(db)
+            finally:
+                db.close()
+
+    async def run(self) -> None:
+        """
+        Background task: reconcile the summary every STATS_RECONCILE_SECONDS
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(settings.STATS_RECONCILE_SECONDS)
+            try:
+                days = await loop.run_in_executor(None, self._reconcile_once)
+                if days:
+                    logger.info("Resumen de tramites1 conciliado para %s dias", days)
+            except Exception:
+                logger.exception("No se pudo conciliar el resumen de tramites1")
+
+
+stats_reconciler = CertificateStatsReconciler()
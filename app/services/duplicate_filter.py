@@ -0,0 +1,250 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.bloom_filter import BloomFilter
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+# Bumped when duplicate_key changes, so older snapshots are rebuilt
+KEY_FORMAT = 2
+
+
+def normalize_duplicate_key(year_ini, cct: str, curp: str) -> Tuple[str, str, str]:
+    """
+    Like MySQL's case-insensitive, pad-space comparison of the stored values
+    """
+    return str(year_ini).strip(), (cct or "").strip().upper(), (curp or "").strip().upper()
+
+
+def duplicate_key(year_ini, cct: str, curp: str) -> str:
+    return "|".join(normalize_duplicate_key(year_ini, cct, curp))
+
+
+class DuplicateFilter:
+    """
+    In-memory Bloom filter over SCE039_DUPLI (ce_inicic, clavecct, al_curp)
+
+    New rows are loaded incrementally by id every DUPLI_BLOOM_REFRESH_SECONDS
+    (certificates are issued outside this API, so there is no insert path to
+    hook). A negative answer skips the DB while the last successful refresh
+    is at most DUPLI_BLOOM_MAX_STALENESS_SECONDS old: a certificate issued in
+    that window can be missed. Past that bound (e.g. refreshes failing) only
+    rows newer than the filter are checked (a PK range). A positive answer
+    must be confirmed against the DB. Until the filter is built (or if it is
+    disabled) every check goes to the DB.
+    """
+
+    def __init__(self):
+        self.bloom: Optional[BloomFilter] = None
+        self.last_id = 0
+        self.refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self.metrics = {
+            "checks": 0,
+            "db_queries_avoided": 0,
+            "stale_negatives": 0,
+            "confirmed_duplicates": 0,
+            "false_positives": 0,
+            "not_ready": 0,
+        }
+
+    @property
+    def ready(self) -> bool:
+        return self.bloom is not None
+
+    def might_contain(self, year_ini: str, cct: str, curp: str) -> Tuple[Optional[bool], Optional[int]]:
+        """
+        (False if not a duplicate, True if maybe, None if filter not ready)
+        and, for a False answer from a stale filter, the last SCE039_DUPLI id
+        loaded: rows after it must still be checked against the DB
+        """
+        with self._lock:
+            self.metrics["checks"] += 1
+            if self.bloom is None:
+                self.metrics["not_ready"] += 1
+                return None, None
+            if duplicate_key(year_ini, cct, curp) in self.bloom:
+                return True, None
+            if time.monotonic() - self.refreshed_at <= settings.DUPLI_BLOOM_MAX_STALENESS_SECONDS:
+                self.metrics["db_queries_avoided"] += 1
+                return False, None
+            self.metrics["stale_negatives"] += 1
+            return False, self.last_id
+
+    def record_confirmation(self, is_duplicate: bool) -> None:
+        """
+        Record the DB answer for a positive filter result
+        """
+        with self._lock:
+            self.metrics["confirmed_duplicates" if is_duplicate else "false_positives"] += 1
+
+    def build(self, db: Session) -> None:
+        """
+        Build the filter from every SCE039_DUPLI row, streaming from the DB
+        """
+        total = db.execute(text("SELECT COUNT(*) FROM SCE039_DUPLI")).scalar() or 0
+        capacity = max(settings.DUPLI_BLOOM_CAPACITY, int(total * 1.25))
+        bloom = BloomFilter.for_capacity(
+            capacity,
+            settings.DUPLI_BLOOM_ERROR_RATE,
+            settings.DUPLI_BLOOM_MAX_MEMORY_MB * 1024 * 1024
+        )
+
+        last_id = self._load_rows(db, bloom, 0)
+
+        with self._lock:
+            self.bloom = bloom
+            self.last_id = last_id
+            self.refreshed_at = time.monotonic()
+
+        logger.info(
+            "Bloom SCE039_DUPLI: %s claves, %.1f MB, error estimado %.4f%%",
+            bloom.count, bloom.size_bytes / 1024 / 1024, bloom.estimated_error_rate() * 100
+        )
+
+    def refresh(self, db: Session) -> int:
+        """
+        Add rows inserted since the last build/refresh; returns rows added
+        """
+        if self.bloom is None:
+            return 0
+
+        before = self.bloom.count
+        # Rows are added before last_id moves past them, so a negative answer
+        # never covers a row that is not in the filter yet
+        last_id = self._load_rows(db, self.bloom, self.last_id)
+        with self._lock:
+            self.last_id = last_id
+            self.refreshed_at = time.monotonic()
+        return self.bloom.count - before
+
+    def _load_rows(self, db: Session, bloom: BloomFilter, after_id: int) -> int:
+        query = text("""
+            SELECT id, ce_inicic, clavecct, al_curp
+            FROM SCE039_DUPLI
+            WHERE id > :after_id
+            ORDER BY id
+        """)
+        result = db.execute(
+            query, {"after_id": after_id},
+            execution_options={"stream_results": True, "yield_per": 10000}
+        )
+
+        last_id = after_id
+        for row in result:
+            key = duplicate_key(row[1], row[2], row[3])
+            with self._lock:
+                bloom.add(key)
+            last_id = row[0]
+
+        return last_id
+
+    def save_snapshot(self, path: str) -> None:
+        """
+        Write the filter to path: one JSON header line followed by the bit array
+        """
+        with self._lock:
+            if self.bloom is None:
+                return
+            header = {
+                "num_bits": self.bloom.num_bits,
+                "num_hashes": self.bloom.num_hashes,
+                "count": self.bloom.count,
+                "last_id": self.last_id,
+                "key_format": KEY_FORMAT,
+            }
+            bits = bytes(self.bloom.bits)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            f.write(bits)
+        os.replace(tmp_path, path)
+
+    def load_snapshot(self, path: str) -> bool:
+        """
+        Load a filter written by save_snapshot; returns False if there is none
+        or it was written with another key format
+        """
+        if not os.path.exists(path):
+            return False
+
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            if header.get("key_format") != KEY_FORMAT:
+                return False
+            bits = bytearray(f.read())
+
+        with self._lock:
+            self.bloom = BloomFilter(header["num_bits"], header["num_hashes"], bits, header["count"])
+            self.last_id = header["last_id"]
+
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.metrics)
+            stats["ready"] = self.bloom is not None
+            if self.bloom is not None:
+                stats.update({
+                    "keys": self.bloom.count,
+                    "memory_bytes": self.bloom.size_bytes,
+                    "estimated_error_rate": self.bloom.estimated_error_rate(),
+                    "last_id": self.last_id,
+                })
+        return stats
+
+    def _initialize(self) -> None:
+        db = SessionLocal()
+        try:
+            snapshot = settings.DUPLI_BLOOM_SNAPSHOT_PATH
+            if snapshot and self.load_snapshot(snapshot):
+                self.refresh(db)
+            else:
+                self.build(db)
+            if snapshot:
+                self.save_snapshot(snapshot)
+        finally:
+            db.close()
+
+    def _refresh(self) -> None:
+        db = SessionLocal()
+        try:
+            self.refresh(db)
+        finally:
+            db.close()
+
+    async def run(self) -> None:
+        """
+        Background task: build (or load) the filter, then refresh it periodically
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._initialize)
+        except Exception:
+            logger.exception("No se pudo construir el filtro Bloom de SCE039_DUPLI")
+
+        try:
+            while True:
+                await asyncio.sleep(settings.DUPLI_BLOOM_REFRESH_SECONDS)
+                try:
+                    await loop.run_in_executor(None, self._refresh)
+                except Exception:
+                    logger.exception("No se pudo actualizar el filtro Bloom de SCE039_DUPLI")
+        finally:
+            if settings.DUPLI_BLOOM_SNAPSHOT_PATH and self.bloom is not None:
+                self.save_snapshot(settings.DUPLI_BLOOM_SNAPSHOT_PATH)
+
+
+duplicate_filter = DuplicateFilter()
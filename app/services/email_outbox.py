@@ -0,0 +1,261 @@
+import asyncio
+import logging
+import smtplib
+import ssl
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from email.utils import formataddr
+from html import escape
+from typing import List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, advisory_lock
+from app.models.email_outbox import EmailOutbox
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+PENDING = "PENDIENTE"
+SENDING = "ENVIANDO"
+SENT = "ENVIADO"
+FAILED = "FALLIDO"
+
+
+def enqueue_email(db: Session, to: str, subject: str, text: str, html: Optional[str] = None) -> EmailOutbox:
+    """
+    Add an e-mail to the outbox; it is sent once the caller commits
+    """
+    message = EmailOutbox(
+        destinatario=to,
+        asunto=subject,
+        cuerpo_texto=text,
+        cuerpo_html=html,
+        estado=PENDING,
+        intentos=0,
+        siguiente_intento=datetime.utcnow()
+    )
+    db.add(message)
+    return message
+
+
+def enqueue_activation_email(db: Session, user: User) -> EmailOutbox:
+    link = settings.ACTIVATION_URL_TEMPLATE.format(token=user.token_activacion)
+    text = (
+        f"Hola {user.u_nombre}:\n\n"
+        f"Para activar tu cuenta del Portal USEBEQ abre el siguiente enlace:\n{link}\n\n"
+        f"Si no solicitaste esta cuenta, ignora este correo."
+    )
+    html = (
+        f"<p>Hola {escape(user.u_nombre)}:</p>"
+        f"<p>Para activar tu cuenta del Portal USEBEQ haz clic en el siguiente enlace:</p>"
+        f"<p><a href=\"{escape(link)}\">Activar mi cuenta</a></p>"
+        f"<p>Si no solicitaste esta cuenta, ignora este correo.</p>"
+    )
+    return enqueue_email(db, user.u_correo, "Activa tu cuenta del Portal USEBEQ", text, html)
+
+
+class SMTPSender:
+    """
+    One SMTP connection reused across messages, reopened when dropped or idle
+
+    Works against any SMTP server, e.g. a local aiosmtpd
+    (python -m aiosmtpd -n -l localhost:8025, MAIL_STARTTLS=false).
+    """
+
+    def __init__(self):
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    def _connect(self) -> smtplib.SMTP:
+        if settings.MAIL_SSL_TLS:
+            smtp = smtplib.SMTP_SSL(settings.MAIL_SERVER, settings.MAIL_PORT,
+                                    timeout=settings.MAIL_TIMEOUT_SECONDS,
+                                    context=ssl.create_default_context())
+        else:
+            smtp = smtplib.SMTP(settings.MAIL_SERVER, settings.MAIL_PORT, timeout=settings.MAIL_TIMEOUT_SECONDS)
+            if settings.MAIL_STARTTLS:
+                smtp.starttls(context=ssl.create_default_context())
+        if settings.MAIL_USERNAME:
+            smtp.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
+        return smtp
+
+    def send(self, message: EmailMessage) -> None:
+        if self._smtp is not None and time.monotonic() - self._last_used > settings.MAIL_SMTP_IDLE_SECONDS:
+            self.close()
+
+        for attempt in range(2):
+            if self._smtp is None:
+                self._smtp = self._connect()
+            try:
+                self._smtp.send_message(message)
+                self._last_used = time.monotonic()
+                return
+            except smtplib.SMTPServerDisconnected:
+                # Server closed the reused connection: reconnect once
+                self._smtp = None
+                if attempt:
+                    raise
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+def build_message(row: EmailOutbox) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = formataddr((settings.MAIL_FROM_NAME, settings.MAIL_FROM))
+    message["To"] = row.destinatario
+    message["Subject"] = row.asunto
+    message.set_content(row.cuerpo_texto)
+    if row.cuerpo_html:
+        message.add_alternative(row.cuerpo_html, subtype="html")
+    return message
+
+
+# MySQL advisory lock: one sending process across all API workers
+SEND_LOCK = "pp_correo_salida"
+
+
+class EmailOutboxWorker:
+    """
+    Sends pp_correo_salida in batches over one reused SMTP connection
+
+    Every API worker runs it, but a batch is only sent by the process holding
+    SEND_LOCK, so MAIL_RATE_PER_MINUTE is the real rate towards the provider.
+    Due messages are claimed with SELECT ... FOR UPDATE SKIP LOCKED and leased
+    for MAIL_LEASE_SECONDS, so a crashed worker's messages are picked up
+    again. Failures are retried with exponential backoff up to
+    MAIL_MAX_ATTEMPTS, then marked FALLIDO.
+    """
+
+    def __init__(self):
+        self.sender = SMTPSender()
+        self._wake: Optional[asyncio.Event] = None
+        self._next_send = 0.0
+
+    def check_settings(self) -> None:
+        """
+        A full batch must be sent before its lease expires, or another run
+        would claim the same messages again and send them twice
+        """
+        batch_seconds = settings.MAIL_BATCH_SIZE * 60 / settings.MAIL_RATE_PER_MINUTE
+        if batch_seconds >= settings.MAIL_LEASE_SECONDS:
+            raise RuntimeError(
+                f"MAIL_BATCH_SIZE * 60 / MAIL_RATE_PER_MINUTE ({batch_seconds:.0f} s) "
+                f"debe ser menor que MAIL_LEASE_SECONDS ({settings.MAIL_LEASE_SECONDS} s)"
+            )
+
+    def wake(self) -> None:
+        """
+        Start the next batch now instead of waiting for the poll interval
+        """
+        if self._wake is not None:
+            self._wake.set()
+
+    def _claim(self, db: Session) -> List[EmailOutbox]:
+        now = datetime.utcnow()
+        rows = db.query(EmailOutbox).filter(
+            EmailOutbox.estado.in_([PENDING, SENDING]),
+            EmailOutbox.siguiente_intento <= now
+        ).order_by(EmailOutbox.siguiente_intento).limit(
+            settings.MAIL_BATCH_SIZE
+        ).with_for_update(skip_locked=True).all()
+
+        for row in rows:
+            row.estado = SENDING
+            row.siguiente_intento = now + timedelta(seconds=settings.MAIL_LEASE_SECONDS)
+        db.commit()
+        return rows
+
+    def _throttle(self) -> None:
+        wait = self._next_send - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._next_send = max(self._next_send, time.monotonic()) + 60.0 / settings.MAIL_RATE_PER_MINUTE
+
+    def _record(self, db: Session, row: EmailOutbox, error: Optional[Exception]) -> None:
+        now = datetime.utcnow()
+        if error is None:
+            values = {"estado": SENT, "sent_at": now, "ultimo_error": None}
+        else:
+            attempts = row.intentos + 1
+            backoff = min(settings.MAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.MAIL_RETRY_MAX_SECONDS)
+            values = {
+                "estado": FAILED if attempts >= settings.MAIL_MAX_ATTEMPTS else PENDING,
+                "intentos": attempts,
+                "siguiente_intento": now + timedelta(seconds=backoff),
+                "ultimo_error": str(error)[:1000]
+            }
+        db.execute(update(EmailOutbox).where(EmailOutbox.id == row.id).values(**values))
+        db.commit()
+
+    def process_batch(self) -> int:
+        """
+        Claim and send one batch; returns the number of messages handled
+        (0 if another process holds SEND_LOCK)
+        """
+        with advisory_lock(SEND_LOCK) as acquired:
+            if not acquired:
+                return 0
+            db = SessionLocal()
+            try:
+                rows = self._claim(db)
+                for row in rows:
+                    self._throttle()
+                    self._record(db, row, self._send(row))
+                return len(rows)
+            finally:
+                db.close()
+
+    def _send(self, row: EmailOutbox) -> Optional[Exception]:
+        """
+        Send one message; any error is returned to be recorded as a failed
+        attempt, so one bad row never stalls the rest of the batch
+        """
+        try:
+            self.sender.send(build_message(row))
+        except (smtplib.SMTPException, OSError) as e:
+            logger.warning("No se pudo enviar el correo %s a %s: %s", row.id, row.destinatario, e)
+            self.sender.close()
+            return e
+        except Exception as e:
+            # e.g. ValueError from a header with a line break
+            logger.exception("No se pudo preparar el correo %s", row.id)
+            return e
+        return None
+
+    async def run(self) -> None:
+        """
+        Background task: send due messages, then wait for wake() or the poll interval
+        """
+        self._wake = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    handled = await loop.run_in_executor(None, self.process_batch)
+                except Exception:
+                    logger.exception("Error en el worker de la bandeja de correos")
+                    handled = 0
+
+                if handled >= settings.MAIL_BATCH_SIZE:
+                    continue
+
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=settings.MAIL_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.sender.close()
+
+
+email_outbox_worker = EmailOutboxWorker()
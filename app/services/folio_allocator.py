@@ -0,0 +1,120 @@
+import threading
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.certificate import REGION_ROMAN
+
+
+def format_folio(year: int, region: str, number: int) -> str:
+    """
+    Format: YEAR-REGION-00001
+    """
+    return f"{year}-{REGION_ROMAN[region]}-{number:05d}"
+
+
+class FolioAllocator:
+    """
+    Hands out certificate folios from the pp_folio_contador counter table
+
+    Each reservation is one atomic UPDATE ... SET ultimo = LAST_INSERT_ID(ultimo + n)
+    in its own short transaction, so concurrent requests (in this or other
+    workers) never receive the same number. With block_size > 1 each worker
+    reserves that many numbers at once and serves them from memory; folios are
+    then unique but not strictly ordered across workers, and unused numbers of
+    a block are lost on restart.
+    """
+
+    def __init__(self, block_size: int = 1):
+        self.block_size = max(1, block_size)
+        self._blocks: Dict[Tuple[int, str], List[int]] = {}
+        self._block_locks: Dict[Tuple[int, str], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def reserve(self, year: int, region: str, count: int) -> Tuple[int, int]:
+        """
+        Atomically reserve count consecutive numbers; returns (first, last)
+        """
+        params = {"anio": year, "region": region, "count": count}
+        update = text("""
+            UPDATE pp_folio_contador
+            SET ultimo = LAST_INSERT_ID(ultimo + :count)
+            WHERE anio = :anio AND region = :region
+        """)
+
+        with engine.begin() as conn:
+            if conn.execute(update, params).rowcount == 0:
+                # First folio of the year for this region: seed from tramites1
+                conn.execute(text("""
+                    INSERT IGNORE INTO pp_folio_contador (anio, region, ultimo)
+                    VALUES (:anio, :region, :ultimo)
+                """), dict(params, ultimo=self._last_issued(conn, year, region)))
+                conn.execute(update, params)
+
+            last = conn.execute(text("SELECT LAST_INSERT_ID()")).scalar()
+
+        return last - count + 1, last
+
+    def _last_issued(self, conn, year: int, region: str) -> int:
+        """
+        Highest number already used in tramites1 for year and region
+        """
+        if region not in REGION_ROMAN:
+            return 0
+
+        result = conn.execute(
+            text("SELECT MAX(folio) FROM tramites1 WHERE folio LIKE :prefix"),
+            {"prefix": f"{year}-{REGION_ROMAN[region]}-%"}
+        ).scalar()
+
+        return int(result.split('-')[2]) if result else 0
+
+    def next_number(self, year: int, region: str) -> int:
+        """
+        Get the next number for year and region, from the local block if any is left
+        """
+        if self.block_size == 1:
+            # The UPDATE is atomic on its own: no local state to protect
+            return self.reserve(year, region, 1)[0]
+
+        key = (year, region)
+        with self._locks_lock:
+            lock = self._block_locks.setdefault(key, threading.Lock())
+
+        # Only requests for the same year and region wait for a refill
+        with lock:
+            block = self._blocks.get(key)
+            if not block or block[0] > block[1]:
+                block = list(self.reserve(year, region, self.block_size))
+                self._blocks[key] = block
+            number = block[0]
+            block[0] += 1
+
+        return number
+
+    def next_folio(self, region: str) -> str:
+        """
+        Get the next folio for a region
+        """
+        if region not in REGION_ROMAN:
+            raise ValueError(f"Region desconocida: {region}")
+
+        year = datetime.now().year
+        return format_folio(year, region, self.next_number(year, region))
+
+    def next_folios(self, region: str, count: int) -> List[str]:
+        """
+        Get count consecutive folios for a region with a single reservation
+        """
+        if region not in REGION_ROMAN:
+            raise ValueError(f"Region desconocida: {region}")
+
+        year = datetime.now().year
+        first, last = self.reserve(year, region, count)
+        return [format_folio(year, region, n) for n in range(first, last + 1)]
+
+
+folio_allocator = FolioAllocator(settings.FOLIO_BLOCK_SIZE)
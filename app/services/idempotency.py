@@ -0,0 +1,200 @@
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.idempotency import IdempotencyKey
+
+IN_PROGRESS = "EN_PROCESO"
+COMPLETED = "COMPLETADO"
+
+
+class IdempotencyStore:
+    """
+    Idempotency-Key handling backed by the pp_idempotencia table
+
+    The first request with a key claims it (unique scope + clave) and runs;
+    its response is stored for IDEMPOTENCY_TTL_HOURS. Repeats get the stored
+    response without running the handler again, and repeats that arrive while
+    the first one is still running wait for it (up to IDEMPOTENCY_WAIT_SECONDS).
+    Claims and results are written in their own short transactions so other
+    workers see them immediately.
+    """
+
+    poll_interval = 0.1
+    prune_interval = 60
+
+    def __init__(self):
+        self._last_prune = 0.0
+
+    @staticmethod
+    def fingerprint(payload: Any) -> str:
+        body = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+    def begin(self, scope: str, key: str, fingerprint: str) -> Optional[JSONResponse]:
+        """
+        Claim the key; returns None if claimed, or the stored response of the first request
+        """
+        if len(key) > 255:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Idempotency-Key debe tener maximo 255 caracteres"
+            )
+
+        self._prune_expired()
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+
+        while True:
+            now = datetime.utcnow()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(IdempotencyKey).values(
+                        scope=scope,
+                        clave=key,
+                        fingerprint=fingerprint,
+                        estado=IN_PROGRESS,
+                        created_at=now,
+                        expires_at=now + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+                    ))
+                return None
+            except IntegrityError:
+                pass
+
+            with engine.connect() as conn:
+                record = conn.execute(
+                    select(IdempotencyKey).where(
+                        IdempotencyKey.scope == scope,
+                        IdempotencyKey.clave == key
+                    )
+                ).first()
+
+            if record is None:
+                # Released meanwhile, try to claim it again
+                continue
+
+            abandoned = (
+                record.estado == IN_PROGRESS and
+                record.created_at < now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS)
+            )
+            if record.expires_at < now or abandoned:
+                self._delete(scope, key)
+                continue
+
+            if record.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key ya fue usada con una solicitud diferente"
+                )
+
+            if record.estado == COMPLETED:
+                return JSONResponse(
+                    content=json.loads(record.response_body),
+                    status_code=record.status_code,
+                    headers={"Idempotent-Replayed": "true"}
+                )
+
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Una solicitud con esta Idempotency-Key sigue en proceso"
+                )
+
+            time.sleep(self.poll_interval)
+
+    def complete(self, scope: str, key: str, status_code: int, body: Any) -> None:
+        """
+        Store the response of the request that claimed the key
+        """
+        with engine.begin() as conn:
+            conn.execute(
+                update(IdempotencyKey).where(
+                    IdempotencyKey.scope == scope,
+                    IdempotencyKey.clave == key
+                ).values(
+                    estado=COMPLETED,
+                    status_code=status_code,
+                    response_body=json.dumps(jsonable_encoder(body))
+                )
+            )
+
+    def release(self, scope: str, key: str) -> None:
+        """
+        Drop the claim of a request that failed, so the client can retry
+        """
+        self._delete(scope, key)
+
+    def _delete(self, scope: str, key: str) -> None:
+        with engine.begin() as conn:
+            conn.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.scope == scope,
+                    IdempotencyKey.clave == key
+                )
+            )
+
+    def _prune_expired(self) -> None:
+        if time.monotonic() - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = time.monotonic()
+
+        with engine.begin() as conn:
+            conn.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.expires_at < datetime.utcnow()
+                )
+            )
+
+    def run(self, scope: str, key: Optional[str], payload: Any, handler: Callable[[], Any]) -> Any:
+        """
+        Run handler at most once per key (sync endpoints)
+        """
+        if not key:
+            return handler()
+
+        replay = self.begin(scope, key, self.fingerprint(payload))
+        if replay is not None:
+            return replay
+
+        try:
+            result = handler()
+        except Exception:
+            self.release(scope, key)
+            raise
+
+        self.complete(scope, key, status.HTTP_200_OK, result)
+        return result
+
+    async def run_async(self, scope: str, key: Optional[str], payload: Any,
+                        handler: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run handler at most once per key (async endpoints)
+        """
+        if not key:
+            return await handler()
+
+        replay = await run_in_threadpool(self.begin, scope, key, self.fingerprint(payload))
+        if replay is not None:
+            return replay
+
+        try:
+            result = await handler()
+        except Exception:
+            await run_in_threadpool(self.release, scope, key)
+            raise
+
+        await run_in_threadpool(self.complete, scope, key, status.HTTP_200_OK, result)
+        return result
+
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,83 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+
+from app.models.student import ParentLink
+
+PARENTESCOS = ("PADRE", "MADRE", "TUTOR")
+
+
+def sync_parent_link(db: Session, al_id: int, parentesco: str, correo: str) -> Optional[str]:
+    """
+    Mirror a pp_alumnos padre/madre/tutor assignment into pp_alumnos_padres
+
+    pp_alumnos keeps a single e-mail per parentesco, so any previous parent
+    linked with the same parentesco is replaced. Returns the replaced e-mail, if any.
+    Does not commit; runs in the caller's transaction.
+    """
+    parentesco = parentesco.upper()
+
+    previous = db.query(ParentLink).filter(
+        ParentLink.al_id == al_id,
+        ParentLink.parentesco == parentesco
+    ).first()
+
+    if previous and previous.correo == correo:
+        return None
+
+    previous_correo = None
+    if previous:
+        previous_correo = previous.correo
+        db.delete(previous)
+        db.flush()
+
+    db.add(ParentLink(correo=correo, al_id=al_id, parentesco=parentesco))
+    db.flush()
+
+    return previous_correo
+
+
+def backfill_parent_links(db: Session, batch_size: int = 5000) -> int:
+    """
+    Populate pp_alumnos_padres from the padre/madre/tutor columns of pp_alumnos
+
+    Runs in al_id ranges of batch_size and commits after each one, so it can be
+    re-run safely; links that already exist are skipped. Returns rows inserted.
+    """
+    bounds = db.execute(text("SELECT MIN(al_id), MAX(al_id) FROM pp_alumnos")).fetchone()
+
+    if not bounds or bounds[0] is None:
+        return 0
+
+    min_id, max_id = bounds
+    inserted = 0
+
+    for start in range(min_id, max_id + 1, batch_size):
+        end = start + batch_size
+
+        for parentesco in PARENTESCOS:
+            column = parentesco.lower()
+            insert_query = text(f"""
+                INSERT INTO pp_alumnos_padres (correo, al_id, parentesco)
+                SELECT DISTINCT a.{column}, a.al_id, :parentesco
+                FROM pp_alumnos a
+                WHERE a.al_id >= :start AND a.al_id < :end
+                AND a.{column} IS NOT NULL AND a.{column} <> ''
+                AND NOT EXISTS (
+                    SELECT 1 FROM pp_alumnos_padres v
+                    WHERE v.correo = a.{column}
+                    AND v.al_id = a.al_id
+                    AND v.parentesco = :parentesco
+                )
+            """)
+            result = db.execute(insert_query, {
+                "parentesco": parentesco,
+                "start": start,
+                "end": end
+            })
+            inserted += result.rowcount or 0
+
+        db.commit()
+
+    return inserted
@@ -0,0 +1,121 @@
+import hashlib
+import secrets
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+
+PRUNE_EXPIRED = text("""
+    DELETE FROM pp_refresh_tokens WHERE expires_at < :now LIMIT :batch_size
+""")
+
+
+class InvalidRefreshToken(Exception):
+    """
+    Raised when a refresh token is unknown, expired, revoked or reused
+    """
+
+
+def hash_refresh_token(token: str) -> str:
+    # Tokens are 256-bit random values, so a fast hash is enough
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class RefreshTokenStore:
+    """
+    Opaque rotating refresh tokens stored hashed in pp_refresh_tokens
+
+    Every refresh marks the token as used and issues a new one in the same
+    family. Presenting a used token again means it was stolen (or replayed),
+    so the whole family is revoked and the user has to log in again.
+    """
+
+    def __init__(self):
+        self.prune_interval = settings.REFRESH_TOKEN_PRUNE_SECONDS
+        self._last_prune = 0.0
+
+    def issue(self, db: Session, u_id: int, familia: Optional[str] = None) -> str:
+        """
+        Create a refresh token (new family unless given); the caller commits
+        """
+        token = secrets.token_urlsafe(32)
+        db.add(RefreshToken(
+            u_id=u_id,
+            token_hash=hash_refresh_token(token),
+            familia=familia or uuid.uuid4().hex,
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        ))
+        return token
+
+    def rotate(self, db: Session, token: str) -> Tuple[int, str]:
+        """
+        Exchange a refresh token for a new one: returns (u_id, new token)
+        """
+        now = datetime.utcnow()
+        stored = db.query(RefreshToken).filter(
+            RefreshToken.token_hash == hash_refresh_token(token)
+        ).with_for_update().first()
+
+        if stored is None or stored.revoked_at is not None or stored.expires_at < now:
+            db.rollback()
+            raise InvalidRefreshToken()
+
+        if stored.used_at is not None:
+            self._revoke_family(db, stored.familia, now)
+            db.commit()
+            raise InvalidRefreshToken()
+
+        stored.used_at = now
+        new_token = self.issue(db, stored.u_id, stored.familia)
+        u_id = stored.u_id
+        db.commit()
+
+        self.prune_expired(db)
+        return u_id, new_token
+
+    def revoke(self, db: Session, token: str) -> None:
+        """
+        Revoke the family of a refresh token (logout); unknown tokens are ignored
+        """
+        stored = db.query(RefreshToken).filter(
+            RefreshToken.token_hash == hash_refresh_token(token)
+        ).first()
+        if stored is not None:
+            self._revoke_family(db, stored.familia, datetime.utcnow())
+            db.commit()
+
+    def _revoke_family(self, db: Session, familia: str, now: datetime) -> None:
+        db.execute(
+            update(RefreshToken).where(
+                RefreshToken.familia == familia,
+                RefreshToken.revoked_at.is_(None)
+            ).values(revoked_at=now)
+        )
+
+    def prune_expired(self, db: Session, force: bool = False) -> int:
+        """
+        Delete expired tokens in batches, at most once per REFRESH_TOKEN_PRUNE_SECONDS
+        """
+        if not force and time.monotonic() - self._last_prune < self.prune_interval:
+            return 0
+        self._last_prune = time.monotonic()
+
+        deleted = 0
+        while True:
+            result = db.execute(PRUNE_EXPIRED, {
+                "now": datetime.utcnow(),
+                "batch_size": settings.REFRESH_TOKEN_PRUNE_BATCH_SIZE
+            })
+            db.commit()
+            deleted += result.rowcount
+            if result.rowcount < settings.REFRESH_TOKEN_PRUNE_BATCH_SIZE:
+                return deleted
+
+
+refresh_token_store = RefreshTokenStore()
@@ -0,0 +1,82 @@
+import base64
+import hashlib
+import hmac
+from datetime import date
+from typing import Optional
+
+from app.core.config import settings
+from app.models.certificate import TramiteStatus
+
+# Status is carried as its position in TramiteStatus to keep the QR small
+STATUS_CODES = list(TramiteStatus)
+
+# Derived key, so QR tokens can never be confused with JWTs signed with SECRET_KEY
+_KEY = hashlib.sha256(b"certificate-status-qr:" + settings.SECRET_KEY.encode()).digest()
+_SIGNATURE_BYTES = 12
+_CURP_HASH_BYTES = 6
+
+
+class InvalidStatusToken(Exception):
+    """
+    Raised when a QR status token is malformed or its signature does not match
+    """
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(_KEY, payload, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+
+def curp_hash(curp: str) -> str:
+    """
+    Keyed hash of a CURP, so the token does not expose it
+    """
+    digest = hmac.new(_KEY, curp.strip().upper().encode(), hashlib.sha256).digest()
+    return _b64encode(digest[:_CURP_HASH_BYTES])
+
+
+def create_status_token(folio: str, curp: str, status: TramiteStatus, issued: Optional[date] = None) -> str:
+    """
+    Signed token with folio, CURP hash, status and issue date: payload.signature
+    """
+    issued = issued or date.today()
+    payload = "|".join([
+        folio,
+        curp_hash(curp),
+        str(STATUS_CODES.index(status)),
+        issued.strftime("%Y%m%d")
+    ]).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def verify_status_token(token: str) -> dict:
+    """
+    Check the signature and decode the token without touching the database
+    """
+    try:
+        encoded_payload, encoded_signature = token.split(".")
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except (ValueError, TypeError):
+        raise InvalidStatusToken()
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidStatusToken()
+
+    try:
+        folio, hashed_curp, status_code, issued = payload.decode().split("|")
+        return {
+            "folio": folio,
+            "curp_hash": hashed_curp,
+            "status": STATUS_CODES[int(status_code)],
+            "issued": date(int(issued[:4]), int(issued[4:6]), int(issued[6:8]))
+        }
+    except (ValueError, IndexError):
+        raise InvalidStatusToken()
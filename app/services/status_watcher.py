@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.certificate import CertificateRequest
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriberLimitReached(Exception):
+    """
+    Raised when STATUS_STREAM_MAX_SUBSCRIBERS clients are already waiting
+    """
+
+
+class StatusWatcher:
+    """
+    Fans certificate status changes out to clients waiting on a folio
+
+    A single background task reads status and entregado of every watched
+    folio each STATUS_STREAM_POLL_SECONDS (the set is bounded by
+    STATUS_STREAM_MAX_SUBSCRIBERS), so any number of waiting clients costs
+    one query per interval. updated_at is not used to filter: status changes
+    are written outside this API and may not bump it. Only states that differ
+    from the previous poll are pushed; subscribers also drop repeated states.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._count = 0
+        self._last_state: Dict[str, Tuple] = {}
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._count
+
+    def subscribe(self, folio: str) -> asyncio.Queue:
+        if self._count >= settings.STATUS_STREAM_MAX_SUBSCRIBERS:
+            raise SubscriberLimitReached()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+        self._subscribers[folio].add(queue)
+        self._count += 1
+        return queue
+
+    def unsubscribe(self, folio: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(folio)
+        if queues and queue in queues:
+            queues.discard(queue)
+            self._count -= 1
+            if not queues:
+                del self._subscribers[folio]
+                self._last_state.pop(folio, None)
+
+    def _load_states(self, folios: List[str]) -> list:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(
+                    CertificateRequest.folio,
+                    CertificateRequest.status,
+                    CertificateRequest.entregado,
+                    CertificateRequest.updated_at
+                ).where(CertificateRequest.folio.in_(folios))
+            ).all()
+            return [
+                {
+                    "folio": row.folio,
+                    "status": row.status.value if row.status else None,
+                    "entregado": row.entregado.value if row.entregado else None,
+                    "updated_at": row.updated_at.isoformat() if row.updated_at else None
+                }
+                for row in rows
+            ]
+        finally:
+            db.close()
+
+    async def poll_once(self) -> None:
+        folios = list(self._subscribers)
+        if not folios:
+            return
+
+        states = await asyncio.get_running_loop().run_in_executor(
+            None, self._load_states, folios
+        )
+
+        for change in states:
+            state = (change["status"], change["entregado"])
+            if self._last_state.get(change["folio"]) == state:
+                continue
+            queues = self._subscribers.get(change["folio"])
+            if not queues:
+                continue
+            self._last_state[change["folio"]] = state
+            for queue in list(queues):
+                if queue.full():
+                    # Slow client: keep only the latest state
+                    queue.get_nowait()
+                queue.put_nowait(change)
+
+    async def run(self) -> None:
+        """
+        Background task: poll for status changes while anyone is subscribed
+        """
+        while True:
+            await asyncio.sleep(settings.STATUS_STREAM_POLL_SECONDS)
+            try:
+                await self.poll_once()
+            except Exception:
+                logger.exception("No se pudieron consultar los cambios de estatus de tramites1")
+
+
+status_watcher = StatusWatcher()
@@ -0,0 +1,102 @@
+import uuid
+from typing import Callable, FrozenSet
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import MISS, get_cache
+from app.core.config import settings
+from app.models.student import ParentLink, StudentParent
+
+
+def load_parent_student_ids(db: Session, correo: str) -> FrozenSet[int]:
+    """
+    Load every al_id linked to a parent e-mail as padre/madre/tutor
+    """
+    rows = db.query(ParentLink.al_id).filter(ParentLink.correo == correo).all()
+    return frozenset(row[0] for row in rows)
+
+
+def load_linked_student_ids(db: Session, u_id: int) -> FrozenSet[int]:
+    """
+    Load every al_id linked to a user through StudentParent.u_id
+    """
+    rows = db.query(StudentParent.al_id).filter(StudentParent.u_id == u_id).all()
+    return frozenset(row[0] for row in rows)
+
+
+class StudentAccessCache:
+    """
+    Per-user cache of the students a parent may access
+
+    Keeps two sets per user: the pp_alumnos padre/madre/tutor path (keyed by
+    e-mail) and the StudentParent.u_id path used by grades. Entries live on
+    the shared cache tier and expire after STUDENT_ACCESS_CACHE_TTL_SECONDS.
+    Keys include a per-user generation that invalidate() replaces whenever
+    the user links or unlinks a student, so a set loaded before an
+    invalidation is stored under the old generation and never read again.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.cache = get_cache("student-access", ttl_seconds)
+        self.generations = get_cache("student-access-gen", 24 * 3600)
+
+    def _generation(self, u_id: int) -> str:
+        generation = self.generations.get(u_id)
+        if generation is MISS:
+            generation = uuid.uuid4().hex
+            self.generations.set(u_id, generation)
+        return generation
+
+    def get(self, kind: str, u_id: int, loader: Callable[[], FrozenSet[int]]) -> FrozenSet[int]:
+        # Read before loading: an invalidate() during the load changes it
+        key = f"{kind}:{u_id}:{self._generation(u_id)}"
+        ids = self.cache.get(key)
+        if ids is not MISS:
+            return frozenset(ids)
+
+        ids = loader()
+        self.cache.set(key, sorted(ids))
+        return ids
+
+    def invalidate(self, u_id: int) -> None:
+        self.generations.set(u_id, uuid.uuid4().hex)
+
+
+student_access_cache = StudentAccessCache(settings.STUDENT_ACCESS_CACHE_TTL_SECONDS)
+
+
+class StudentAccess:
+    """
+    Ownership checks for the current user, answered from the cached id sets
+    """
+
+    def __init__(self, db: Session, u_id: int, correo: str):
+        self.db = db
+        self.u_id = u_id
+        self.correo = correo
+
+    @property
+    def parent_student_ids(self) -> FrozenSet[int]:
+        return student_access_cache.get(
+            "parent", self.u_id,
+            lambda: load_parent_student_ids(self.db, self.correo)
+        )
+
+    @property
+    def linked_student_ids(self) -> FrozenSet[int]:
+        return student_access_cache.get(
+            "linked", self.u_id,
+            lambda: load_linked_student_ids(self.db, self.u_id)
+        )
+
+    def can_access(self, al_id: int) -> bool:
+        """
+        Student is registered in pp_alumnos as child of the user (padre/madre/tutor)
+        """
+        return al_id in self.parent_student_ids
+
+    def is_linked(self, al_id: int) -> bool:
+        """
+        Student is linked to the user through StudentParent.u_id
+        """
+        return al_id in self.linked_student_ids
@@ -0,0 +1,109 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple, Type
+
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.certificate import (
+    CertificateRequest,
+    CertificateRequestArchive,
+    CertificateRequestColumns,
+    TramiteStatus
+)
+
+logger = logging.getLogger(__name__)
+
+# Only signed requests are archived, once they can no longer affect eligibility
+ARCHIVABLE_STATUSES = [TramiteStatus.FIRMADO, TramiteStatus.REIMPRESION]
+
+COPY_TO_ARCHIVE = text("""
+    INSERT INTO tramites1_archivo SELECT * FROM tramites1 WHERE id IN :ids
+""").bindparams(bindparam("ids", expanding=True))
+
+DELETE_ARCHIVED = text("""
+    DELETE FROM tramites1 WHERE id IN :ids
+""").bindparams(bindparam("ids", expanding=True))
+
+
+def archive_cutoff_year(today: Optional[date] = None) -> int:
+    """
+    First folio year kept entirely in tramites1
+    """
+    return (today or date.today()).year - settings.TRAMITES_HOT_YEARS + 1
+
+
+def archive_cutoff_datetime(today: Optional[date] = None) -> datetime:
+    return datetime(archive_cutoff_year(today), 1, 1)
+
+
+def folio_year(folio: str) -> Optional[int]:
+    """
+    Year prefix of a YEAR-REGION-NNNNN folio
+    """
+    prefix = folio[:4]
+    return int(prefix) if prefix.isdigit() and folio[4:5] == "-" else None
+
+
+def folio_tables(folio: str) -> Tuple[Type[CertificateRequestColumns], ...]:
+    """
+    Tables to search for a folio, in order
+
+    Folios of years before the cutoff are looked up in the archive first;
+    rows the archiving job has not moved yet are still found in tramites1.
+    Newer folios are never archived.
+    """
+    year = folio_year(folio)
+    if year is not None and year < archive_cutoff_year():
+        return (CertificateRequestArchive, CertificateRequest)
+    return (CertificateRequest,)
+
+
+def find_by_folio(db: Session, folio: str, *columns: str):
+    """
+    Request (or the given columns of it) with this folio, from tramites1 or the archive
+    """
+    for model in folio_tables(folio):
+        if columns:
+            query = db.query(*[getattr(model, name) for name in columns])
+        else:
+            query = db.query(model)
+        row = query.filter(model.folio == folio).first()
+        if row:
+            return row
+    return None
+
+
+def archive_requests(db: Session, batch_size: int, today: Optional[date] = None) -> int:
+    """
+    Move signed requests of folio years before the cutoff to tramites1_archivo
+
+    A request is archived once its folio year is before the cutoff and it was
+    signed more than a year ago, so eligibility checks only need the archive
+    in one case (see load_request_summaries). Copies and deletes by id in
+    batches, one transaction per batch. Returns the number of rows moved.
+    """
+    today = today or date.today()
+    cutoff_folio = f"{archive_cutoff_year(today)}-"
+    signed_before = today - timedelta(days=366)
+    moved = 0
+
+    while True:
+        ids = db.execute(
+            select(CertificateRequest.id).where(
+                CertificateRequest.folio < cutoff_folio,
+                CertificateRequest.status.in_(ARCHIVABLE_STATUSES),
+                CertificateRequest.fecha_elaborado < signed_before
+            ).order_by(CertificateRequest.id).limit(batch_size)
+        ).scalars().all()
+
+        if not ids:
+            return moved
+
+        db.execute(COPY_TO_ARCHIVE, {"ids": ids})
+        db.execute(DELETE_ARCHIVED, {"ids": ids})
+        db.commit()
+
+        moved += len(ids)
+        logger.info("Archivadas %s solicitudes de tramites1 (id %s-%s)", len(ids), ids[0], ids[-1])
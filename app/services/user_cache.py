@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import MISS, get_cache
+from app.core.config import settings
+from app.models.user import User, UserStatus
+
+# Secrets never leave the database
+EXCLUDED_COLUMNS = {"u_pass", "token_activacion"}
+CACHED_COLUMNS = [column.key for column in User.__table__.columns if column.key not in EXCLUDED_COLUMNS]
+DATETIME_COLUMNS = {"fecha_registro", "fecha_validacion"}
+
+
+def _to_dict(user: User) -> dict:
+    return {name: getattr(user, name) for name in CACHED_COLUMNS}
+
+
+def _from_dict(data: dict) -> User:
+    for name in DATETIME_COLUMNS:
+        if data.get(name):
+            data[name] = datetime.fromisoformat(data[name])
+    if data.get("estatus"):
+        data["estatus"] = UserStatus(data["estatus"])
+    return User(**data)
+
+
+class UserCache:
+    """
+    Short-TTL cache of the authenticated user, keyed by u_id
+
+    Stored on the shared cache tier without password or activation token.
+    Cached users are transient instances (not in any session) and read-only:
+    handlers that modify the user load a fresh instance with db.get and
+    invalidate the entry afterwards.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.cache = get_cache("user", ttl_seconds)
+
+    def get(self, u_id: int, loader: Callable[[], Optional[User]]) -> Optional[User]:
+        data = self.cache.get(u_id)
+        if data is not MISS:
+            return _from_dict(data)
+
+        user = loader()
+        if user is not None:
+            self.cache.set(u_id, _to_dict(user))
+        return user
+
+    def invalidate(self, u_id: int) -> None:
+        self.cache.delete(u_id)
+
+
+user_cache = UserCache(settings.USER_CACHE_TTL_SECONDS)
+
+
+def load_detached_user(db: Session, u_id: int) -> Optional[User]:
+    """
+    Load a user and detach it from the session so it can be cached
+    """
+    user = db.query(User).filter(User.u_id == u_id).first()
+    if user is not None:
+        db.expunge(user)
+    return user
@@ -0,0 +1,24 @@
+"""
+Archiving job for tramites1
+
+Moves signed requests of folio years before the cutoff (current year minus
+TRAMITES_HOT_YEARS - 1) and signed more than a year ago to tramites1_archivo,
+in batches of TRAMITES_ARCHIVE_BATCH_SIZE. Safe to run repeatedly (cron).
+
+Usage: python archive_tramites.py
+"""
+import time
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.tramites_archive import archive_cutoff_year, archive_requests
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        moved = archive_requests(db, settings.TRAMITES_ARCHIVE_BATCH_SIZE)
+        print(f"✓ {moved} solicitudes anteriores a {archive_cutoff_year()} archivadas "
+              f"en {time.perf_counter() - start:.1f} s")
+    finally:
+        db.close()
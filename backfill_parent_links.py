@@ -0,0 +1,31 @@
+"""
+Script to create and populate pp_alumnos_padres from pp_alumnos
+
+Safe to re-run: links that already exist are skipped.
+"""
+from sqlalchemy import text
+
+from app.core.database import SessionLocal, engine
+from app.services.parent_links import backfill_parent_links
+
+
+def create_parent_links_table():
+    """Create pp_alumnos_padres table if it doesn't exist"""
+    with open("create_parent_links_table.sql", encoding="utf-8") as f:
+        sql = "\n".join(line for line in f if not line.startswith("--"))
+
+    with engine.connect() as conn:
+        conn.execute(text(sql))
+        conn.commit()
+    print("✓ Tabla pp_alumnos_padres creada")
+
+
+if __name__ == "__main__":
+    create_parent_links_table()
+
+    db = SessionLocal()
+    try:
+        inserted = backfill_parent_links(db)
+        print(f"✓ {inserted} vinculos padre-alumno insertados")
+    finally:
+        db.close()
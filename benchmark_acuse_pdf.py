@@ -0,0 +1,63 @@
+"""
+Throughput test for the certificate receipt (acuse) PDF pipeline
+
+Renders receipts for synthetic requests inline and through the bounded
+process pool, then reports PDFs per second for each mode and the size of
+a single receipt. Does not touch the database.
+
+Usage: python benchmark_acuse_pdf.py [acuses] [workers]
+"""
+import asyncio
+import sys
+import time
+
+from app.core.process_pool import BoundedProcessPool
+from app.services.acuse_pdf import init_worker, render_acuse_pdf
+
+
+def sample_data(number: int) -> dict:
+    folio = f"2026-IV-{number:06d}"
+    return {
+        "folio": folio,
+        "nombre_completo": "JUAN PEREZ LOPEZ",
+        "curp": "PELJ100101HQTRPN09",
+        "tipo_tramite": "CERTIFICADO DE PRIMARIA",
+        "cct": "22DPR0001A",
+        "nombre_esc": "ESCUELA PRIMARIA BENITO JUAREZ",
+        "ciclo_terminacion": "2021-2022",
+        "fecha": "19-10-2026",
+        "status": "SOLICITADO",
+        "entregado": "PENDIENTE",
+        "requires_payment": number % 2 == 0,
+        "qr_data": f"http://localhost:8000/api/v1/certificates/status/{folio}"
+    }
+
+
+async def render_pooled(total: int, workers: int) -> float:
+    pool = BoundedProcessPool(max_workers=workers, max_pending=total, initializer=init_worker)
+    # Warm up the workers so process start-up is not measured
+    await asyncio.gather(*(pool.submit(render_acuse_pdf, sample_data(i)) for i in range(workers)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(pool.submit(render_acuse_pdf, sample_data(i)) for i in range(total)))
+    elapsed = time.perf_counter() - start
+
+    pool.shutdown()
+    return elapsed
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    pdf = render_acuse_pdf(sample_data(0))
+    print(f"Tamano de un acuse: {len(pdf) / 1024:.1f} KB")
+
+    start = time.perf_counter()
+    for i in range(total):
+        render_acuse_pdf(sample_data(i))
+    inline = time.perf_counter() - start
+    print(f"En linea:            {total / inline:8.1f} acuses/s")
+
+    pooled = asyncio.run(render_pooled(total, workers))
+    print(f"Pool ({workers} procesos):   {total / pooled:8.1f} acuses/s")
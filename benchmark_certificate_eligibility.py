@@ -0,0 +1,57 @@
+"""
+Benchmark of the certificate free/paid decision without a database
+
+Runs evaluate_existing_request over synthetic summaries covering every branch
+(new, in process, free reprint, paid reprint).
+
+Usage: python benchmark_certificate_eligibility.py [iteraciones]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from app.api.endpoints.certificates import evaluate_existing_request
+from app.models.certificate import TramiteEntregado
+
+
+def synthetic_summaries(n: int, today: date) -> list:
+    """Build n summaries with a realistic mix of histories"""
+    rng = random.Random(42)
+    summaries = []
+    for i in range(n):
+        total = rng.choice([0, 0, 1, 1, 2, 3])
+        signed = rng.randint(0, total)
+        latest_signed = None
+        if signed:
+            latest_signed = {
+                "folio": f"{today.year}-IV-{i:05d}",
+                "entregado": rng.choice(list(TramiteEntregado)),
+                "fecha_elaborado": rng.choice([None, today - timedelta(days=rng.randint(0, 800))])
+            }
+        summaries.append({
+            "total": total,
+            "signed_total": signed,
+            "latest_folio": f"{today.year}-IV-{i:05d}" if total else None,
+            "latest_signed": latest_signed
+        })
+    return summaries
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    today = date.today()
+    summaries = synthetic_summaries(10_000, today)
+
+    outcomes = {}
+    start = time.perf_counter()
+    for i in range(iterations):
+        result = evaluate_existing_request(summaries[i % len(summaries)], today)
+        key = (result["status"], result["requires_payment"])
+        outcomes[key] = outcomes.get(key, 0) + 1
+    elapsed = time.perf_counter() - start
+
+    print(f"{iterations} decisiones en {elapsed:.3f} s "
+          f"({elapsed / iterations * 1e6:.3f} µs por decision)")
+    for (status, requires_payment), count in sorted(outcomes.items()):
+        print(f"   {status:<10} pago={requires_payment!s:<5} {count}")
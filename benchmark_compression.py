@@ -0,0 +1,81 @@
+"""
+CPU cost against bytes saved for response compression on the real response mix
+
+Fetches uncompressed bodies from a running API (the OpenAPI schema plus the
+parent screens, using the bearer token if given) and compresses each one
+with gzip and brotli at every level the middleware can pick, reporting the
+ratio and the time per response. Paths can be passed after the token.
+
+Usage: python benchmark_compression.py [base_url] [token] [ruta ...]
+"""
+import sys
+import time
+import zlib
+
+import httpx
+
+from app.core.compression import BROTLI_LEVELS, GZIP_LEVELS, brotli
+
+DEFAULT_PATHS = [
+    "/api/v1/openapi.json",
+    "/api/v1/users/me",
+    "/api/v1/students/my-students",
+    "/api/v1/dashboard",
+]
+REPEAT = 50
+
+
+def gzip_compress(body: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def timed(compress, body: bytes, level: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        out = compress(body, level)
+    return (time.perf_counter() - start) / REPEAT * 1000, len(out)
+
+
+if __name__ == "__main__":
+    base_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8000"
+    token = sys.argv[2] if len(sys.argv) > 2 else None
+    paths = sys.argv[3:] or DEFAULT_PATHS
+
+    headers = {"Accept-Encoding": "identity"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    bodies = {}
+    with httpx.Client(base_url=base_url, headers=headers, timeout=30) as client:
+        for path in paths:
+            response = client.get(path)
+            if response.status_code != 200:
+                print(f"   {path}: HTTP {response.status_code}, se omite")
+                continue
+            bodies[path] = response.content
+
+    encoders = [("gzip", gzip_compress, sorted(set(GZIP_LEVELS)))]
+    if brotli is not None:
+        encoders.append(("br", lambda body, level: brotli.compress(body, quality=level), sorted(set(BROTLI_LEVELS))))
+    else:
+        print("brotli no esta instalado (pip install brotli); solo gzip")
+
+    totals = {}
+    for path, body in bodies.items():
+        print(f"{path} ({len(body):,} bytes):")
+        for name, compress, levels in encoders:
+            for level in levels:
+                ms, size = timed(compress, body, level)
+                total = totals.setdefault((name, level), [0.0, 0, 0])
+                total[0] += ms
+                total[1] += len(body)
+                total[2] += size
+                print(f"   {name} {level}: {size:>9,} bytes ({size / len(body):6.1%})  {ms:7.3f} ms")
+
+    if totals:
+        print("Mezcla completa:")
+        for (name, level), (ms, original, compressed) in sorted(totals.items()):
+            saved = original - compressed
+            print(f"   {name} {level}: {saved:>9,} bytes ahorrados  {ms:7.3f} ms  "
+                  f"{saved / 1024 / ms if ms else 0:8.1f} KB ahorrados/ms")
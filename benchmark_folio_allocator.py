@@ -0,0 +1,56 @@
+"""
+Concurrency test for the folio allocator (pp_folio_contador)
+
+Runs thousands of parallel allocations against DATABASE_URL on a scratch
+region and verifies that no number is handed out twice. The scratch counter
+row is removed at the end.
+
+Usage: python benchmark_folio_allocator.py [solicitudes] [hilos] [block_size]
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.services.folio_allocator import FolioAllocator
+
+BENCH_YEAR = 1900
+BENCH_REGION = "BENCH"
+
+
+def allocate(allocator: FolioAllocator, requests: int) -> list:
+    """Allocate numbers one by one, as request_certificate does"""
+    return [allocator.next_number(BENCH_YEAR, BENCH_REGION) for _ in range(requests)]
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    block_size = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    # Several allocators simulate several gunicorn workers
+    allocators = [FolioAllocator(block_size) for _ in range(4)]
+    per_thread = total // threads
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [
+            pool.submit(allocate, allocators[i % len(allocators)], per_thread)
+            for i in range(threads)
+        ]
+        numbers = [n for future in futures for n in future.result()]
+    elapsed = time.perf_counter() - start
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("DELETE FROM pp_folio_contador WHERE anio = :anio AND region = :region"),
+            {"anio": BENCH_YEAR, "region": BENCH_REGION}
+        )
+
+    duplicates = len(numbers) - len(set(numbers))
+    print(f"{len(numbers)} folios en {elapsed:.2f} s ({len(numbers) / elapsed:.0f} folios/s), "
+          f"{threads} hilos, block_size={block_size}")
+    print(f"duplicados: {duplicates}")
+    sys.exit(1 if duplicates else 0)
@@ -0,0 +1,97 @@
+"""
+Benchmark of the JSON serialization paths used by the API
+
+Builds synthetic responses shaped like /certificates/list/{curp} and
+/grades/student/{id} and times:
+  - FastAPI's default path: validate against the response_model,
+    jsonable_encoder and json.dumps
+  - response_model validation plus orjson (ORJSONResponse as default class)
+  - the fast path (fast_json): orjson on the data the handler built, no
+    re-validation
+No database is needed.
+
+Usage: python benchmark_json_serialization.py [elementos] [repeticiones]
+"""
+import json
+import random
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.responses import ORJSONResponse, fast_json
+from app.models.certificate import TipoTramite, TramiteEntregado, TramiteStatus
+from app.schemas.certificate import CertificateListResponse, CertificateStatusResponse
+from app.schemas.grade import GradesByPeriod
+
+
+def certificate_list(n: int) -> CertificateListResponse:
+    rng = random.Random(42)
+    certificates = [
+        CertificateStatusResponse(
+            folio=f"2026-IV-{i:05d}",
+            nombre_alumno="ALUMNO",
+            a_paterno="PATERNO",
+            a_materno="MATERNO",
+            curp="BENC000000HQTRPN01",
+            tipo_tramite=rng.choice(list(TipoTramite)),
+            status=rng.choice(list(TramiteStatus)),
+            entregado=rng.choice(list(TramiteEntregado)),
+            fecha="2026-01-15",
+            fecha_elaborado=date(2026, 2, rng.randint(1, 28)),
+            region="IV",
+            requires_payment=rng.random() < 0.5
+        )
+        for i in range(n)
+    ]
+    return CertificateListResponse(curp="BENC000000HQTRPN01", certificates=certificates, total=n)
+
+
+def grades(n: int) -> list:
+    rng = random.Random(7)
+    periods = {}
+    for i in range(n):
+        period = f"P{i % 5 + 1}"
+        periods.setdefault(period, []).append({
+            "id": i,
+            "al_id": 1,
+            "matricula_id": 1,
+            "materia": f"MATERIA {i % 12}",
+            "periodo": period,
+            "calificacion": Decimal(rng.randint(50, 100)) / 10,
+            "observaciones": None
+        })
+    return [{"periodo": p, "calificaciones": c} for p, c in periods.items()]
+
+
+def timed(label: str, func, repeat: int) -> None:
+    body = func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<40} {elapsed / repeat * 1000:8.3f} ms/respuesta  {len(body):>9,} bytes")
+
+
+if __name__ == "__main__":
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    cases = [
+        ("certificates/list", certificate_list(n_items), TypeAdapter(CertificateListResponse)),
+        ("grades/student", grades(n_items), TypeAdapter(list[GradesByPeriod])),
+    ]
+
+    for name, content, adapter in cases:
+        print(f"{name} ({n_items} elementos):")
+        timed("response_model + json.dumps", lambda: json.dumps(
+            jsonable_encoder(adapter.validate_python(jsonable_encoder(content))),
+            ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8"), repeat)
+        timed("response_model + orjson", lambda: ORJSONResponse(
+            jsonable_encoder(adapter.validate_python(jsonable_encoder(content)))
+        ).body, repeat)
+        timed("fast_json (sin revalidar)", lambda: fast_json(content).body, repeat)
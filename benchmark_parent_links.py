@@ -0,0 +1,54 @@
+"""
+Compare query plans and timings for "students of this parent" lookups:
+OR across pp_alumnos.padre/madre/tutor vs the pp_alumnos_padres index.
+
+Usage: python benchmark_parent_links.py correo@ejemplo.com [repeticiones]
+"""
+import sys
+import time
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+LEGACY_QUERY = """
+    SELECT al_id FROM pp_alumnos
+    WHERE padre = :correo OR madre = :correo OR tutor = :correo
+"""
+
+INDEXED_QUERY = """
+    SELECT al_id FROM pp_alumnos_padres
+    WHERE correo = :correo
+"""
+
+
+def explain(conn, sql: str, params: dict):
+    """Print EXPLAIN output for a query"""
+    result = conn.execute(text(f"EXPLAIN {sql}"), params)
+    columns = list(result.keys())
+    for row in result.fetchall():
+        print("   " + ", ".join(f"{c}={v}" for c, v in zip(columns, row)))
+
+
+def time_query(conn, sql: str, params: dict, repeat: int) -> float:
+    """Return average milliseconds per execution"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        conn.execute(text(sql), params).fetchall()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    params = {"correo": sys.argv[1]}
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    with engine.connect() as conn:
+        for name, sql in (("pp_alumnos (OR)", LEGACY_QUERY), ("pp_alumnos_padres", INDEXED_QUERY)):
+            print("=" * 80)
+            print(name)
+            explain(conn, sql, params)
+            print(f"   promedio: {time_query(conn, sql, params, repeat):.3f} ms ({repeat} ejecuciones)")
@@ -0,0 +1,121 @@
+"""
+Benchmark of the tramites1 hot/archive split on a multi-year synthetic dataset
+
+Creates scratch tables shaped like tramites1 (bench_tramites_todo with every
+year, bench_tramites_hot / bench_tramites_archivo split at the cutoff), fills
+them with synthetic requests and times the lookups the API makes: folio by
+year prefix, CURP (hot first) and the MAX(folio) used to seed folios.
+The scratch tables are dropped at the end.
+
+Usage: python benchmark_tramites_archive.py [anios] [solicitudes_por_anio] [consultas]
+"""
+import random
+import sys
+import time
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+TABLES = ("bench_tramites_todo", "bench_tramites_hot", "bench_tramites_archivo")
+TIPOS = ["CERTIFICADO_PREESCOLAR", "CERTIFICADO_PRIMARIA", "CERTIFICADO_SECUNDARIA"]
+
+
+def synthetic_rows(years: list, per_year: int) -> list:
+    rng = random.Random(42)
+    rows = []
+    next_id = 1
+    for year in years:
+        for n in range(1, per_year + 1):
+            rows.append({
+                "id": next_id,
+                "folio": f"{year}-IV-{n:05d}",
+                "curp": f"BENC{rng.randint(0, per_year * len(years) // 2):06d}HQTRPN0{rng.randint(0, 9)}",
+                "tipo_tramite": rng.choice(TIPOS),
+                "status": "FIRMADO" if year < years[-1] else "SOLICITADO",
+                "created_at": datetime(year, rng.randint(1, 12), rng.randint(1, 28)),
+            })
+            next_id += 1
+    return rows
+
+
+def insert_rows(conn, table: str, rows: list) -> None:
+    conn.execute(text(f"""
+        INSERT INTO {table} (id, folio, nombre_alumno, a_paterno, curp, cct, ciclo_terminacion,
+                             tipo_tramite, status, entregado, region, created_at, updated_at)
+        VALUES (:id, :folio, 'BENCH', 'BENCH', :curp, '22DPR0001A', '2020-2021',
+                :tipo_tramite, :status, 'ENTREGADO', '4', :created_at, :created_at)
+    """), rows)
+
+
+def timed(label: str, conn, queries: list) -> None:
+    start = time.perf_counter()
+    for sql, params in queries:
+        conn.execute(text(sql), params).all()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<38} {elapsed / len(queries) * 1000:7.3f} ms/consulta")
+
+
+if __name__ == "__main__":
+    n_years = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    per_year = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    n_queries = int(sys.argv[3]) if len(sys.argv) > 3 else 2_000
+
+    current_year = date.today().year
+    years = list(range(current_year - n_years + 1, current_year + 1))
+    cutoff = current_year - 1
+    rows = synthetic_rows(years, per_year)
+    rng = random.Random(7)
+
+    with engine.begin() as conn:
+        for table in TABLES:
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+            conn.execute(text(f"CREATE TABLE {table} LIKE tramites1"))
+
+        print(f"Cargando {len(rows)} solicitudes de {years[0]} a {years[-1]}...")
+        for start in range(0, len(rows), 5000):
+            batch = rows[start:start + 5000]
+            insert_rows(conn, "bench_tramites_todo", batch)
+            hot = [row for row in batch if row["created_at"].year >= cutoff]
+            archive = [row for row in batch if row["created_at"].year < cutoff]
+            if hot:
+                insert_rows(conn, "bench_tramites_hot", hot)
+            if archive:
+                insert_rows(conn, "bench_tramites_archivo", archive)
+
+    try:
+        with engine.connect() as conn:
+            current_folios = [r["folio"] for r in rng.sample(rows[-per_year:], min(n_queries, per_year))]
+            curps = [r["curp"] for r in rng.sample(rows, n_queries)]
+            by_folio = "SELECT id, status, entregado FROM {} WHERE folio = :folio"
+            by_curp = ("SELECT id, folio, status FROM {} WHERE curp = :curp "
+                       "ORDER BY created_at DESC, id DESC LIMIT 21")
+            max_folio = "SELECT MAX(folio) FROM {} WHERE folio LIKE :prefix"
+
+            print("Tabla unica (todos los anios):")
+            timed("folio del anio actual", conn, [(by_folio.format("bench_tramites_todo"), {"folio": f}) for f in current_folios])
+            timed("CURP (pagina de 20)", conn, [(by_curp.format("bench_tramites_todo"), {"curp": c}) for c in curps])
+            timed("MAX(folio) del anio actual", conn, [(max_folio.format("bench_tramites_todo"), {"prefix": f"{current_year}-IV-%"})] * 200)
+
+            print(f"Separada (hot >= {cutoff}, archivo < {cutoff}):")
+            timed("folio del anio actual (hot)", conn, [(by_folio.format("bench_tramites_hot"), {"folio": f}) for f in current_folios])
+            timed("CURP (solo hot)", conn, [(by_curp.format("bench_tramites_hot"), {"curp": c}) for c in curps])
+            timed("CURP (hot + archivo)", conn, [
+                (by_curp.format(table), {"curp": c}) for c in curps for table in ("bench_tramites_hot", "bench_tramites_archivo")
+            ])
+            timed("MAX(folio) del anio actual (hot)", conn, [(max_folio.format("bench_tramites_hot"), {"prefix": f"{current_year}-IV-%"})] * 200)
+
+            sizes = {
+                table: conn.execute(text(
+                    "SELECT data_length + index_length FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = :table"
+                ), {"table": table}).scalar() or 0
+                for table in TABLES
+            }
+            for table, size in sizes.items():
+                print(f"   {table:<24} {size / 1024 / 1024:8.1f} MB")
+    finally:
+        with engine.begin() as conn:
+            for table in TABLES:
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
@@ -0,0 +1,39 @@
+"""
+Calibrate BCRYPT_ROUNDS for a target login latency
+
+Times bcrypt hashing at each cost on this machine and suggests the highest
+cost whose median stays under the target. Existing hashes are rehashed
+transparently on the next successful login after BCRYPT_ROUNDS changes.
+
+Usage: python calibrate_bcrypt_rounds.py [objetivo_ms] [muestras]
+"""
+import statistics
+import sys
+import time
+
+from passlib.hash import bcrypt
+
+if __name__ == "__main__":
+    target_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 250.0
+    samples = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    suggested = None
+    for rounds in range(8, 16):
+        handler = bcrypt.using(rounds=rounds)
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            handler.hash("calibracion-Portal-USEBEQ")
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+        print(f"   rounds={rounds:<3} mediana {median:8.1f} ms")
+
+        if median <= target_ms:
+            suggested = rounds
+        else:
+            break
+
+    if suggested is None:
+        print(f"Ningun costo cumple {target_ms:.0f} ms; usa el minimo (8) o mas CPU")
+    else:
+        print(f"BCRYPT_ROUNDS={suggested}  (objetivo {target_ms:.0f} ms por hash)")
@@ -0,0 +1,10 @@
+-- Conteos diarios de tramites1 por región, tipo de trámite, estatus y entrega
+CREATE TABLE IF NOT EXISTS pp_tramites_resumen (
+    dia DATE NOT NULL,
+    region VARCHAR(10) NOT NULL,
+    tipo_tramite VARCHAR(40) NOT NULL,
+    status VARCHAR(40) NOT NULL,
+    entregado VARCHAR(20) NOT NULL,
+    total INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (dia, region, tipo_tramite, status, entregado)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,15 @@
+-- Bandeja de salida de correos (la envía el worker de la API)
+CREATE TABLE IF NOT EXISTS pp_correo_salida (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    destinatario VARCHAR(255) NOT NULL,
+    asunto VARCHAR(255) NOT NULL,
+    cuerpo_texto TEXT NOT NULL,
+    cuerpo_html TEXT NULL,
+    estado VARCHAR(20) NOT NULL DEFAULT 'PENDIENTE',
+    intentos INT NOT NULL DEFAULT 0,
+    siguiente_intento DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ultimo_error VARCHAR(1000) NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    sent_at DATETIME NULL,
+    INDEX ix_pp_correo_salida_estado_siguiente (estado, siguiente_intento)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
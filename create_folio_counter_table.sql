@@ -0,0 +1,8 @@
+-- Contador de folios por año y región para solicitudes de certificado (tramites1)
+-- Se inicializa solo: la primera solicitud del año toma el folio más alto existente
+CREATE TABLE IF NOT EXISTS pp_folio_contador (
+    anio INT NOT NULL,
+    region VARCHAR(10) NOT NULL,
+    ultimo INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (anio, region)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,14 @@
+-- Respuestas guardadas de solicitudes con encabezado Idempotency-Key
+CREATE TABLE IF NOT EXISTS pp_idempotencia (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    scope VARCHAR(100) NOT NULL,
+    clave VARCHAR(255) NOT NULL,
+    fingerprint VARCHAR(64) NOT NULL,
+    estado VARCHAR(20) NOT NULL,
+    status_code INT NULL,
+    response_body TEXT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    UNIQUE INDEX uq_pp_idempotencia_scope_clave (scope, clave),
+    INDEX ix_pp_idempotencia_expires_at (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
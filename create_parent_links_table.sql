@@ -0,0 +1,10 @@
+-- Índice normalizado de vínculos padre-alumno (reemplaza los filtros
+-- padre = :correo OR madre = :correo OR tutor = :correo sobre pp_alumnos)
+CREATE TABLE IF NOT EXISTS pp_alumnos_padres (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    correo VARCHAR(255) NOT NULL,
+    al_id INT NOT NULL,
+    parentesco VARCHAR(10) NOT NULL,
+    UNIQUE INDEX ix_pp_alumnos_padres_correo_al_id (correo, al_id, parentesco),
+    INDEX ix_pp_alumnos_padres_al_id (al_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,15 @@
+-- Refresh tokens rotativos (solo se guarda el SHA-256 de cada token)
+CREATE TABLE IF NOT EXISTS pp_refresh_tokens (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    u_id INT NOT NULL,
+    token_hash VARCHAR(64) NOT NULL,
+    familia VARCHAR(32) NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    used_at DATETIME NULL,
+    revoked_at DATETIME NULL,
+    UNIQUE INDEX ix_pp_refresh_tokens_token_hash (token_hash),
+    INDEX ix_pp_refresh_tokens_u_id (u_id),
+    INDEX ix_pp_refresh_tokens_familia (familia),
+    INDEX ix_pp_refresh_tokens_expires_at (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,3 @@
+-- Tabla de archivo de tramites1: solicitudes firmadas de años anteriores
+-- (misma estructura e índices que tramites1; los id se conservan)
+CREATE TABLE IF NOT EXISTS tramites1_archivo LIKE tramites1;
@@ -0,0 +1,12 @@
+-- Índice compuesto para la validación de solicitudes existentes
+-- (check_existing_request: curp + tipo_tramite, estatus y fecha de elaboración)
+CREATE INDEX ix_tramites1_curp_tipo_status_fecha
+    ON tramites1 (curp, tipo_tramite, status, fecha_elaborado);
+
+-- Paginación por cursor de /certificates/list/{curp} (created_at, id)
+CREATE INDEX ix_tramites1_curp_created_id
+    ON tramites1 (curp, created_at, id);
+
+-- Conciliación del resumen de estadísticas (pp_tramites_resumen)
+CREATE INDEX ix_tramites1_updated_at ON tramites1 (updated_at);
+CREATE INDEX ix_tramites1_created_at ON tramites1 (created_at);
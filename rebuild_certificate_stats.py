@@ -0,0 +1,32 @@
+"""
+Full rebuild of pp_tramites_resumen from tramites1
+
+Regroups every day that has requests, one transaction per day. Run once
+after creating the table; afterwards the API keeps it up to date.
+
+Usage: python rebuild_certificate_stats.py
+"""
+import time
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.services.certificate_stats import rebuild_days, rebuild_lock
+
+if __name__ == "__main__":
+    # Waits for a reconcile run of the API to finish
+    with rebuild_lock(timeout=600) as acquired:
+        if not acquired:
+            raise SystemExit("El resumen se esta reconstruyendo en otro proceso; intenta de nuevo")
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            days = [
+                row.dia for row in db.execute(text("SELECT DISTINCT DATE(created_at) AS dia FROM tramites1"))
+                if row.dia
+            ]
+            db.rollback()
+            rebuild_days(db, days)
+            print(f"✓ Resumen reconstruido: {len(days)} dias en {time.perf_counter() - start:.1f} s")
+        finally:
+            db.close()